@@ -0,0 +1,78 @@
+"""
+Benchmark: memory and backtest impact of the compact float32 feature mode
+(data_processing_config.compact_features) against the default float64 pipeline.
+
+    python -m backend.benchmarks.bench_compact --minutes 2000000
+"""
+import argparse
+
+import xgboost as xgb
+
+from backend.benchmarks.synthetic import BENCH_DEVICE, synthetic_candles
+from backend.src.data.processing.merge_timeframes import merge_timeframes
+from backend.src.data.processing.process_timeframes import process_timeframe
+from backend.src.data.processing.resample import resample_ohlcv
+from backend.src.shared.config.data_processing_config import target_timeframe, timeframes
+from backend.src.shared.utils.data_processing.compact import frame_memory_bytes
+from backend.src.shared.utils.data_processing.train_val_test_split import time_series_folds
+from backend.src.trading.backtesting.backtest import backtest_model
+
+BENCH_PARAMS = {
+    "objective": "reg:squarederror",
+    "tree_method": "hist",
+    "device": BENCH_DEVICE,
+    "random_state": 42,
+    "n_estimators": 200,
+    "max_depth": 5,
+    "learning_rate": 0.05,
+}
+
+
+def build_features(candles, compact):
+    resampled = resample_ohlcv(candles, timeframes)
+    data_dict = {tf: process_timeframe(data, tf, target_timeframe, compact=compact) for tf, data in resampled.items()}
+    return merge_timeframes(data_dict, target_timeframe)
+
+
+def run_mode(candles, compact, test_fraction):
+    merged = build_features(candles, compact)
+    folds = time_series_folds(merged, n_folds=5)
+    fold_bytes = sum(frame_memory_bytes(part["features"]) for fold in folds for part in fold)
+
+    n_test = int(len(merged) * test_fraction)
+    train, test = merged[:-n_test], merged[-n_test:]
+    model = xgb.XGBRegressor(**BENCH_PARAMS)
+    model.fit(train.drop(columns=["timestamp", "target"]), train["target"], verbose=False)
+    summary, metric = backtest_model(model, {"features": test.drop(columns=["timestamp", "target"]), "targets": test["target"]})
+    return {
+        "merged_bytes": frame_memory_bytes(merged),
+        "fold_bytes": fold_bytes,
+        "columns": merged.shape[1],
+        "rows": merged.shape[0],
+        "sortino": metric,
+        "final_balance": summary["final_balance"],
+        "num_trades": summary["num_trades"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=2_000_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--test-fraction", type=float, default=0.1, help="Out-of-sample tail used for the backtest.")
+    args = parser.parse_args()
+
+    candles = synthetic_candles(args.minutes)
+    full = run_mode(candles, compact=False, test_fraction=args.test_fraction)
+    compact = run_mode(candles, compact=True, test_fraction=args.test_fraction)
+
+    print(f"merged frame: {full['rows']:,} rows x {full['columns']} columns")
+    print(f"{'':<26}{'float64':>16}{'compact':>16}")
+    for key in ("merged_bytes", "fold_bytes"):
+        print(f"{key:<26}{full[key]:>16,}{compact[key]:>16,}  ({1 - compact[key] / full[key]:.0%} saved)")
+    for key in ("sortino", "final_balance", "num_trades"):
+        print(f"{key:<26}{full[key]:>16.6g}{compact[key]:>16.6g}")
+    print(f"backtest metric change: {compact['sortino'] - full['sortino']:+.3g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: seconds per Optuna trial of objective_time_series on the full feature matrix against
+the matrix reduced by prune_features (gain ranking + correlation clusters, model_config's budget
+and threshold, ranked on the rows before the first test fold). Both studies use the same seeded sampler; the table also shows the best value
+(the pruned study trains on fewer columns, so the values are not expected to match).
+
+    python -m backend.benchmarks.bench_feature_pruning --minutes 300000 --trials 6
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import optuna
+
+from backend.benchmarks.bench_compact import build_features
+from backend.benchmarks.synthetic import BENCH_DEVICE, synthetic_candles
+from backend.src.models.xgboost.feature_pruning import prune_features, ranking_rows
+from backend.src.models.xgboost.train_tune import _study_folds, objective_time_series, xgboost_resources
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+
+
+def run_study(data, n_trials, seed):
+    device, _, n_jobs = xgboost_resources(device=BENCH_DEVICE, n_trials=1)
+    folds, matrix_cache = _study_folds(data, 5)
+    study = optuna.create_study(direction="maximize", sampler=optuna.samplers.TPESampler(seed=seed),
+                                pruner=optuna.pruners.NopPruner())
+    with contextlib.redirect_stdout(io.StringIO()):  # the objective prints every fold
+        study.optimize(
+            lambda trial: objective_time_series(trial, data, folds=folds, matrix_cache=matrix_cache, device=device,
+                                                n_jobs=n_jobs),
+            n_trials=n_trials,
+        )
+    seconds = [(trial.datetime_complete - trial.datetime_start).total_seconds() for trial in study.trials]
+    return np.mean(seconds), study.best_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=300_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--trials", type=int, default=6, help="Trials per study.")
+    parser.add_argument("--seed", type=int, default=0, help="Sampler seed shared by the studies.")
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    data = build_feature_matrix(build_features(synthetic_candles(args.minutes), compact=False))
+    start = time.perf_counter()
+    selection = prune_features(ranking_rows(data))
+    pruning_time = time.perf_counter() - start
+    print(f"feature matrix {data.features.shape}: kept {len(selection.columns)} features in {pruning_time:.2f}s, "
+          f"{args.trials} trials per study")
+
+    print(f"{'matrix':<10}{'features':>10}{'s/trial':>10}{'best value':>12}")
+    full_time, full_best = run_study(data, args.trials, args.seed)
+    print(f"{'full':<10}{len(data.columns):>10}{full_time:>10.2f}{full_best:>12.4f}")
+    pruned_time, pruned_best = run_study(selection.apply(data), args.trials, args.seed)
+    print(f"{'pruned':<10}{len(selection.columns):>10}{pruned_time:>10.2f}{pruned_best:>12.4f}  "
+          f"({full_time / pruned_time:.2f}x per trial)")
+
+
+if __name__ == "__main__":
+    main()
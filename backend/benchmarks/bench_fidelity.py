@@ -0,0 +1,59 @@
+"""
+Benchmark: Optuna configurations evaluated within one time budget by a full-fidelity study
+(every trial on all folds at full data size and n_estimators, the default) against
+multi-fidelity studies (rungs of model_config.fidelity_schedule) under each fidelity_pruner.
+All use the same seeded sampler.
+
+    python -m backend.benchmarks.bench_fidelity --minutes 300000 --budget 600
+"""
+import argparse
+import contextlib
+import io
+
+import optuna
+
+from backend.benchmarks.bench_compact import build_features
+from backend.benchmarks.synthetic import BENCH_DEVICE, synthetic_candles
+from backend.src.models.xgboost.train_tune import run_optuna_study_timeseries
+from backend.src.shared.config import model_config
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+
+
+def run_study(data, budget, seed, multi_fidelity):
+    with contextlib.redirect_stdout(io.StringIO()):  # the objective prints every fold
+        study = run_optuna_study_timeseries(data, n_trials=None, device=BENCH_DEVICE, workers=1, multi_fidelity=multi_fidelity,
+                                            timeout=budget, sampler=optuna.samplers.TPESampler(seed=seed),
+                                            cache_results=False)  # every study trains its own folds
+    trials = study.trials
+    complete = [t for t in trials if t.state == optuna.trial.TrialState.COMPLETE]
+    rungs = [t.user_attrs.get("rungs_completed", 0) for t in trials]
+    return len(trials), len(complete), sum(t.user_attrs.get("trees_built", 0) for t in trials), rungs, study.best_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=300_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--budget", type=float, default=600, help="Seconds per study.")
+    parser.add_argument("--seed", type=int, default=0, help="Sampler seed shared by the studies.")
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    data = build_feature_matrix(build_features(synthetic_candles(args.minutes), compact=False))
+    print(f"feature matrix {data.features.shape}, {args.budget:.0f}s per study, "
+          f"schedule {model_config.fidelity_schedule}, reduction factor {model_config.fidelity_reduction_factor}")
+    print(f"{'study':<20}{'configs':>9}{'full fidelity':>15}{'trees':>9}{'best value':>12}")
+    baseline = None
+    for name, multi_fidelity in (("full fidelity", False), ("hyperband", True), ("successive_halving", True)):
+        if multi_fidelity:
+            model_config.fidelity_pruner = name
+        n_trials, n_complete, trees, rungs, best = run_study(data, args.budget, args.seed, multi_fidelity)
+        baseline = baseline or n_trials
+        print(f"{name:<20}{n_trials:>9}{n_complete:>15}{trees:>9}{best:>12.4f}  ({n_trials / baseline:.1f}x configs)")
+        if multi_fidelity:
+            print("    trials per rungs completed: " + ", ".join(
+                f"{r}: {rungs.count(r)}" for r in range(1, len(model_config.fidelity_schedule) + 1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: the "numba" indicator backend (indicator_kernels.py) against the "ta" wrappers,
+per indicator and for a full IndicatorPipeline run, with the largest relative difference,
+and the compiled IndicatorPlan against running each indicator on its own.
+
+    python -m backend.benchmarks.bench_indicators --rows 3000000
+"""
+import argparse
+
+import numpy as np
+
+from backend.benchmarks.synthetic import synthetic_candles
+from backend.benchmarks.timing import best_time
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.data.processing.indicators.indicator_pipeline import IndicatorPipeline
+from backend.src.shared.utils.data_processing.indicator_plan import IndicatorPlan
+from backend.src.shared.utils.data_processing.indicator_registry import INDICATOR_FUNCTIONS
+
+
+def _max_rel_diff(a, b):
+    new_cols = [col for col in a.columns if col not in ("timestamp", "open", "high", "low", "close", "volume", "trades")]
+    x, y = a[new_cols].to_numpy(), b[new_cols].to_numpy()
+    if not np.array_equal(np.isnan(x), np.isnan(y)):
+        return np.inf
+    mask = ~np.isnan(x)
+    return float(np.max(np.abs(x[mask] - y[mask]) / np.maximum(np.abs(y[mask]), 1e-300), initial=0.0))
+
+
+def _run_per_indicator(configs, df):
+    """One plan per indicator, run one after another: no shared intermediates and one insertion per indicator."""
+    for config in configs:
+        df = IndicatorPlan([config], backend="numba").run(df)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=3_000_000, help="Candles in the synthetic series.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported).")
+    args = parser.parse_args()
+
+    candles = synthetic_candles(args.rows, missing_fraction=0.0)
+    # Compile (or load the cached) kernels outside the timed runs
+    IndicatorPipeline(indicator_configs[60], backend="numba").run(candles.iloc[:100].copy())
+
+    print(f"{args.rows:,} rows")
+    print(f"{'indicator':<24}{'ta (s)':>10}{'numba (s)':>12}{'speedup':>10}{'max rel diff':>15}")
+    cases = [(name, [{"name": name}]) for name in INDICATOR_FUNCTIONS]
+    cases.append(("pipeline (60m config)", indicator_configs[60]))
+    for name, configs in cases:
+        timings, outputs = {}, {}
+        for backend in ("ta", "numba"):
+            pipeline = IndicatorPipeline(configs, backend=backend)
+            timings[backend], outputs[backend] = best_time(lambda: pipeline.run(candles.copy()), args.repeat)
+        diff = _max_rel_diff(outputs["numba"], outputs["ta"])
+        print(f"{name:<24}{timings['ta']:>10.3f}{timings['numba']:>12.3f}{timings['ta'] / timings['numba']:>9.1f}x{diff:>15.2e}")
+
+    planned, _ = best_time(lambda: IndicatorPipeline(indicator_configs[60], backend="numba").run(candles.copy()), args.repeat)
+    per_indicator, _ = best_time(lambda: _run_per_indicator(indicator_configs[60], candles.copy()), args.repeat)
+    print(f"numba pipeline (60m config): per-indicator {per_indicator:.3f}s, compiled plan {planned:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
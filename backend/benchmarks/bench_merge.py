@@ -0,0 +1,100 @@
+"""
+Benchmark: merge_timeframes (searchsorted gather) against the previous merge_asof
+implementation, on a 1 minute target with every other timeframe of BENCH_TIMEFRAMES merged
+onto it. Also checks that the outputs are equal and that no merged bar is from the future.
+
+    python -m backend.benchmarks.bench_merge --minutes 1500000 --features 4
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks.synthetic import BENCH_TIMEFRAMES, synthetic_candles
+from backend.benchmarks.timing import best_time
+from backend.src.data.processing.merge_timeframes import merge_timeframes
+from backend.src.data.processing.resample import resample_ohlcv
+
+
+def legacy_merge_timeframes(data_dict, target_timeframe):
+    """merge_timeframes before the searchsorted rewrite: one merge_asof and concat per timeframe."""
+    target_df = data_dict[target_timeframe].copy()
+    target_df.sort_values("timestamp", inplace=True)
+    target_df.reset_index(drop=True, inplace=True)
+    merged_df = target_df.copy()
+    for tf, tf_info in data_dict.items():
+        if tf == target_timeframe:
+            continue
+        tf_df = tf_info.copy()
+        tf_df.sort_values("timestamp", inplace=True)
+        tf_cols = [col for col in tf_df.columns if col != "timestamp"]
+        tf_df_renamed = tf_df.rename(columns={col: f"{tf}_{col}" for col in tf_cols})
+        shifted_target = target_df[['timestamp']].copy()
+        shifted_target['lookup_timestamp'] = shifted_target['timestamp'] - tf * 60
+        shifted_target['lookup_timestamp'] = shifted_target['lookup_timestamp'].apply(lambda x: x if x >= 0 else np.nan)
+        merged = pd.merge_asof(
+            shifted_target.sort_values('lookup_timestamp'),
+            tf_df_renamed.sort_values('timestamp'),
+            left_on='lookup_timestamp',
+            right_on='timestamp',
+            direction='backward'
+        )
+        merged.drop(['lookup_timestamp', 'timestamp_x', 'timestamp_y'], axis=1, inplace=True)
+        merged_df = pd.concat([merged_df, merged], axis=1)
+    return merged_df
+
+
+def _timeframe_frames(n_minutes, n_features, seed=0):
+    """Resampled candles of every BENCH_TIMEFRAME plus random float64 feature columns, like processed timeframes."""
+    frames = resample_ohlcv(synthetic_candles(n_minutes, seed=seed), BENCH_TIMEFRAMES, base_timeframe=1)
+    rng = np.random.default_rng(seed)
+    for tf, frame in frames.items():
+        for i in range(n_features):
+            frame[f"feature_{i}"] = rng.random(len(frame))
+        # the bar's own timestamp as a value, to check which bar each target row received
+        frame["bar_timestamp"] = frame["timestamp"]
+    return frames
+
+
+def check_no_lookahead(merged, data_dict, target_timeframe):
+    """Asserts that every target row T holds, per timeframe tf, the latest bar with timestamp <= T - tf minutes."""
+    target_ts = merged["timestamp"].to_numpy()
+    for tf, frame in data_dict.items():
+        if tf == target_timeframe:
+            continue
+        bar_ts = merged[f"{tf}_bar_timestamp"].to_numpy()
+        cutoff = target_ts - tf * 60
+        matched = ~np.isnan(bar_ts)
+        assert np.all(bar_ts[matched] <= cutoff[matched]), f"{tf}m bars from the future"
+        # and nothing later was eligible
+        next_ts = np.append(frame["timestamp"].to_numpy(), np.iinfo(np.int64).max)
+        following = next_ts[np.searchsorted(next_ts, bar_ts[matched], side="right")]
+        assert np.all(following > cutoff[matched]), f"{tf}m rows skip a closed bar"
+        assert np.all(frame["timestamp"].iloc[0] > cutoff[~matched]), f"{tf}m rows left unmatched"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=1_500_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--features", type=int, default=4, help="Extra float64 columns per timeframe.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported).")
+    args = parser.parse_args()
+
+    target_timeframe = BENCH_TIMEFRAMES[0]
+    data_dict = _timeframe_frames(args.minutes, args.features)
+    columns = sum(frame.shape[1] - 1 for tf, frame in data_dict.items() if tf != target_timeframe)
+    print(f"{len(data_dict[target_timeframe]):,} target rows ({target_timeframe}m), "
+          f"{len(data_dict)} timeframes, {columns} merged columns")
+
+    new_time, merged = best_time(lambda: merge_timeframes(data_dict, target_timeframe), args.repeat)
+    legacy_time, legacy = best_time(lambda: legacy_merge_timeframes(data_dict, target_timeframe), args.repeat)
+    pd.testing.assert_frame_equal(merged, legacy, check_exact=True)
+    check_no_lookahead(merged, data_dict, target_timeframe)
+
+    print(f"merge_asof + concat per timeframe: {legacy_time:.3f}s")
+    print(f"searchsorted gather:               {new_time:.3f}s  ({legacy_time / new_time:.1f}x)")
+    print("Outputs are equal and every merged bar closed before its target row.")
+
+
+if __name__ == "__main__":
+    main()
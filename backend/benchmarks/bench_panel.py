@@ -0,0 +1,53 @@
+"""
+Benchmark: indicators for a universe of assets, one IndicatorPipeline call per asset (as
+process_coinpair does) against one batched panel pass (panel.py / process_universe).
+
+    python -m backend.benchmarks.bench_panel --assets 48 --rows 20000
+"""
+import argparse
+
+import pandas as pd
+
+from backend.benchmarks.synthetic import synthetic_candles
+from backend.benchmarks.timing import best_time
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.data.processing.indicators.indicator_pipeline import IndicatorPipeline
+from backend.src.data.processing.panel import build_panel, compute_panel_indicators, panel_to_frames
+
+
+def per_asset(frames, configs):
+    pipeline = IndicatorPipeline(configs, backend="numba")
+    return {asset: pipeline.run(frame) for asset, frame in frames.items()}
+
+
+def panel(frames, configs):
+    universe = build_panel(frames)
+    return panel_to_frames(universe, compute_panel_indicators(universe, configs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=48, help="Number of synthetic assets.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Candles per asset (before missing ones are dropped).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported).")
+    args = parser.parse_args()
+
+    frames = {f"ASSET{i}": synthetic_candles(args.rows, seed=i) for i in range(args.assets)}
+    configs = indicator_configs[60]
+    # compile (or load the cached) kernels outside the timed runs
+    panel({asset: frame.iloc[:100] for asset, frame in list(frames.items())[:2]}, configs)
+    per_asset({asset: frame.iloc[:100] for asset, frame in list(frames.items())[:2]}, configs)
+
+    per_asset_time, reference = best_time(lambda: per_asset(frames, configs), args.repeat)
+    panel_time, batched = best_time(lambda: panel(frames, configs), args.repeat)
+    for asset in frames:
+        pd.testing.assert_frame_equal(batched[asset], reference[asset], check_exact=True)
+
+    print(f"{args.assets} assets x ~{args.rows:,} candles, 60m indicator config")
+    print(f"per-asset IndicatorPipeline: {per_asset_time:.3f}s")
+    print(f"batched panel pass:          {panel_time:.3f}s  ({per_asset_time / panel_time:.1f}x)")
+    print("Panel output matches the per-asset output exactly.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: building the higher timeframes of a coin pair from its 1 minute CSV (resample.py)
+versus reading one pre-exported CSV per timeframe.
+
+    python -m backend.benchmarks.bench_resample --minutes 2000000
+"""
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from backend.benchmarks.synthetic import BENCH_TIMEFRAMES, write_synthetic_coinpair
+from backend.benchmarks.timing import best_time
+from backend.src.data.ingestion.ohlcv_store import load_ohlcv, read_ohlcv_csv
+from backend.src.data.processing.resample import resample_ohlcv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=2_000_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported).")
+    args = parser.parse_args()
+
+    higher = [tf for tf in BENCH_TIMEFRAMES if tf != 1]
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_synthetic_coinpair(folder, "BENCH", "BENCHUSD", args.minutes)
+        disk = {tf: os.path.getsize(path) for tf, path in paths.items()}
+        print(f"1m rows: {args.minutes:,}  CSV bytes: 1m {disk[1]:,}, higher timeframes {sum(disk[tf] for tf in higher):,}")
+
+        store_root = os.path.join(folder, "_store")
+        stored = lambda path: load_ohlcv(path, store_root=store_root, source_root=folder)
+        for path in paths.values():
+            stored(path)  # build the stores outside the timed runs
+
+        timings = {}
+        for source, load in (("CSV parse", read_ohlcv_csv), ("binary store", stored)):
+            timings[f"per-file {source}"], per_file = best_time(lambda: {tf: load(paths[tf]) for tf in higher}, args.repeat)
+            timings[f"1m {source} + resample"], resampled = best_time(lambda: resample_ohlcv(load(paths[1]), higher), args.repeat)
+            for tf in higher:
+                pd.testing.assert_frame_equal(resampled[tf], per_file[tf], rtol=1e-12)
+
+        base = stored(paths[1])
+        timings["resample only"], _ = best_time(lambda: resample_ohlcv(base, higher), args.repeat)
+
+    print(f"{'path':<34}{'seconds':>10}")
+    for name, seconds in timings.items():
+        print(f"{name:<34}{seconds:>10.3f}")
+    print("Resampled bars match the per-file bars.")
+
+
+if __name__ == "__main__":
+    main()
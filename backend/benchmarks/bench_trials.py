@@ -0,0 +1,57 @@
+"""
+Benchmark: Optuna trials per hour of run_optuna_study_timeseries' objective with the per-study
+FoldMatrixCache (folds quantized once per (fold, max_bin)) against quantizing every fold again
+in every trial, as refitting XGBRegressors from the data did. Both runs use the same seeded
+sampler, so they evaluate the same parameters and must reach the same values.
+
+    python -m backend.benchmarks.bench_trials --minutes 300000 --trials 12
+"""
+import argparse
+import time
+
+import optuna
+
+from backend.benchmarks.bench_compact import build_features
+from backend.benchmarks.synthetic import BENCH_DEVICE, synthetic_candles
+from backend.src.models.xgboost.dmatrix_cache import FoldMatrixCache
+from backend.src.models.xgboost.train_tune import objective_time_series
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+from backend.src.shared.utils.data_processing.train_val_test_split import time_series_folds
+
+
+def run_study(data, folds, n_trials, matrix_cache, seed):
+    study = optuna.create_study(direction="maximize", sampler=optuna.samplers.TPESampler(seed=seed))
+    start = time.perf_counter()
+    study.optimize(
+        lambda trial: objective_time_series(trial, data, folds=folds, matrix_cache=matrix_cache, device=BENCH_DEVICE),
+        n_trials=n_trials,
+    )
+    return time.perf_counter() - start, [trial.value for trial in study.trials]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=300_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--trials", type=int, default=12, help="Trials per study.")
+    parser.add_argument("--seed", type=int, default=0, help="Sampler seed shared by both studies.")
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    data = build_feature_matrix(build_features(synthetic_candles(args.minutes), compact=False))
+    folds = time_series_folds(data, n_folds=5, val_set=False)
+    print(f"feature matrix {data.features.shape}, {len(folds)} folds, {args.trials} trials")
+
+    per_trial_time, per_trial_values = run_study(data, folds, args.trials, None, args.seed)
+    cache = FoldMatrixCache(folds, max_entries=len(folds) * 15)  # every max_bin the search space allows
+    cached_time, cached_values = run_study(data, folds, args.trials, cache, args.seed)
+    assert per_trial_values == cached_values, "cached matrices changed the trial results"
+
+    print(f"quantized per trial: {per_trial_time:8.1f}s  {args.trials / per_trial_time * 3600:8.0f} trials/hour")
+    print(f"study cache:         {cached_time:8.1f}s  {args.trials / cached_time * 3600:8.0f} trials/hour "
+          f"({per_trial_time / cached_time:.2f}x, {cache.hits} hits / {cache.misses} misses)")
+    print("Both studies reached identical trial values.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: wall-clock per Optuna trial of objective_time_series refitting every expanding fold
+from scratch (the default) against per-fold early stopping on the fold's held-out tail, and
+against early stopping plus continuing each fold from the previous fold's booster. All studies
+use the same seeded sampler; the table also shows the trees each trial built and the best value
+(the variants train different models, so the values are not expected to match).
+
+    python -m backend.benchmarks.bench_warm_start --minutes 300000 --trials 8 --early-stopping 20
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import optuna
+
+from backend.benchmarks.bench_compact import build_features
+from backend.benchmarks.synthetic import BENCH_DEVICE, synthetic_candles
+from backend.src.models.xgboost.train_tune import _study_folds, objective_time_series, xgboost_resources
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+
+
+def run_study(data, n_trials, seed, warm_start, early_stopping_rounds):
+    device, _, n_jobs = xgboost_resources(device=BENCH_DEVICE, n_trials=1)
+    folds, matrix_cache = _study_folds(data, 5, warm_start, early_stopping_rounds)
+    study = optuna.create_study(direction="maximize", sampler=optuna.samplers.TPESampler(seed=seed),
+                                pruner=optuna.pruners.NopPruner())
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # the objective prints every fold
+        study.optimize(
+            lambda trial: objective_time_series(trial, data, folds=folds, matrix_cache=matrix_cache, device=device,
+                                                n_jobs=n_jobs, warm_start=warm_start,
+                                                early_stopping_rounds=early_stopping_rounds),
+            n_trials=n_trials,
+        )
+    total = time.perf_counter() - start
+    seconds = [(trial.datetime_complete - trial.datetime_start).total_seconds() for trial in study.trials]
+    trees = [trial.user_attrs["trees_built"] for trial in study.trials]
+    return total, seconds, trees, study.best_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=300_000, help="Length of the synthetic 1m series.")
+    parser.add_argument("--trials", type=int, default=8, help="Trials per study.")
+    parser.add_argument("--early-stopping", type=int, default=20, help="Early stopping rounds of the fold tails.")
+    parser.add_argument("--seed", type=int, default=0, help="Sampler seed shared by the studies.")
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    data = build_feature_matrix(build_features(synthetic_candles(args.minutes), compact=False))
+    print(f"feature matrix {data.features.shape}, 5 folds, {args.trials} trials per study")
+    print(f"{'variant':<32}{'s/trial mean':>13}{'median':>9}{'trees/trial':>13}{'best value':>12}")
+    variants = [
+        ("refit every fold", False, None),
+        ("early stopping", False, args.early_stopping),
+        ("warm start + early stopping", True, args.early_stopping),
+    ]
+    baseline = None
+    for name, warm_start, early_stopping_rounds in variants:
+        total, seconds, trees, best = run_study(data, args.trials, args.seed, warm_start, early_stopping_rounds)
+        baseline = baseline or total
+        print(f"{name:<32}{np.mean(seconds):>13.2f}{np.median(seconds):>9.2f}{np.mean(trees):>13.0f}{best:>12.4f}"
+              f"  ({baseline / total:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+BENCH_TIMEFRAMES = [1, 5, 15, 30, 60, 240, 720, 1440]
+# XGBoost device of the training benchmarks, passed explicitly so they do not fall back to the
+# "cuda" default of objective_time_series / model_config.training_device
+BENCH_DEVICE = "cpu"
+
+
+def synthetic_candles(n_minutes, start_timestamp=1_600_000_020, missing_fraction=0.02, seed=0):
+    """
+    Generates a random-walk 1 minute OHLCV+trades series in the Kraken CSV layout.
+
+    A fraction of the minutes is dropped, as Kraken only exports minutes with trades.
+
+    :param n_minutes: Length of the covered period in minutes.
+    :param start_timestamp: Unix timestamp of the first minute (rounded down to a minute).
+    :param missing_fraction: Fraction of minutes without a candle.
+    :param seed: Seed of the random generator.
+    :return: DataFrame with columns timestamp, open, high, low, close, volume, trades.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = start_timestamp // 60 * 60 + np.arange(n_minutes, dtype=np.int64) * 60
+    timestamps = timestamps[rng.random(n_minutes) >= missing_fraction]
+    n = len(timestamps)
+
+    close = 3000 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + rng.random(n) * 1e-3),
+        "low": np.minimum(open_, close) * (1 - rng.random(n) * 1e-3),
+        "close": close,
+        "volume": rng.random(n) * 10,
+        "trades": rng.integers(1, 50, n),
+    })
+
+
+def write_synthetic_coinpair(base_folder, coin, pair, n_minutes, timeframes=BENCH_TIMEFRAMES, seed=0):
+    """
+    Writes <base_folder>/<coin>/<pair>/<pair>_<tf>.csv files (headerless, like the Kraken export)
+    for every timeframe, the coarser ones aggregated from the 1 minute series with pandas groupby.
+
+    :return: Dictionary of {timeframe: file path}.
+    """
+    candles = synthetic_candles(n_minutes, seed=seed)
+    pair_folder = os.path.join(base_folder, coin, pair)
+    os.makedirs(pair_folder, exist_ok=True)
+
+    paths = {}
+    for timeframe in timeframes:
+        bucket = candles["timestamp"] // (timeframe * 60) * (timeframe * 60)
+        bars = candles.groupby(bucket).agg(
+            open=("open", "first"), high=("high", "max"), low=("low", "min"),
+            close=("close", "last"), volume=("volume", "sum"), trades=("trades", "sum"),
+        ).reset_index()
+        paths[timeframe] = os.path.join(pair_folder, f"{pair}_{timeframe}.csv")
+        bars.to_csv(paths[timeframe], header=False, index=False)
+    return paths
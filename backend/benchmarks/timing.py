@@ -0,0 +1,17 @@
+import time
+
+
+def best_time(func, repeat):
+    """
+    Runs func repeat times and returns the fastest wall-clock time with the last result.
+
+    :param func: Callable without arguments.
+    :param repeat: Number of runs.
+    :return: Tuple of (best time in seconds, result of func).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -1,42 +1,86 @@
+import math
+
 from fastapi import APIRouter, HTTPException
-from backend.src.api.schemas.model_schemas import PredictionRequest, PredictionResponse
+from backend.src.api.schemas.model_schemas import ModelInfo, ModelStatusResponse, PredictionRequest, PredictionResponse
+from backend.src.models.xgboost.model_registry import ModelCache
+import numpy as np
 import pandas as pd
 
 router = APIRouter(prefix="/models", tags=["models"])
 
+_model_cache = None
+
+def get_model_cache() -> ModelCache:
+    """The API's model cache over the model registry, created on first use."""
+    global _model_cache
+    if _model_cache is None:
+        _model_cache = ModelCache()
+    return _model_cache
+
+# The routes below are sync: FastAPI runs them in its threadpool, so loading a booster or reading
+# the registry index does not block the event loop.
+
+def _finite(value):
+    """value as a float, or None if it is missing or not finite (JSON has no NaN)."""
+    return float(value) if isinstance(value, (int, float)) and math.isfinite(value) else None
+
 @router.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
+def predict(request: PredictionRequest):
     """
-    Generate price predictions based on input data.
+    Generate a prediction of the registered model of the coin pair and timeframe from the
+    feature values in the request (one per feature column of the model; null for missing).
+    backtest_win_rate is the model's win rate in its out-of-sample backtest, when it has one.
     """
     try:
-        # This is a placeholder for actual model prediction logic
-        # In a real implementation, this would load the model and make predictions
-        
-        # Example response
+        entry = get_model_cache().get(request.coin, request.pair, request.timeframe)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"No model registered for {request.coin}/{request.pair} {request.timeframe}")
+        record, booster = entry
+
+        features = request.features or {}
+        missing = [name for name in record.feature_columns if name not in features]
+        if missing:
+            raise HTTPException(status_code=422, detail=f"Missing {len(missing)} feature(s): {missing[:10]}")
+        try:
+            row = np.array([[np.nan if features[name] is None else float(features[name]) for name in record.feature_columns]],
+                           dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=422, detail=f"Feature values must be numbers: {e}")
+
         return PredictionResponse(
             coin=request.coin,
             pair=request.pair,
             timestamp=pd.Timestamp.now().isoformat(),
-            prediction=0.05,  # Example prediction value (5% increase)
-            confidence=0.75
+            prediction=float(booster.inplace_predict(row)[0]),
+            backtest_win_rate=_finite(record.backtest_summary.get("win_rate")),
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
-@router.get("/status")
-async def model_status():
+@router.get("/status", response_model=ModelStatusResponse)
+def model_status():
     """
-    Get the status of all trained models.
+    Get the status of all trained models, from the model registry's index.
     """
-    # This is a placeholder for actual model status logic
-    return {
-        "models": [
-            {
-                "name": "xgboost_btc_usdt",
-                "last_trained": "2023-01-15T12:00:00",
-                "accuracy": 0.68,
-                "status": "active"
-            }
-        ]
-    } 
\ No newline at end of file
+    cache = get_model_cache()
+    models = [
+        ModelInfo(
+            name=record.name,
+            type="xgboost",
+            coin=record.coin,
+            pair=record.pair,
+            timeframe=record.timeframe,
+            last_trained=pd.Timestamp(record.trained_at, unit="s").isoformat(),
+            # JSON has no NaN: metrics that could not be computed are left out
+            metrics={name: float(value) for name, value in record.backtest_summary.items()
+                     if isinstance(value, (int, float)) and math.isfinite(value)},
+            n_features=len(record.feature_columns),
+            size_bytes=record.size_bytes,
+            data_fingerprint=record.data_fingerprint,
+            loaded=cache.loaded(record.key),
+        )
+        for record in cache.registry.records()
+    ]
+    return ModelStatusResponse(models=models, cache=cache.stats())
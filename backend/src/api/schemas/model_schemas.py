@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
+from backend.src.models.xgboost.model_registry import timeframe_label
+from backend.src.shared.config.data_processing_config import target_timeframe
 
 class PredictionRequest(BaseModel):
     """
@@ -7,7 +9,7 @@ class PredictionRequest(BaseModel):
     """
     coin: str = Field(..., description="Cryptocurrency symbol (e.g., 'BTC')")
     pair: str = Field(..., description="Trading pair (e.g., 'USDT')")
-    timeframe: str = Field("30m", description="Timeframe for prediction")
+    timeframe: str = Field(timeframe_label(target_timeframe), description="Timeframe for prediction (e.g. '60m'); defaults to the models' target timeframe")
     features: Optional[Dict[str, Any]] = Field(None, description="Additional features for prediction")
 
 class PredictionResponse(BaseModel):
@@ -17,8 +19,8 @@ class PredictionResponse(BaseModel):
     coin: str
     pair: str
     timestamp: str
-    prediction: float = Field(..., description="Predicted price change percentage")
-    confidence: float = Field(..., description="Confidence score (0-1)")
+    prediction: float = Field(..., description="Raw booster output: the predicted target, i.e. the close price of the target timeframe bar")
+    backtest_win_rate: Optional[float] = Field(None, description="Win rate of the model in its out-of-sample backtest (the same for every prediction; not a per-prediction confidence)")
     
 class ModelInfo(BaseModel):
     """
@@ -31,6 +33,17 @@ class ModelInfo(BaseModel):
     timeframe: str
     last_trained: str
     metrics: Dict[str, float]
+    n_features: Optional[int] = None
+    size_bytes: Optional[int] = None
+    data_fingerprint: Optional[str] = None
+    loaded: bool = Field(False, description="Whether the model is loaded in the API's model cache")
+
+class ModelStatusResponse(BaseModel):
+    """
+    Response schema for the status of all registered models.
+    """
+    models: List[ModelInfo]
+    cache: Dict[str, int] = Field(..., description="Loaded models and bytes, bounds, hits and misses of the model cache")
     
 class TrainingRequest(BaseModel):
     """
@@ -38,6 +51,6 @@ class TrainingRequest(BaseModel):
     """
     coin: str
     pair: str
-    timeframe: str = "30m"
+    timeframe: str = timeframe_label(target_timeframe)
     model_type: str = "xgboost"
     hyperparameters: Optional[Dict[str, Any]] = None 
\ No newline at end of file
@@ -1,21 +1,112 @@
-import pandas as pd
+from backend.src.data.ingestion.ohlcv_store import (
+    OHLCV_ROW_BYTES,
+    ensure_store,
+    frame_to_records,
+    iter_store_chunks,
+    load_ohlcv,
+    load_ohlcv_tail,
+    open_store_records,
+    read_ohlcv_csv,
+)
+from backend.src.shared.config.data_processing_config import stream_chunk_rows, stream_max_memory_bytes
 
 
-def ingest_csv(file_path, format="pandas"):
+def ingest_csv(file_path, format="pandas", use_store=True):
     """
     Ingests a single CSV file and returns it in the specified format.
 
+    By default the file is served from the binary OHLCV store (see ohlcv_store.py), which is
+    built from the CSV on first use and rebuilt whenever the CSV's size or mtime changes.
+
+    format="numpy" returns a structured array with the OHLCV_RECORD_DTYPE layout
+    (timestamp:int64, open/high/low/close/volume:float64, trades:int64). From the store it
+    is a read-only np.memmap of the store's records file, so loading does no parsing or copying
+    and every process mapping the same file shares its pages.
+
     :param file_path: Path to the CSV file.
     :param format: Desired output format ("pandas" or "numpy").
+    :param use_store: Whether to read through the binary store instead of parsing the CSV.
     :return: Data in the specified format.
     """
-    headers = ["timestamp", "open", "high", "low", "close", "volume", "trades"]
-    data = pd.read_csv(file_path, names=headers)
+    if format not in ("pandas", "numpy"):
+        raise ValueError("Invalid format specified. Choose 'pandas' or 'numpy'.")
 
     if format == "numpy":
-        return data.to_numpy()
-    elif format == "pandas":
-        return data
-    else:
+        if use_store:
+            store_path, manifest = ensure_store(file_path)
+            return open_store_records(store_path, manifest)
+        return frame_to_records(read_ohlcv_csv(file_path))
+
+    if use_store:
+        return load_ohlcv(file_path)
+    return read_ohlcv_csv(file_path)
+
+
+def stream_chunk_size(chunk_rows=None, max_memory_bytes=None):
+    """
+    Rows per chunk when streaming a file: chunk_rows, capped so that the raw columns of one
+    chunk never exceed max_memory_bytes.
+
+    :param chunk_rows: Maximum rows per chunk. Defaults to data_processing_config.stream_chunk_rows.
+    :param max_memory_bytes: Ceiling on the raw column bytes of one chunk.
+                             Defaults to data_processing_config.stream_max_memory_bytes.
+    :return: Rows per chunk.
+    """
+    chunk_rows = chunk_rows or stream_chunk_rows
+    max_memory_bytes = max_memory_bytes or stream_max_memory_bytes
+    chunk_rows = min(chunk_rows, max_memory_bytes // OHLCV_ROW_BYTES)
+    if chunk_rows < 1:
+        raise ValueError(f"max_memory_bytes={max_memory_bytes} is smaller than a single row ({OHLCV_ROW_BYTES} bytes).")
+    return chunk_rows
+
+
+def ingest_csv_chunks(file_path, chunk_rows=None, max_memory_bytes=None, format="pandas", use_store=True):
+    """
+    Streams a single CSV file as typed chunks instead of loading it whole.
+
+    The chunk size is capped so that the raw columns of one chunk never exceed max_memory_bytes.
+    When use_store is True the store is built chunk by chunk (if needed) and then read through
+    memory maps; otherwise the CSV is parsed in chunks directly.
+
+    :param file_path: Path to the CSV file.
+    :param chunk_rows: Maximum rows per chunk. Defaults to data_processing_config.stream_chunk_rows.
+    :param max_memory_bytes: Ceiling on the raw column bytes of one chunk.
+                             Defaults to data_processing_config.stream_max_memory_bytes.
+    :param format: Desired chunk format ("pandas" or "numpy"). numpy chunks are structured arrays
+                   as returned by ingest_csv(format="numpy"); from the store they are views of its memmap.
+    :param use_store: Whether to read through the binary store instead of parsing the CSV.
+    :return: Generator of chunks in the specified format, in file order.
+    """
+    if format not in ("pandas", "numpy"):
         raise ValueError("Invalid format specified. Choose 'pandas' or 'numpy'.")
 
+    chunk_rows = stream_chunk_size(chunk_rows, max_memory_bytes)
+
+    if not use_store:
+        for chunk in read_ohlcv_csv(file_path, chunk_rows=chunk_rows):
+            yield frame_to_records(chunk) if format == "numpy" else chunk
+        return
+
+    store_path, manifest = ensure_store(file_path, chunk_rows=chunk_rows)
+    if format == "numpy":
+        records = open_store_records(store_path, manifest)
+        for start in range(0, len(records), chunk_rows):
+            yield records[start:start + chunk_rows]
+    else:
+        yield from iter_store_chunks(store_path, manifest, chunk_rows)
+
+
+def ingest_csv_tail(file_path, since_timestamp=None, context_rows=0):
+    """
+    Incrementally ingests an append-only CSV: only candles after since_timestamp are new.
+
+    Rows appended to the CSV since the last run are parsed and appended to the binary store
+    (the rest of the file is not re-read), and only the requested rows are loaded from it.
+
+    :param file_path: Path to the CSV file.
+    :param since_timestamp: Timestamp of the last candle the caller has already ingested (None for all).
+    :param context_rows: Number of already-ingested rows to return before the new ones,
+                         e.g. for indicator warm-up.
+    :return: Tuple of (DataFrame, new_start) where rows from position new_start onwards are new.
+    """
+    return load_ohlcv_tail(file_path, since_timestamp=since_timestamp, context_rows=context_rows)
@@ -0,0 +1,409 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from backend.src.shared.config import global_config
+
+# Column layout of the raw exchange CSVs (headerless) and the dtype each column is stored with.
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume", "trades"]
+OHLCV_DTYPES = {
+    "timestamp": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "trades": np.int64,
+}
+OHLCV_ROW_BYTES = sum(np.dtype(dtype).itemsize for dtype in OHLCV_DTYPES.values())
+# Row layout of the structured array served for format="numpy"
+OHLCV_RECORD_DTYPE = np.dtype([(col, OHLCV_DTYPES[col]) for col in OHLCV_COLUMNS])
+
+STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+RECORDS_NAME = "records.bin"
+
+# Bytes just before the consumed offset that are fingerprinted to confirm a CSV was only appended to
+TAIL_DIGEST_BYTES = 4096
+
+
+def read_ohlcv_csv(file_path, chunk_rows=None):
+    """
+    Parses a raw headerless OHLCV CSV with explicit column dtypes.
+
+    :param file_path: Path to the CSV file.
+    :param chunk_rows: If given, return an iterator of DataFrames of at most this many rows.
+    :return: pandas DataFrame with the OHLCV_COLUMNS (or an iterator of them).
+    """
+    return pd.read_csv(file_path, names=OHLCV_COLUMNS, dtype=OHLCV_DTYPES, engine="c", chunksize=chunk_rows)
+
+
+def get_store_path(file_path, store_root=None, source_root=None):
+    """
+    Returns the store directory that mirrors a source CSV.
+
+    Files inside the data folder keep their coin/pair/file layout under the store folder;
+    anything else is placed under "_external" keyed by a hash of its absolute path.
+
+    :param file_path: Path to the source CSV file.
+    :param store_root: Root of the store. Defaults to global_config.store_folder.
+    :param source_root: Root of the CSV tree. Defaults to global_config.data_folder.
+    :return: Path to the store directory for this file.
+    """
+    store_root = store_root or global_config.store_folder
+    source_root = source_root or global_config.data_folder
+
+    abs_path = os.path.abspath(file_path)
+    try:
+        rel_path = os.path.relpath(abs_path, os.path.abspath(source_root))
+    except ValueError:
+        # Different drives on Windows
+        rel_path = None
+
+    if rel_path is None or rel_path.startswith(os.pardir):
+        digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+        rel_path = os.path.join("_external", f"{digest}_{os.path.basename(abs_path)}")
+
+    return os.path.join(store_root, os.path.splitext(rel_path)[0])
+
+
+def read_manifest(store_path):
+    """Returns the manifest of a store directory, or None if it does not exist or is unreadable."""
+    manifest_path = os.path.join(store_path, MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_store_current(manifest, source_stat):
+    """Checks that a manifest was built from the source file as it currently is on disk."""
+    return (
+        manifest is not None
+        and manifest.get("version") == STORE_VERSION
+        and manifest.get("size") == source_stat.st_size
+        and manifest.get("mtime_ns") == source_stat.st_mtime_ns
+    )
+
+
+def _digest_before(f, offset):
+    """Fingerprints the TAIL_DIGEST_BYTES bytes of an open file that end at offset."""
+    start = max(0, offset - TAIL_DIGEST_BYTES)
+    f.seek(start)
+    return hashlib.blake2b(f.read(offset - start), digest_size=16).hexdigest()
+
+
+def _write_manifest(store_path, manifest):
+    tmp_manifest = os.path.join(store_path, f"{MANIFEST_NAME}.tmp-{os.getpid()}")
+    with open(tmp_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest, os.path.join(store_path, MANIFEST_NAME))
+
+
+def write_store(store_path, chunks, source_path, source_stat):
+    """
+    Writes DataFrames into a store directory as one raw binary file per column.
+
+    The directory is built next to its final location and swapped in, so readers never
+    see a partially written store.
+
+    :param store_path: Target store directory.
+    :param chunks: Iterable of DataFrames with the OHLCV_COLUMNS, in file order.
+    :param source_path: Path of the CSV the data was read from.
+    :param source_stat: os.stat_result of the CSV at the time it was read.
+    :return: The manifest that was written.
+    """
+    tmp_path = f"{store_path}.tmp-{os.getpid()}"
+    old_path = f"{store_path}.old-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    column_paths = {col: os.path.join(tmp_path, f"{col}.bin") for col in OHLCV_COLUMNS}
+    for path in column_paths.values():
+        open(path, "wb").close()
+
+    rows = 0
+    last_timestamp = None
+    for chunk in chunks:
+        for col, path in column_paths.items():
+            column = np.ascontiguousarray(chunk[col].to_numpy(dtype=OHLCV_DTYPES[col]))
+            with open(path, "ab") as f:
+                column.tofile(f)
+        rows += len(chunk)
+        if len(chunk) > 0:
+            last_timestamp = int(chunk["timestamp"].iat[-1])
+
+    # Remember where parsing stopped so later appends to the CSV can be read incrementally.
+    # A file that does not end in a newline may have a half-written last row, so it is not resumable.
+    byte_offset, tail_digest = None, None
+    with open(source_path, "rb") as f:
+        size = source_stat.st_size
+        f.seek(max(0, size - 1))
+        if size == 0 or f.read(1) == b"\n":
+            byte_offset, tail_digest = size, _digest_before(f, size)
+
+    manifest = {
+        "version": STORE_VERSION,
+        "source": os.path.abspath(source_path),
+        "size": source_stat.st_size,
+        "mtime_ns": source_stat.st_mtime_ns,
+        "rows": rows,
+        "columns": {col: np.dtype(OHLCV_DTYPES[col]).str for col in OHLCV_COLUMNS},
+        "byte_offset": byte_offset,
+        "tail_digest": tail_digest,
+        "last_timestamp": last_timestamp,
+        "appended_from": 0,
+    }
+    _write_manifest(tmp_path, manifest)
+
+    if os.path.exists(store_path):
+        os.replace(store_path, old_path)
+    os.replace(tmp_path, store_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return manifest
+
+
+def read_store(store_path, manifest):
+    """
+    Reads every column of a store directory into a DataFrame.
+
+    :param store_path: Store directory.
+    :param manifest: Manifest of the store directory.
+    :return: pandas DataFrame with the OHLCV_COLUMNS.
+    """
+    columns = {}
+    for col in OHLCV_COLUMNS:
+        dtype = np.dtype(manifest["columns"][col])
+        columns[col] = np.fromfile(os.path.join(store_path, f"{col}.bin"), dtype=dtype, count=manifest["rows"])
+    return pd.DataFrame(columns)
+
+
+def open_store_column(store_path, manifest, col):
+    """
+    Memory-maps one column of a store directory (read-only).
+
+    :param store_path: Store directory.
+    :param manifest: Manifest of the store directory.
+    :param col: Column name, one of OHLCV_COLUMNS.
+    :return: numpy memmap (or an empty array for an empty store).
+    """
+    dtype = np.dtype(manifest["columns"][col])
+    if manifest["rows"] == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(store_path, f"{col}.bin"), dtype=dtype, mode="r", shape=(manifest["rows"],))
+
+
+def _record_dtype(manifest):
+    return np.dtype([(col, np.dtype(manifest["columns"][col])) for col in OHLCV_COLUMNS])
+
+
+def frame_to_records(data):
+    """Packs an OHLCV DataFrame into a structured array with the OHLCV_RECORD_DTYPE layout."""
+    records = np.empty(len(data), dtype=OHLCV_RECORD_DTYPE)
+    for col in OHLCV_COLUMNS:
+        records[col] = data[col].to_numpy()
+    return records
+
+
+def open_store_records(store_path, manifest, batch_rows=1_000_000):
+    """
+    Memory-maps a store as one structured array (timestamp:int64, OHLCV:float64, trades:int64).
+
+    The row-major records file is derived from the column files the first time it is asked
+    for and extended when the store has grown since, so later calls (from any process) map it
+    without parsing or copying and share the same page-cache pages. It is (re)built in a
+    temporary file that replaces it once complete, so a concurrent reader never maps a short file.
+
+    :param store_path: Store directory.
+    :param manifest: Manifest of the store directory.
+    :param batch_rows: Rows converted from columns to records at a time when (re)building.
+    :return: Read-only numpy memmap with one record per row.
+    """
+    dtype = _record_dtype(manifest)
+    rows = manifest["rows"]
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+
+    records_path = os.path.join(store_path, RECORDS_NAME)
+    have = os.path.getsize(records_path) // dtype.itemsize if os.path.exists(records_path) else 0
+    if have < rows:
+        columns = {col: open_store_column(store_path, manifest, col) for col in OHLCV_COLUMNS}
+        tmp_path = f"{records_path}.tmp-{os.getpid()}"
+        if have > 0:
+            shutil.copyfile(records_path, tmp_path)  # the rows already converted are kept
+        with open(tmp_path, "r+b" if have > 0 else "wb") as f:
+            f.truncate(have * dtype.itemsize)
+            f.seek(have * dtype.itemsize)
+            for start in range(have, rows, batch_rows):
+                stop = min(start + batch_rows, rows)
+                batch = np.empty(stop - start, dtype=dtype)
+                for col, values in columns.items():
+                    batch[col] = values[start:stop]
+                batch.tofile(f)
+        # Rows are derived deterministically from the columns, so a concurrent writer's file is the same
+        os.replace(tmp_path, records_path)
+
+    return np.memmap(records_path, dtype=dtype, mode="r", shape=(rows,))
+
+
+def iter_store_chunks(store_path, manifest, chunk_rows):
+    """
+    Yields the rows of a store directory as DataFrames of at most chunk_rows rows.
+
+    Columns are memory-mapped, so only the rows of the current chunk are ever resident.
+
+    :param store_path: Store directory.
+    :param manifest: Manifest of the store directory.
+    :param chunk_rows: Maximum number of rows per chunk.
+    """
+    n_rows = manifest["rows"]
+    columns = {col: open_store_column(store_path, manifest, col) for col in OHLCV_COLUMNS}
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        yield pd.DataFrame({col: np.array(values[start:stop]) for col, values in columns.items()})
+
+
+def append_store(store_path, manifest, source_path, source_stat):
+    """
+    Brings a store up to date by parsing only the rows appended to its CSV since it was written.
+
+    The append is only attempted when the CSV grew and the bytes before the previously consumed
+    offset are unchanged; a trailing row without a newline is left for the next call.
+
+    :param store_path: Store directory.
+    :param manifest: Current (stale) manifest of the store directory.
+    :param source_path: Path of the CSV.
+    :param source_stat: os.stat_result of the CSV.
+    :return: The updated manifest, or None if the CSV was not simply appended to and needs a full rebuild.
+    """
+    byte_offset = manifest.get("byte_offset")
+    if manifest.get("version") != STORE_VERSION or byte_offset is None or source_stat.st_size < byte_offset:
+        return None
+
+    with open(source_path, "rb") as f:
+        if _digest_before(f, byte_offset) != manifest["tail_digest"]:
+            return None
+        f.seek(byte_offset)
+        tail = f.read(source_stat.st_size - byte_offset)
+
+    complete = tail.rfind(b"\n") + 1
+    new_rows = read_ohlcv_csv(io.BytesIO(tail[:complete])) if complete > 0 else None
+    n_new = 0 if new_rows is None else len(new_rows)
+    if n_new > 0 and manifest["last_timestamp"] is not None and new_rows["timestamp"].iat[0] <= manifest["last_timestamp"]:
+        return None
+
+    rows = manifest["rows"]
+    row_files = [(os.path.join(store_path, f"{col}.bin"), np.dtype(manifest["columns"][col]), col) for col in OHLCV_COLUMNS]
+    records_path = os.path.join(store_path, RECORDS_NAME)
+    if os.path.exists(records_path):
+        row_files.append((records_path, _record_dtype(manifest), None))
+
+    for path, dtype, col in row_files:
+        with open(path, "r+b") as f:
+            # Drop anything left over from an append that died before its manifest was written
+            if os.fstat(f.fileno()).st_size != rows * dtype.itemsize:
+                f.truncate(rows * dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            if n_new > 0 and col is not None:
+                np.ascontiguousarray(new_rows[col].to_numpy(dtype=dtype)).tofile(f)
+
+    with open(source_path, "rb") as f:
+        tail_digest = _digest_before(f, byte_offset + complete)
+
+    manifest = dict(manifest)
+    manifest.update({
+        "size": source_stat.st_size,
+        "mtime_ns": source_stat.st_mtime_ns,
+        "rows": rows + n_new,
+        "byte_offset": byte_offset + complete,
+        "tail_digest": tail_digest,
+        "last_timestamp": int(new_rows["timestamp"].iat[-1]) if n_new > 0 else manifest["last_timestamp"],
+        "appended_from": rows,
+    })
+    _write_manifest(store_path, manifest)
+    return manifest
+
+
+def ensure_store(file_path, chunk_rows=None, store_root=None, source_root=None):
+    """
+    Makes sure the store for a CSV is current, building it if needed.
+
+    If the CSV only had rows appended since the store was written, just the new tail is parsed
+    and appended (manifest["appended_from"] is then the index of the first new row); any other
+    change rebuilds the store from scratch.
+
+    :param file_path: Path to the source CSV file.
+    :param chunk_rows: If given, the CSV is parsed in chunks of this many rows so that
+                       building the store never holds the whole file in memory.
+    :param store_root: Root of the store. Defaults to global_config.store_folder.
+    :param source_root: Root of the CSV tree. Defaults to global_config.data_folder.
+    :return: Tuple of (store_path, manifest).
+    """
+    store_path = get_store_path(file_path, store_root, source_root)
+    source_stat = os.stat(file_path)
+    manifest = read_manifest(store_path)
+
+    if not is_store_current(manifest, source_stat):
+        appended = append_store(store_path, manifest, file_path, source_stat) if manifest is not None else None
+        if appended is not None:
+            manifest = appended
+        else:
+            chunks = read_ohlcv_csv(file_path, chunk_rows) if chunk_rows else [read_ohlcv_csv(file_path)]
+            manifest = write_store(store_path, chunks, file_path, source_stat)
+
+    return store_path, manifest
+
+
+def load_ohlcv(file_path, store_root=None, source_root=None):
+    """
+    Loads a raw OHLCV CSV through the binary store.
+
+    The store is built from the CSV the first time the file is seen and brought up to date
+    (by appending the new tail, or rebuilding) whenever the CSV's size or modification time
+    no longer matches the manifest. Otherwise the typed columns are read straight from disk
+    without parsing.
+
+    :param file_path: Path to the source CSV file.
+    :param store_root: Root of the store. Defaults to global_config.store_folder.
+    :param source_root: Root of the CSV tree. Defaults to global_config.data_folder.
+    :return: pandas DataFrame with the OHLCV_COLUMNS.
+    """
+    try:
+        store_path, manifest = ensure_store(file_path, store_root=store_root, source_root=source_root)
+    except OSError as e:
+        if not os.path.exists(file_path):
+            raise
+        # A read-only or full store drive should not stop ingestion
+        print(f"Could not write OHLCV store for {file_path}: {e}")
+        return read_ohlcv_csv(file_path)
+
+    return read_store(store_path, manifest)
+
+
+def load_ohlcv_tail(file_path, since_timestamp=None, context_rows=0, store_root=None, source_root=None):
+    """
+    Loads only the rows of an OHLCV CSV newer than since_timestamp, plus some preceding context.
+
+    :param file_path: Path to the source CSV file.
+    :param since_timestamp: Last timestamp the caller already has. None loads everything.
+    :param context_rows: Number of already-seen rows to include before the new ones
+                         (e.g. the indicator warm-up).
+    :param store_root: Root of the store. Defaults to global_config.store_folder.
+    :param source_root: Root of the CSV tree. Defaults to global_config.data_folder.
+    :return: Tuple of (DataFrame, new_start) where new_start is the position of the first new row.
+    """
+    store_path, manifest = ensure_store(file_path, store_root=store_root, source_root=source_root)
+    timestamps = open_store_column(store_path, manifest, "timestamp")
+
+    first_new = 0 if since_timestamp is None else int(np.searchsorted(timestamps, since_timestamp, side="right"))
+    start = max(0, first_new - context_rows)
+    data = pd.DataFrame({
+        col: np.array(open_store_column(store_path, manifest, col)[start:]) for col in OHLCV_COLUMNS
+    })
+    return data, first_new - start
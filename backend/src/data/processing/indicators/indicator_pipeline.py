@@ -1,7 +1,9 @@
 import pandas as pd
 from dataclasses import dataclass
 from typing import List, Dict, Any, Callable
-from backend.src.shared.utils.data_processing.indicator_registry import INDICATOR_FUNCTIONS
+from backend.src.shared.utils.data_processing.indicator_registry import resolve_indicator
+from backend.src.shared.utils.data_processing.indicator_plan import compile_indicator_plan
+from backend.src.shared.utils.data_processing.chunking import map_chunks_with_warmup
 
 @dataclass
 class IndicatorConfig:
@@ -10,41 +12,51 @@ class IndicatorConfig:
     function: Callable
     params: Dict[str, Any]
     columns: List[str]
-    
+
 class IndicatorPipeline:
     """Pipeline for creating technical indicators"""
-    
-    def __init__(self, indicator_configs: List[IndicatorConfig], historical_data: bool = True):
+
+    def __init__(self, indicator_configs: List[IndicatorConfig], historical_data: bool = True, backend: str = None):
         """
         Initialize the indicator pipeline with configurations
-        
+
         Args:
             indicator_configs: List of indicator configurations
             historical_data: Whether to use historical data calculations
+            backend: Indicator implementation, "numba" or "ta". Defaults to data_processing_config.indicator_backend
         """
         self.indicator_configs = indicator_configs
         self.historical_data = historical_data
-        
+        self.plan = compile_indicator_plan(indicator_configs, historical_data, backend)
+        self.backend = self.plan.backend
+
+    def _resolve(self, config):
+        """Look up an indicator in the registry and merge its default params with the overrides."""
+        return resolve_indicator(config, self.historical_data)
+
     def run(self, df):
         """
-        Apply each indicator in sequence, mutating the DataFrame.
-        Returns the same DataFrame with new columns for each indicator.
+        Compute every configured indicator through the compiled IndicatorPlan.
+        Returns a new DataFrame with df's columns followed by the indicator columns.
         """
+        return self.plan.run(df)
+
+    def warmup_rows(self):
+        """
+        Number of leading rows the configured indicators need before their values
+        no longer depend on where the input data starts.
+        """
+        rows = 0
         for config in self.indicator_configs:
-            ind_name = config['name']
-            # get the function + default params from the registry
-            if ind_name not in INDICATOR_FUNCTIONS:
-                raise ValueError(f"Indicator '{ind_name}' not found in registry.")
-            
-            func = INDICATOR_FUNCTIONS[ind_name]['func']
-            params = INDICATOR_FUNCTIONS[ind_name]['params'].copy()
-            params['historical_data'] = self.historical_data
-            # override defaults if provided
-            if 'override_params' in config:
-                for k, v in config['override_params'].items():
-                    params[k] = v
-
-            # apply the function
-            df = func(df, **params)
-
-        return df
\ No newline at end of file
+            entry, params = self._resolve(config)
+            rows = max(rows, entry['warmup'](params))
+        # +1 for the shift applied to historical indicators
+        return rows + 1 if self.historical_data else rows
+
+    def run_chunks(self, chunks):
+        """
+        Apply the pipeline to a stream of chronological chunks (e.g. from ingest_csv_chunks).
+        Warm-up rows are carried across chunk boundaries so the output matches run() on the
+        concatenated data.
+        """
+        return map_chunks_with_warmup(chunks, self.warmup_rows(), self.run)
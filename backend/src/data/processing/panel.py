@@ -0,0 +1,116 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from backend.src.shared.utils.data_processing.indicator_plan import compile_indicator_plan
+
+PANEL_FIELDS = ["open", "high", "low", "close", "volume", "trades"]
+
+
+@dataclass
+class Panel:
+    """
+    Candles of many assets on one timeframe, stored asset after asset.
+
+    data holds one float64 row per field with the candles of every asset concatenated, asset a
+    spanning columns starts[a]:starts[a+1] in time order, which is cheap to build from and split
+    back into per-asset frames. The indicator kernels stack these segments time-major by candle
+    (see IndicatorPlan.run_segments); aligned() gives the candles as a (time x asset x field)
+    array on the union of the timestamps, NaN where an asset has no candle.
+    """
+    assets: List[Any]                # asset keys, e.g. (coin, pair)
+    fields: List[str]
+    timestamps: np.ndarray           # (rows,) int64, sorted within each asset
+    data: np.ndarray                 # (F, rows) float64
+    starts: np.ndarray               # (A + 1,) int64 segment boundaries
+    dtypes: Dict[str, Any] = field(default_factory=dict)  # original dtype of each field
+
+    def column(self, name) -> np.ndarray:
+        """Concatenated values of one field."""
+        return self.data[self.fields.index(name)]
+
+    def aligned(self):
+        """
+        The panel aligned on the union of all timestamps.
+
+        :return: (timestamps (T,), values (T x A x F) float64 with NaN where an asset has no
+                 candle, mask (A x T) bool of the present candles).
+        """
+        timestamps = np.unique(self.timestamps)
+        values = np.full((len(timestamps), len(self.assets), len(self.fields)), np.nan)
+        mask = np.zeros((len(self.assets), len(timestamps)), dtype=bool)
+        for a in range(len(self.assets)):
+            segment = slice(self.starts[a], self.starts[a + 1])
+            positions = np.searchsorted(timestamps, self.timestamps[segment])
+            mask[a, positions] = True
+            values[positions, a, :] = self.data[:, segment].T
+        return timestamps, values, mask
+
+
+def build_panel(frames:dict, fields:list=None) -> Panel:
+    """
+    Stacks the candle DataFrames of many assets into a Panel.
+
+    :param frames: Dictionary of {asset: DataFrame} with a timestamp column and the fields,
+                   each sorted by timestamp without duplicate timestamps.
+    :param fields: Fields to include. Defaults to PANEL_FIELDS.
+    :return: Panel of the assets in the order of frames.
+    """
+    fields = fields or PANEL_FIELDS
+    assets = list(frames)
+    starts = np.zeros(len(assets) + 1, dtype=np.int64)
+    np.cumsum([len(frames[asset]) for asset in assets], out=starts[1:])
+
+    timestamps = np.empty(starts[-1], dtype=np.int64)
+    data = np.empty((len(fields), starts[-1]), dtype=np.float64)
+    for a, asset in enumerate(assets):
+        frame = frames[asset]
+        segment = slice(starts[a], starts[a + 1])
+        timestamps[segment] = frame["timestamp"].to_numpy()
+        for f, name in enumerate(fields):
+            data[f, segment] = frame[name].to_numpy(dtype=np.float64)
+
+    dtypes = {name: frames[assets[0]][name].dtype for name in fields} if assets else {}
+    return Panel(assets=assets, fields=fields, timestamps=timestamps, data=data, starts=starts, dtypes=dtypes)
+
+
+def compute_panel_indicators(panel:Panel, indicator_configs:list, historical_data:bool=True) -> pd.DataFrame:
+    """
+    Computes the indicators of every asset in one batched pass.
+
+    Each node of the compiled IndicatorPlan runs once for all assets (IndicatorPlan.run_segments),
+    so every asset gets exactly the values IndicatorPipeline(backend="numba") would give it alone.
+
+    :param panel: Panel of one timeframe.
+    :param indicator_configs: Indicator configs of that timeframe.
+    :param historical_data: Shift the indicators by one candle, as in create_indicators.
+    :return: DataFrame of the indicator columns, row for row with panel.timestamps.
+    """
+    plan = compile_indicator_plan(indicator_configs, historical_data, backend="numba")
+    block = plan.run_segments({col: panel.column(col) for col in plan.input_columns}, panel.starts)
+    # block.T is column-major, so the frame wraps the buffer as a single block without copying
+    return pd.DataFrame(block.T, columns=plan.columns, copy=False)
+
+
+def panel_to_frames(panel:Panel, features:pd.DataFrame=None) -> Dict[Any, pd.DataFrame]:
+    """
+    Splits a Panel (plus optional extra columns row for row with it, e.g. from
+    compute_panel_indicators) back into one DataFrame per asset.
+
+    Each frame holds the asset's candles with timestamp, the panel fields in their original
+    dtypes and then the extra columns, like the per-asset output of create_indicators.
+    """
+    universe = {"timestamp": panel.timestamps}
+    for name in panel.fields:
+        universe[name] = panel.column(name).astype(panel.dtypes.get(name, np.float64), copy=False)
+    universe = pd.DataFrame(universe, copy=False)
+    if features is not None:
+        universe = pd.concat([universe, features], axis=1)
+
+    # one frame for the universe sliced per asset, instead of assembling every frame column by column
+    return {
+        asset: universe.iloc[panel.starts[a]:panel.starts[a + 1]].reset_index(drop=True)
+        for a, asset in enumerate(panel.assets)
+    }
@@ -1,23 +1,187 @@
-from backend.src.shared.config.data_processing_config import timeframes, target_timeframe
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from backend.src.shared.config.data_processing_config import timeframes, target_timeframe, parallel_timeframes, timeframe_io_workers, timeframe_cpu_workers, use_catalog, resample_timeframes, base_timeframe
 from backend.src.data.staging.get_csv_paths import get_csv_paths
-from backend.src.data.ingestion.ingest_csv import ingest_csv
+from backend.src.data.ingestion.ingest_csv import ingest_csv, ingest_csv_chunks, ingest_csv_tail, stream_chunk_size
+from backend.src.data.ingestion.ohlcv_store import ensure_store
 from backend.src.shared.config.global_config import data_folder
-from backend.src.data.processing.process_timeframes import process_timeframe
-from backend.src.data.processing.merge_timeframes import merge_timeframes
+from backend.src.data.processing.process_timeframes import process_timeframe, process_timeframe_chunks, process_timeframe_incremental, incremental_context_rows
+from backend.src.data.processing.merge_timeframes import merge_timeframes, IncrementalMerger
+from backend.src.data.processing.resample import resample_ohlcv
+import pandas as pd
 
-def process_coinpair(coin, pair):
-    data_dict = {}
-   
-    csv_paths = get_csv_paths(data_folder, coin, pair, timeframes)
+def load_and_process_timeframe(file_path, timeframe, streaming=False):
+    """
+    Ingests one timeframe file and computes its features.
+    Runs in a worker process when timeframes are processed in parallel: the worker loads the
+    columns from the binary store itself (np.fromfile, no CSV parsing), so only the (smaller)
+    processed frame is sent back to the parent.
 
-    for timeframe in csv_paths[coin][pair]['timeframes']:
-        data = ingest_csv(csv_paths[coin][pair]['timeframes'][timeframe])
-        processed_data = process_timeframe(data, timeframe, target_timeframe)
-        data_dict[timeframe] = processed_data
-        
+    With streaming, the CSV is parsed and its indicators computed chunk by chunk, so the raw
+    candles never sit in memory whole; the processed chunks are then concatenated, because
+    merge_timeframes needs every timeframe as one frame. stream_max_memory_bytes bounds the raw
+    chunks only: peak memory still grows with the processed timeframe, which is held twice
+    while its chunks are concatenated.
+    """
+    if streaming:
+        processed_chunks = process_timeframe_chunks(ingest_csv_chunks(file_path), timeframe, target_timeframe)
+        return pd.concat(list(processed_chunks), ignore_index=True)
+    data = ingest_csv(file_path)
+    return process_timeframe(data, timeframe, target_timeframe)
+
+def _process_timeframes_parallel(timeframe_paths, streaming, cpu_workers):
+    """
+    Refreshes each timeframe's store on a thread (I/O and CSV parsing) and, as soon as a store
+    is ready, computes that timeframe's indicators in a worker process.
+    """
+    io_workers = min(timeframe_io_workers, len(timeframe_paths))
+    cpu_workers = min(cpu_workers, len(timeframe_paths))
+
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool:
+        def refresh_then_submit(timeframe, file_path):
+            # when streaming, a stale store is rebuilt chunk by chunk too
+            ensure_store(file_path, chunk_rows=stream_chunk_size() if streaming else None)
+            return cpu_pool.submit(load_and_process_timeframe, file_path, timeframe, streaming)
+
+        staged = {
+            timeframe: io_pool.submit(refresh_then_submit, timeframe, file_path)
+            for timeframe, file_path in timeframe_paths.items()
+        }
+        # Keep the crawl order of the timeframes so merged columns come out in the same order
+        return {timeframe: future.result().result() for timeframe, future in staged.items()}
+
+def _process_resampled_timeframes(base_path, parallel, cpu_workers):
+    """
+    Builds every configured timeframe from the base_timeframe file in one resampling pass and
+    computes each one's features (in worker processes when parallel).
+    """
+    resampled = resample_ohlcv(ingest_csv(base_path), timeframes, base_timeframe)
+    if not parallel or len(resampled) < 2:
+        return {timeframe: process_timeframe(data, timeframe, target_timeframe) for timeframe, data in resampled.items()}
+
+    with ProcessPoolExecutor(max_workers=min(cpu_workers, len(resampled))) as cpu_pool:
+        futures = {
+            timeframe: cpu_pool.submit(process_timeframe, data, timeframe, target_timeframe)
+            for timeframe, data in resampled.items()
+        }
+        return {timeframe: future.result() for timeframe, future in futures.items()}
+
+def process_coinpair(coin, pair, streaming=False, parallel=None, resample=None, cpu_workers=None):
+    """
+    Loads, processes and merges every configured timeframe of a coin pair.
+
+    :param coin: Coin folder name (e.g. "ETH").
+    :param pair: Pair folder name (e.g. "ETHUSD").
+    :param streaming: Process each timeframe in bounded-memory chunks (see ingest_csv_chunks)
+                      instead of loading whole files. The result is the same; the processed
+                      timeframes are still held whole for the merge (see load_and_process_timeframe).
+    :param parallel: Process the timeframes concurrently instead of one after another.
+                     Defaults to data_processing_config.parallel_timeframes.
+    :param resample: Derive every timeframe from the base_timeframe CSV (see resample.py) instead of
+                     reading one CSV per timeframe. Defaults to data_processing_config.resample_timeframes.
+                     The resampled frames are already small, so streaming does not apply to them.
+    :param cpu_workers: Worker processes computing indicators when parallel. Defaults to
+                        data_processing_config.timeframe_cpu_workers; callers running several
+                        pairs at once pass their share of the cores.
+    :return: Merged DataFrame on the target timeframe.
+    """
+    if parallel is None:
+        parallel = parallel_timeframes
+    if resample is None:
+        resample = resample_timeframes
+    cpu_workers = cpu_workers or timeframe_cpu_workers
+    # a single worker process only adds the cost of shipping frames to it
+    parallel = parallel and cpu_workers > 1
+
+    if resample:
+        csv_paths = get_csv_paths(data_folder, coin, pair, [base_timeframe], use_catalog=use_catalog)
+        data_dict = _process_resampled_timeframes(csv_paths[coin][pair]['timeframes'][base_timeframe], parallel, cpu_workers)
+        return merge_timeframes(data_dict, target_timeframe)
+
+    csv_paths = get_csv_paths(data_folder, coin, pair, timeframes, use_catalog=use_catalog)
+    timeframe_paths = csv_paths[coin][pair]['timeframes']
+
+    if parallel and len(timeframe_paths) > 1:
+        data_dict = _process_timeframes_parallel(timeframe_paths, streaming, cpu_workers)
+    else:
+        data_dict = {}
+        for timeframe, file_path in timeframe_paths.items():
+            data_dict[timeframe] = load_and_process_timeframe(file_path, timeframe, streaming)
 
     merged_data = merge_timeframes(data_dict, target_timeframe)
 
     return merged_data
 
 
+class IncrementalCoinpair:
+    """
+    Keeps the processed timeframes and merged frame of one coin pair in memory and extends them
+    as the (append-only) CSVs grow, instead of re-running process_coinpair over the full history.
+    """
+
+    def __init__(self, coin, pair):
+        self.coin = coin
+        self.pair = pair
+        self.processed = {}        # timeframe -> processed DataFrame
+        self.last_timestamps = {}  # timeframe -> last raw candle ingested
+        self.merged = None
+        self.merger = None         # emits the merged rows of new target bars
+
+    def update(self):
+        """
+        Ingests the candles appended to each timeframe file since the last update, recomputes
+        features for just those rows and re-merges only the target rows that can see them.
+
+        Returns:
+            pd.DataFrame: The merged rows that were added or changed by this update
+                          (all rows on the first call). self.merged holds the full result.
+        """
+        csv_paths = get_csv_paths(data_folder, self.coin, self.pair, timeframes, use_catalog=use_catalog)
+        timeframe_paths = csv_paths[self.coin][self.pair]['timeframes']
+
+        first_new = {}
+        for timeframe, file_path in timeframe_paths.items():
+            data, new_start = ingest_csv_tail(
+                file_path,
+                since_timestamp=self.last_timestamps.get(timeframe),
+                context_rows=incremental_context_rows(timeframe)
+            )
+            if new_start >= len(data):
+                continue
+            first_new[timeframe] = data['timestamp'].iloc[new_start]
+            self.last_timestamps[timeframe] = data['timestamp'].iloc[-1]
+            self.processed[timeframe] = process_timeframe_incremental(
+                data, new_start, self.processed.get(timeframe), timeframe, target_timeframe
+            )
+
+        if self.merged is None:
+            self.merged = merge_timeframes(self.processed, target_timeframe)
+            self.merger = IncrementalMerger(target_timeframe, after_timestamp=self.merged['timestamp'].iloc[-1] if len(self.merged) else None)
+            return self.merged
+        if not first_new:
+            return self.merged.iloc[0:0]
+
+        # A target row T reads bars of timeframe tf with timestamp <= T - tf minutes, so new
+        # bars can only change target rows from their timestamp + one tf period onwards.
+        affected_from = min(
+            ts if tf == target_timeframe else ts + tf * 60
+            for tf, ts in first_new.items()
+        )
+        last_merged = self.merged['timestamp'].iloc[-1] if len(self.merged) else None
+        if last_merged is not None and affected_from > last_merged:
+            # Only new target bars are affected (the usual case): merge just those rows
+            merged_suffix = self.merger.update(self.processed)
+            self.merged = pd.concat([self.merged, merged_suffix], ignore_index=True)
+            return merged_suffix
+
+        # A late bar changes rows that were already merged: re-merge from the first of them
+        target_df = self.processed[target_timeframe]
+        target_suffix = target_df[target_df['timestamp'] >= affected_from]
+
+        suffix_dict = dict(self.processed)
+        suffix_dict[target_timeframe] = target_suffix
+        merged_suffix = merge_timeframes(suffix_dict, target_timeframe)
+
+        kept = self.merged[self.merged['timestamp'] < affected_from]
+        self.merged = pd.concat([kept, merged_suffix], ignore_index=True)
+        self.merger = IncrementalMerger(target_timeframe, after_timestamp=self.merged['timestamp'].iloc[-1] if len(self.merged) else None)
+        return merged_suffix
@@ -1,8 +1,20 @@
 import pandas as pd
 from backend.src.data.processing.indicators.create_indicators import create_indicators
+from backend.src.data.processing.indicators.indicator_pipeline import IndicatorPipeline
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.shared.utils.data_processing.chunking import map_chunks_with_warmup
+from backend.src.shared.utils.data_processing.compact import compact_features
+from backend.src.shared.config import data_processing_config
 
-def process_timeframe(data:pd.DataFrame, timeframe:int, target_timeframe:int, relative_returns:bool=False, historical_data:bool=True):
+def process_timeframe(data:pd.DataFrame, timeframe:int, target_timeframe:int, relative_returns:bool=False, historical_data:bool=True, compact:bool=None):
+    # compact: store features as float32 (defaults to data_processing_config.compact_features)
     data = create_indicators(data, timeframe, historical_data)
+    return finish_timeframe(data, timeframe, target_timeframe, relative_returns, compact)
+
+def finish_timeframe(data:pd.DataFrame, timeframe:int, target_timeframe:int, relative_returns:bool=False, compact:bool=None):
+    """The steps of process_timeframe after the indicators: targets, dropping raw columns and NaN rows, compaction."""
+    if compact is None:
+        compact = data_processing_config.compact_features
     # if relative_returns:
     #     data = create_relative_returns(data, historical_data)
     if target_timeframe == timeframe:
@@ -11,8 +23,46 @@ def process_timeframe(data:pd.DataFrame, timeframe:int, target_timeframe:int, re
     #drop open, high, low, volume, timestamp
     data.drop(columns=['open', 'high', 'low','trades'], inplace=True)
     data.dropna(inplace=True)
+    if compact:
+        data = compact_features(data)
     return data
 
+def process_timeframe_chunks(chunks, timeframe:int, target_timeframe:int, relative_returns:bool=False, historical_data:bool=True):
+    """
+    Streaming version of process_timeframe for chunks from ingest_csv_chunks.
+    The indicator warm-up rows (plus one row for the target shift) are carried across chunk
+    boundaries, so concatenating the yielded chunks gives the same result as process_timeframe
+    on the whole file (recursive indicators exactly, rolling ones to ~1e-11 relative).
+    """
+    warmup_rows = incremental_context_rows(timeframe, historical_data)
+    return map_chunks_with_warmup(
+        chunks,
+        warmup_rows,
+        lambda chunk: process_timeframe(chunk, timeframe, target_timeframe, relative_returns, historical_data)
+    )
+
+def process_timeframe_incremental(data:pd.DataFrame, new_start:int, previous:pd.DataFrame, timeframe:int, target_timeframe:int, relative_returns:bool=False, historical_data:bool=True):
+    """
+    Extends a previously processed timeframe with newly ingested candles.
+    data holds the new candles from position new_start, preceded by at least
+    incremental_context_rows(timeframe) already-processed candles (see ingest_csv_tail).
+    Only that suffix is recomputed; rows already in previous are kept as they are.
+    """
+    if previous is None or len(previous) == 0:
+        return process_timeframe(data, timeframe, target_timeframe, relative_returns, historical_data)
+    if new_start >= len(data):
+        return previous
+
+    last_timestamp = previous['timestamp'].iloc[-1]
+    processed = process_timeframe(data, timeframe, target_timeframe, relative_returns, historical_data)
+    processed = processed[processed['timestamp'] > last_timestamp]
+    return pd.concat([previous, processed], ignore_index=True)
+
+def incremental_context_rows(timeframe:int, historical_data:bool=True):
+    """Rows of history process_timeframe_incremental needs in front of the new candles."""
+    # +1 for the previous_close / target shift on the target timeframe
+    return IndicatorPipeline(indicator_configs[timeframe], historical_data).warmup_rows() + 1
+
 def create_targets(data, relative_returns:bool=True):
     if relative_returns:
         data['target'] = (data['close'] - data['close'].shift(1)) / data['close'].shift(1) * 100
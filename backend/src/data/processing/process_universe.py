@@ -0,0 +1,54 @@
+from backend.src.shared.config.data_processing_config import coin_pairs as configured_coin_pairs, timeframes, target_timeframe, use_catalog, resample_timeframes, base_timeframe
+from backend.src.shared.config.global_config import data_folder
+from backend.src.data.staging.get_csv_paths import get_csv_paths
+from backend.src.data.ingestion.ingest_csv import ingest_csv
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.data.processing.merge_timeframes import merge_timeframes
+from backend.src.data.processing.panel import build_panel, compute_panel_indicators, panel_to_frames
+from backend.src.data.processing.process_timeframes import finish_timeframe
+from backend.src.data.processing.resample import resample_ohlcv
+
+def load_raw_timeframes(coin, pair, resample=None):
+    """
+    Loads the raw candles of every configured timeframe of a coin pair, from one CSV per
+    timeframe or resampled from the base_timeframe CSV (see process_coinpair).
+
+    :return: Dictionary of {timeframe: DataFrame}.
+    """
+    if resample is None:
+        resample = resample_timeframes
+    if resample:
+        csv_paths = get_csv_paths(data_folder, coin, pair, [base_timeframe], use_catalog=use_catalog)
+        return resample_ohlcv(ingest_csv(csv_paths[coin][pair]['timeframes'][base_timeframe]), timeframes, base_timeframe)
+
+    csv_paths = get_csv_paths(data_folder, coin, pair, timeframes, use_catalog=use_catalog)
+    return {timeframe: ingest_csv(file_path) for timeframe, file_path in csv_paths[coin][pair]['timeframes'].items()}
+
+def process_universe(coin_pairs:dict=None, resample:bool=None, historical_data:bool=True):
+    """
+    process_coinpair for many coin pairs at once.
+
+    For each timeframe the candles of all pairs are stacked into one Panel and every indicator
+    is computed for all of them in one batched pass (see panel.py), instead of one
+    create_indicators call per pair and timeframe. The per-pair frames then go through the same
+    targets / merge steps as process_coinpair, so each result equals process_coinpair's output
+    with the "numba" indicator backend.
+
+    :param coin_pairs: Dictionary of {coin: pair}. Defaults to data_processing_config.coin_pairs.
+    :param resample: Derive the timeframes from the base_timeframe CSV (see process_coinpair).
+    :param historical_data: Shift the indicators by one candle, as in create_indicators.
+    :return: Dictionary of {(coin, pair): merged DataFrame on the target timeframe}.
+    """
+    coin_pairs = coin_pairs or configured_coin_pairs
+    raw = {(coin, pair): load_raw_timeframes(coin, pair, resample) for coin, pair in coin_pairs.items()}
+
+    processed = {asset: {} for asset in raw}
+    for timeframe in sorted({tf for asset_timeframes in raw.values() for tf in asset_timeframes}):
+        panel = build_panel({asset: frames[timeframe] for asset, frames in raw.items() if timeframe in frames})
+        indicators = compute_panel_indicators(panel, indicator_configs[timeframe], historical_data)
+        for asset, data in panel_to_frames(panel, indicators).items():
+            # as create_indicators does before the per-timeframe steps
+            data.dropna(inplace=True)
+            processed[asset][timeframe] = finish_timeframe(data, timeframe, target_timeframe)
+
+    return {asset: merge_timeframes(data_dict, target_timeframe) for asset, data_dict in processed.items()}
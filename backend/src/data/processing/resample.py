@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# How each OHLCV column is aggregated into a coarser bar
+RESAMPLE_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "trades": "sum",
+}
+
+
+def _bucket_starts(timestamps, timeframe):
+    """
+    Epoch-aligned bucket of every row and the positions where a new bucket begins.
+
+    :return: Tuple of (bucket timestamp of each group, index of the first row of each group).
+    """
+    seconds = timeframe * 60
+    buckets = timestamps // seconds * seconds
+    if len(buckets) == 0:
+        return buckets, np.empty(0, dtype=np.intp)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    return buckets[starts], starts
+
+
+def _aggregate(columns, starts):
+    """Reduces every column over the groups beginning at starts, in one reduceat per column."""
+    if len(starts) == 0:
+        return {col: values[:0] for col, values in columns.items()}
+    aggregated = {}
+    ends = np.r_[starts[1:], len(next(iter(columns.values())))] - 1
+    for col, values in columns.items():
+        how = RESAMPLE_AGGREGATIONS[col]
+        if how == "first":
+            aggregated[col] = values[starts]
+        elif how == "last":
+            aggregated[col] = values[ends]
+        elif how == "max":
+            aggregated[col] = np.maximum.reduceat(values, starts)
+        elif how == "min":
+            aggregated[col] = np.minimum.reduceat(values, starts)
+        else:
+            aggregated[col] = np.add.reduceat(values, starts)
+    return aggregated
+
+
+def _resample_source(timeframe, available):
+    """The coarsest already-built timeframe that evenly divides timeframe."""
+    return max(tf for tf in available if timeframe % tf == 0)
+
+
+def resample_ohlcv(data:pd.DataFrame, timeframes:list, base_timeframe:int=1):
+    """
+    Builds OHLCV+trades bars of several timeframes from a finer (by default 1 minute) series.
+
+    Rows are grouped into epoch-aligned buckets (timestamp // (tf * 60) * tf * 60, so 1440 bars
+    start at 00:00 UTC like Kraken's) and aggregated with numpy reduceat: open=first, high=max,
+    low=min, close=last, volume/trades=sum. Each timeframe is derived from the coarsest one
+    already built that divides it (5 from 1, 15 from 5, 60 from 30, ...), which gives the same
+    bars as aggregating the base series directly at a fraction of the work. Buckets without any
+    base candle produce no bar, as in the exported files.
+
+    :param data: Base candles sorted by timestamp (columns timestamp, open, high, low, close, volume, trades).
+    :param timeframes: Timeframes in minutes to build. Each must be a multiple of base_timeframe.
+    :param base_timeframe: Timeframe of data in minutes.
+    :return: Dictionary of {timeframe: DataFrame} with the same columns and dtypes as data.
+    """
+    invalid = [tf for tf in timeframes if tf % base_timeframe != 0]
+    if invalid:
+        raise ValueError(f"Timeframes {invalid} are not multiples of the base timeframe {base_timeframe}.")
+
+    value_columns = [col for col in RESAMPLE_AGGREGATIONS if col in data.columns]
+    built = {
+        base_timeframe: {
+            "timestamp": data["timestamp"].to_numpy(),
+            **{col: data[col].to_numpy() for col in value_columns},
+        }
+    }
+    for timeframe in sorted(set(timeframes)):
+        if timeframe in built:
+            continue
+        source = built[_resample_source(timeframe, built)]
+        buckets, starts = _bucket_starts(source["timestamp"], timeframe)
+        built[timeframe] = {
+            "timestamp": buckets,
+            **_aggregate({col: source[col] for col in value_columns}, starts),
+        }
+
+    dtypes = {col: data[col].dtype for col in ["timestamp", *value_columns]}
+    return {timeframe: pd.DataFrame(built[timeframe]).astype(dtypes) for timeframe in timeframes}
@@ -0,0 +1,225 @@
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from backend.src.data.ingestion.ingest_csv import stream_chunk_size
+from backend.src.data.ingestion.ohlcv_store import ensure_store, open_store_column
+from backend.src.shared.config import global_config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    coin TEXT NOT NULL,
+    pair TEXT NOT NULL,
+    timeframe INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    first_timestamp INTEGER,
+    last_timestamp INTEGER,
+    gap_count INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS files_by_key ON files (root, coin, pair, timeframe);
+CREATE TABLE IF NOT EXISTS gaps (
+    path TEXT NOT NULL,
+    start_timestamp INTEGER NOT NULL,
+    end_timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gaps_by_path ON gaps (path);
+"""
+
+_ENTRY_COLUMNS = ["path", "root", "coin", "pair", "timeframe", "size", "mtime_ns", "rows", "first_timestamp", "last_timestamp", "gap_count"]
+
+
+def parse_timeframe(file_name):
+    """
+    Extracts the timeframe (in minutes) from a "<PAIR>_<timeframe>.csv" file name.
+
+    :return: The timeframe as an int, or None if the name does not follow the convention.
+    """
+    stem, ext = os.path.splitext(file_name)
+    if ext.lower() != ".csv" or "_" not in stem:
+        return None
+    timeframe = stem.rsplit("_", 1)[1]
+    return int(timeframe) if timeframe.isdigit() else None
+
+
+def compute_file_stats(file_path, timeframe):
+    """
+    Computes the row count, first/last timestamp and gaps of an OHLCV file from its binary store.
+
+    A gap is any pair of consecutive candles more than one timeframe apart. A missing or stale
+    store is built by parsing the CSV in streaming-sized chunks (see ingest_csv.stream_chunk_size),
+    so scanning large files on the refresh thread pool never holds a whole CSV in memory.
+
+    :return: Tuple of (rows, first_timestamp, last_timestamp, gaps) where gaps is an (n, 2) array
+             of the timestamps either side of each gap.
+    """
+    store_path, manifest = ensure_store(file_path, chunk_rows=stream_chunk_size())
+    timestamps = np.asarray(open_store_column(store_path, manifest, "timestamp"))
+    if len(timestamps) == 0:
+        return 0, None, None, np.empty((0, 2), dtype=np.int64)
+
+    gap_idx = np.flatnonzero(np.diff(timestamps) > timeframe * 60)
+    gaps = np.column_stack([timestamps[gap_idx], timestamps[gap_idx + 1]])
+    return len(timestamps), int(timestamps[0]), int(timestamps[-1]), gaps
+
+
+class DataCatalog:
+    """
+    Persistent index of the OHLCV CSVs in the data folder.
+
+    Each file's path, size, mtime, row count, first/last timestamp and gaps are kept in a small
+    SQLite database. refresh() walks the folder with os.scandir and only re-reads files whose
+    size or mtime changed, so lookups afterwards are single indexed queries instead of a crawl.
+    """
+
+    def __init__(self, base_folder=None, catalog_path=None):
+        """
+        Args:
+            base_folder (str): Root of the coin/pair/file tree. Defaults to global_config.data_folder.
+            catalog_path (str): SQLite file of the catalog. Defaults to global_config.catalog_path.
+        """
+        self.base_folder = base_folder or global_config.data_folder
+        self.root = os.path.abspath(self.base_folder)
+        self.catalog_path = catalog_path or global_config.catalog_path
+        os.makedirs(os.path.dirname(os.path.abspath(self.catalog_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.catalog_path, timeout=60)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _scan(self, coin=None, pair=None):
+        """Yields (coin, pair, timeframe, path, stat) for every matching CSV under the base folder."""
+        with os.scandir(self.base_folder) as coin_entries:
+            for coin_entry in coin_entries:
+                if (coin and coin_entry.name != coin) or not coin_entry.is_dir():
+                    continue
+                with os.scandir(coin_entry.path) as pair_entries:
+                    for pair_entry in pair_entries:
+                        if (pair and pair_entry.name != pair) or not pair_entry.is_dir():
+                            continue
+                        with os.scandir(pair_entry.path) as file_entries:
+                            for file_entry in file_entries:
+                                timeframe = parse_timeframe(file_entry.name)
+                                if timeframe is None or not file_entry.is_file():
+                                    continue
+                                yield coin_entry.name, pair_entry.name, timeframe, file_entry.path, file_entry.stat()
+
+    def refresh(self, coin=None, pair=None, max_workers=8):
+        """
+        Brings the catalog in line with the data folder (optionally only one coin / pair).
+
+        Unchanged files (same size and mtime) are skipped; new or modified files are re-read on a
+        thread pool; files that disappeared are removed.
+
+        Args:
+            coin (str): Only refresh this coin.
+            pair (str): Only refresh this pair.
+            max_workers (int): Threads used to read new or modified files.
+
+        Returns:
+            list: Paths of the files that were added or changed.
+        """
+        known = {
+            row["path"]: (row["size"], row["mtime_ns"])
+            for row in self.conn.execute(*self._where("SELECT path, size, mtime_ns FROM files", coin, pair))
+        }
+        seen = set()
+        stale = []
+        for file_coin, file_pair, timeframe, path, stat in self._scan(coin, pair):
+            seen.add(path)
+            if known.get(path) != (stat.st_size, stat.st_mtime_ns):
+                stale.append((file_coin, file_pair, timeframe, path, stat))
+
+        changed = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(stale)))) as pool:
+            stats = pool.map(lambda item: compute_file_stats(item[3], item[2]), stale)
+            for (file_coin, file_pair, timeframe, path, stat), (rows, first_ts, last_ts, gaps) in zip(stale, stats):
+                self._write_entry(path, file_coin, file_pair, timeframe, stat, rows, first_ts, last_ts, gaps)
+                changed.append(path)
+
+        removed = [path for path in known if path not in seen]
+        if removed:
+            with self.conn:
+                self.conn.executemany("DELETE FROM gaps WHERE path = ?", [(path,) for path in removed])
+                self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+
+        return changed
+
+    def _write_entry(self, path, file_coin, file_pair, timeframe, stat, rows, first_ts, last_ts, gaps):
+        with self.conn:
+            # A renamed file may take over the (coin, pair, timeframe) of an old entry
+            replaced = [
+                row["path"] for row in self.conn.execute(
+                    "SELECT path FROM files WHERE path = ? OR (root = ? AND coin = ? AND pair = ? AND timeframe = ?)",
+                    (path, self.root, file_coin, file_pair, timeframe)
+                )
+            ]
+            self.conn.executemany("DELETE FROM gaps WHERE path = ?", [(old,) for old in replaced])
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(old,) for old in replaced])
+            self.conn.execute(
+                f"INSERT INTO files ({', '.join(_ENTRY_COLUMNS)}) VALUES ({', '.join('?' * len(_ENTRY_COLUMNS))})",
+                (path, self.root, file_coin, file_pair, timeframe, stat.st_size, stat.st_mtime_ns, rows, first_ts, last_ts, len(gaps))
+            )
+            self.conn.executemany(
+                "INSERT INTO gaps (path, start_timestamp, end_timestamp) VALUES (?, ?, ?)",
+                [(path, start, end) for start, end in gaps.tolist()]
+            )
+
+    def _where(self, query, coin=None, pair=None, timeframes=None):
+        clauses, params = ["root = ?"], [self.root]
+        if coin:
+            clauses.append("coin = ?")
+            params.append(coin)
+        if pair:
+            clauses.append("pair = ?")
+            params.append(pair)
+        if timeframes is not None:
+            timeframes = [int(t) for t in timeframes]
+            clauses.append(f"timeframe IN ({', '.join('?' * len(timeframes))})")
+            params.extend(timeframes)
+        return query + " WHERE " + " AND ".join(clauses), params
+
+    def get_entry(self, coin, pair, timeframe):
+        """Returns the catalog entry of one file as a dict, or None if it is not catalogued."""
+        row = self.conn.execute(
+            "SELECT * FROM files WHERE root = ? AND coin = ? AND pair = ? AND timeframe = ?", (self.root, coin, pair, int(timeframe))
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_path(self, coin, pair, timeframe):
+        """Returns the CSV path of one coin/pair/timeframe, or None if it is not catalogued."""
+        entry = self.get_entry(coin, pair, timeframe)
+        return entry["path"] if entry is not None else None
+
+    def get_gaps(self, path):
+        """Returns the gaps of a file as a list of (timestamp before, timestamp after) tuples."""
+        return [
+            (row["start_timestamp"], row["end_timestamp"])
+            for row in self.conn.execute("SELECT start_timestamp, end_timestamp FROM gaps WHERE path = ? ORDER BY start_timestamp", (path,))
+        ]
+
+    def entries(self, coin=None, pair=None, timeframes=None):
+        """Returns the catalog entries matching the filters as a list of dicts."""
+        query, params = self._where("SELECT * FROM files", coin, pair, timeframes)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY coin, pair, timeframe", params)]
+
+    def csv_paths(self, coin=None, pair=None, timeframes=None):
+        """Returns the catalogued files in the nested {coin: {pair: {'timeframes': {tf: path}}}} form of get_csv_paths."""
+        csv_paths = {}
+        for entry in self.entries(coin, pair, timeframes):
+            pair_paths = csv_paths.setdefault(entry["coin"], {}).setdefault(entry["pair"], {'timeframes': {}})
+            pair_paths['timeframes'][entry["timeframe"]] = entry["path"]
+        return csv_paths
@@ -1,6 +1,6 @@
 import os
 
-def get_csv_paths(base_folder, coin:str=None, pair:str=None, timeframes:list=None):
+def get_csv_paths(base_folder, coin:str=None, pair:str=None, timeframes:list=None, use_catalog:bool=False):
     """
     Crawls the data folder and returns a nested dictionary of file paths grouped by coin, pair, and timeframe.
 
@@ -8,8 +8,24 @@ def get_csv_paths(base_folder, coin:str=None, pair:str=None, timeframes:list=Non
     :param coin: The coin to filter by (e.g., "XRP"). If None, includes all coins.
     :param pair: The specific pair to filter by (e.g., "XRPETH"). If None, includes all pairs.
     :param timeframes: List of timeframes to filter by (e.g., [1, 15, 1440]). If None, includes all timeframes.
+    :param use_catalog: Answer from the persistent DataCatalog instead of listing every directory.
+                        The catalog is only queried: it is refreshed once per pipeline run
+                        (run_coinpairs), and here only for a coin/pair missing files it asks for.
     :return: Nested dictionary of file paths grouped by coin, pair, and timeframe.
+    :raises FileNotFoundError: If coin and pair are given and none of their files are found.
     """
+    if use_catalog:
+        from backend.src.data.staging.catalog import DataCatalog
+
+        with DataCatalog(base_folder) as catalog:
+            csv_paths = catalog.csv_paths(coin, pair, timeframes)
+            if coin and pair and _missing_timeframes(csv_paths, coin, pair, timeframes):
+                # new pair or files not catalogued yet: index just this pair
+                catalog.refresh(coin, pair)
+                csv_paths = catalog.csv_paths(coin, pair, timeframes)
+        _check_found(csv_paths, base_folder, coin, pair, timeframes)
+        return csv_paths
+
     csv_paths = {}
 
     if timeframes is not None:
@@ -51,4 +67,18 @@ def get_csv_paths(base_folder, coin:str=None, pair:str=None, timeframes:list=Non
                             # Store the file path under the timeframes key
                             csv_paths[coin_folder][pair_folder]['timeframes'][int(timeframe)] = file_path
 
-    return csv_paths
\ No newline at end of file
+    _check_found(csv_paths, base_folder, coin, pair, timeframes)
+    return csv_paths
+
+def _missing_timeframes(csv_paths, coin, pair, timeframes):
+    """Whether the coin/pair has no files, or lacks one of the requested timeframes."""
+    found = csv_paths.get(coin, {}).get(pair, {}).get('timeframes', {})
+    if timeframes is None:
+        return not found
+    return any(int(t) not in found for t in timeframes)
+
+def _check_found(csv_paths, base_folder, coin, pair, timeframes):
+    """Raises a FileNotFoundError naming the coin/pair when a lookup for it found no files."""
+    if coin and pair and not csv_paths.get(coin, {}).get(pair, {}).get('timeframes'):
+        wanted = f" for timeframes {sorted(int(t) for t in timeframes)}" if timeframes is not None else ""
+        raise FileNotFoundError(f"No CSV files for {coin}/{pair}{wanted} in {base_folder}")
\ No newline at end of file
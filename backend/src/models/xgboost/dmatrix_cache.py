@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+import xgboost as xgb
+
+from backend.src.shared.config import model_config
+from backend.src.shared.utils.data_processing.feature_matrix import FeatureMatrix, model_inputs
+
+
+class FoldMatrixCache:
+    """
+    Quantized XGBoost matrices of a study's folds, built once and reused by every trial.
+
+    Quantizing a fold into histogram bins only depends on the fold's rows and max_bin, so the
+    matrices are cached under (fold, max_bin): a trial that draws a max_bin seen before only
+    pays for building trees. The validation and test matrices of a fold are quantized with the
+    training matrix as their reference (the same bin cuts), which is what the booster predicts
+    on. Multi-fidelity studies also train on the most recent rows of a fold only, which are
+    cached under their train_fraction. At most max_entries folds are kept, least recently used
+    first out.
+
+    Boosters continued across folds hold trees split on another fold's bin cuts, which a
+    QuantileDMatrix cannot evaluate exactly; with quantized=False the cache holds plain
+    DMatrix objects of the raw values instead (XGBoost then keeps the bins inside each matrix).
+    """
+
+    def __init__(self, folds, max_entries=None, quantized=True):
+        """
+        Args:
+            folds: Folds as returned by time_series_folds, e.g. over a FeatureMatrix
+            max_entries: Cached (fold, max_bin, train_fraction) entries. Defaults to model_config.dmatrix_cache_entries
+            quantized: QuantileDMatrix (True) or raw DMatrix (False) matrices
+        """
+        self.folds = folds
+        self.quantized = quantized
+        self.max_entries = max_entries or model_config.dmatrix_cache_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fold_idx, max_bin, train_fraction=1.0):
+        """
+        Args:
+            fold_idx: Index of the fold
+            max_bin: Histogram bins of the trial
+            train_fraction: Most recent fraction of the fold's training rows to train on
+
+        Returns:
+            Tuple[xgb.DMatrix, ...]: matrices of the fold's parts, (train, test) or (train, validate, test)
+        """
+        # raw matrices do not depend on max_bin
+        key = (fold_idx, max_bin if self.quantized else None, train_fraction)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        train_data, *other_parts = self.folds.fold(fold_idx, train_fraction)
+        feature_names = list(train_data.columns) if isinstance(train_data, FeatureMatrix) else None
+        if self.quantized:
+            dtrain = xgb.QuantileDMatrix(*model_inputs(train_data), max_bin=max_bin, feature_names=feature_names)
+            others = [xgb.QuantileDMatrix(*model_inputs(part), ref=dtrain, max_bin=max_bin, feature_names=feature_names)
+                      for part in other_parts]
+        else:
+            dtrain = xgb.DMatrix(*model_inputs(train_data), feature_names=feature_names)
+            others = [xgb.DMatrix(*model_inputs(part), feature_names=feature_names) for part in other_parts]
+
+        self.entries[key] = (dtrain, *others)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return self.entries[key]
@@ -0,0 +1,183 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+import xgboost as xgb
+
+from backend.src.shared.config import model_config
+from backend.src.shared.config.global_config import feature_sets_folder
+from backend.src.shared.utils.data_processing.feature_matrix import FeatureMatrix, build_feature_matrix
+from backend.src.shared.utils.data_processing.train_val_test_split import time_series_fold_ranges
+
+# Rows used to measure correlations (evenly spaced); plenty to tell a 0.95 correlation from a 0.9 one
+CORRELATION_SAMPLE_ROWS = 20_000
+
+
+@dataclass
+class FeatureSelection:
+    """
+    Feature columns kept by prune_features, with why every other column was dropped.
+
+    columns keeps the order of the matrix it was chosen from, so applying it (FeatureMatrix.select)
+    to the training data and to later inference rows gives the model the same inputs.
+    """
+    columns: List[str]
+    gains: Dict[str, float]
+    dropped: Dict[str, str] = field(default_factory=dict)
+    n_input_columns: int = 0
+
+    def apply(self, data:FeatureMatrix) -> FeatureMatrix:
+        """data reduced to the selected columns."""
+        return data.select(self.columns)
+
+    def to_dict(self):
+        return {"columns": self.columns, "gains": self.gains, "dropped": self.dropped,
+                "n_input_columns": self.n_input_columns}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+
+def feature_set_path(coin, pair):
+    """Where the feature selection of a coin pair is recorded."""
+    return os.path.join(feature_sets_folder, f"{coin}_{pair}.json")
+
+
+def save_feature_selection(selection:FeatureSelection, coin, pair):
+    os.makedirs(feature_sets_folder, exist_ok=True)
+    with open(feature_set_path(coin, pair), "w") as f:
+        json.dump(selection.to_dict(), f, indent=2)
+
+
+def load_feature_selection(coin, pair):
+    """The recorded FeatureSelection of a coin pair, or None if it was trained on every column."""
+    path = feature_set_path(coin, pair)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return FeatureSelection.from_dict(json.load(f))
+
+
+def feature_gains(data:FeatureMatrix, n_rounds=None, n_jobs=None):
+    """
+    Total gain of every feature in a quick XGBoost fit (shallow trees, coarse bins) on data.
+
+    Args:
+        data (FeatureMatrix): Rows to rank the features on.
+        n_rounds (int): Trees of the fit. Defaults to model_config.feature_ranking_rounds.
+        n_jobs (int): XGBoost threads. Defaults to every core.
+
+    Returns:
+        Dict[str, float]: Total gain per column (0 for columns no tree split on).
+    """
+    params = {
+        "objective": "reg:squarederror",
+        "tree_method": "hist",
+        "max_depth": 4,
+        "learning_rate": 0.3,
+        "max_bin": 64,
+        "seed": 42,
+        "nthread": n_jobs or os.cpu_count() or 1,
+    }
+    dtrain = xgb.QuantileDMatrix(data.features, data.targets, max_bin=params["max_bin"], feature_names=list(data.columns))
+    booster = xgb.train(params, dtrain, num_boost_round=n_rounds or model_config.feature_ranking_rounds)
+    scores = booster.get_score(importance_type="total_gain")
+    return {name: float(scores.get(name, 0.0)) for name in data.columns}
+
+
+def _standardized_sample(features, sample_rows):
+    """Evenly spaced rows of features as float64 columns with zero mean and unit norm (NaNs at the mean)."""
+    step = max(1, len(features) // sample_rows)
+    sample = np.array(features[::step], dtype=np.float64)
+    means = np.nanmean(np.where(np.isfinite(sample), sample, np.nan), axis=0)
+    means = np.nan_to_num(means)  # all-NaN columns
+    sample = np.where(np.isfinite(sample), sample, means)
+    sample -= sample.mean(axis=0)
+    norms = np.linalg.norm(sample, axis=0)
+    # constant columns correlate with nothing
+    return np.divide(sample, norms, out=np.zeros_like(sample), where=norms > 0)
+
+
+def ranking_rows(data:FeatureMatrix, n_folds=5) -> FeatureMatrix:
+    """
+    Rows of data before the first test fold of a study with n_folds folds. Features are ranked
+    on these only: gains and correlations fit on later rows would have seen the targets the
+    cross validation scores trials on, favouring features that merely fit those folds.
+    """
+    return data.rows(0, time_series_fold_ranges(len(data), n_folds)[0].test[0])
+
+
+def prune_features(data:FeatureMatrix, budget=None, correlation_threshold=None, gains=None):
+    """
+    Ranks the features of data and keeps a less redundant subset for the Optuna study.
+
+    Features are visited by descending gain (feature_gains). A feature is skipped when its
+    absolute correlation with an already kept one is above correlation_threshold (so each
+    cluster of near-duplicates, e.g. sma_14/ema_14/bb_mavg across timeframes, is represented by
+    its most useful member), and the visit stops once budget features are kept.
+
+    Args:
+        data (FeatureMatrix): Rows to rank the features on, e.g. ranking_rows of the training part.
+        budget (int): Most features to keep. Defaults to model_config.feature_budget (None: no cap).
+        correlation_threshold (float): Defaults to model_config.feature_correlation_threshold.
+        gains (dict): Precomputed feature_gains of data (optional).
+
+    Returns:
+        FeatureSelection: The kept columns (in data's column order) and the reasons for the others.
+    """
+    budget = budget if budget is not None else model_config.feature_budget
+    if correlation_threshold is None:
+        correlation_threshold = model_config.feature_correlation_threshold
+    gains = gains or feature_gains(data)
+
+    ranked = sorted(range(len(data.columns)), key=lambda i: -gains[data.columns[i]])
+    sample = _standardized_sample(data.features, CORRELATION_SAMPLE_ROWS)
+    kept, dropped = [], {}
+    for i in ranked:
+        name = data.columns[i]
+        if budget is not None and len(kept) >= budget:
+            dropped[name] = "over budget"
+            continue
+        if kept:
+            correlations = np.abs(sample[:, kept].T @ sample[:, i])
+            closest = int(np.argmax(correlations))
+            if correlations[closest] > correlation_threshold:
+                dropped[name] = f"correlated with {data.columns[kept[closest]]} ({correlations[closest]:.3f})"
+                continue
+        kept.append(i)
+
+    return FeatureSelection(
+        columns=[data.columns[i] for i in sorted(kept)],
+        gains=gains,
+        dropped=dropped,
+        n_input_columns=len(data.columns),
+    )
+
+
+def prune_coinpair_features(coin, pair, train_data, test_data, n_folds=5):
+    """
+    Pipeline stage between process_coinpair and the Optuna study: chooses the features of a coin
+    pair, records them (feature_set_path) and reduces both parts to them.
+
+    Features are ranked on the rows before the study's first test fold (ranking_rows).
+
+    Args:
+        n_folds (int): Folds of the study that follows (run_optuna_study_timeseries).
+
+    Returns:
+        Tuple[FeatureMatrix, FeatureMatrix, FeatureSelection]: (train_data, test_data, selection)
+    """
+    if not isinstance(train_data, FeatureMatrix):
+        train_data = build_feature_matrix(train_data)
+    if not isinstance(test_data, FeatureMatrix):
+        test_data = build_feature_matrix(test_data)
+
+    selection = prune_features(ranking_rows(train_data, n_folds))
+    save_feature_selection(selection, coin, pair)
+    print(f"{coin}/{pair}: kept {len(selection.columns)} of {selection.n_input_columns} features "
+          f"({sum(reason != 'over budget' for reason in selection.dropped.values())} correlated, "
+          f"{sum(reason == 'over budget' for reason in selection.dropped.values())} over budget)")
+    return selection.apply(train_data), selection.apply(test_data), selection
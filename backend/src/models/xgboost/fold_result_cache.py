@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from backend.src.shared.config.global_config import fold_results_path
+from backend.src.shared.utils.data_processing.feature_matrix import FeatureMatrix
+
+# Bump when the objective's fold evaluation (training or backtest) changes, so older results are not reused
+FOLD_RESULT_VERSION = 1
+
+# Trial parameters that do not change the trained booster
+_UNKEYED_PARAMS = ("nthread",)
+
+
+def _prefix_digests(data, stops):
+    """
+    Fingerprints of data's rows [0, stop) for every stop in stops, hashed in one pass: each
+    fold reads the rows before its test part ends, so its fingerprint covers exactly those.
+    Every array is hashed as one stream, so a fingerprint does not depend on the other stops.
+    """
+    if isinstance(data, FeatureMatrix):
+        header = json.dumps(list(data.columns))
+        arrays = (data.features, data.targets, data.timestamps)
+    else:
+        header = json.dumps([str(col) for col in data.columns])
+        arrays = None
+    digests = [hashlib.blake2b(digest_size=16) for _ in range(3 if arrays is not None else 1)]
+
+    fingerprints = {}
+    start = 0
+    for stop in sorted(set(stops)):
+        if arrays is not None:
+            for digest, array in zip(digests, arrays):
+                digest.update(np.ascontiguousarray(array[start:stop]).data)
+        else:
+            digests[0].update(pd.util.hash_pandas_object(data.iloc[start:stop], index=False).to_numpy().data)
+        start = stop
+        fingerprint = hashlib.blake2b(header.encode(), digest_size=16)
+        for digest in digests:
+            fingerprint.update(digest.digest())
+        fingerprints[stop] = fingerprint.hexdigest()
+    return fingerprints
+
+
+class FoldResultCache:
+    """
+    Backtest metrics of evaluated folds in an SQLite file, shared by studies and processes.
+
+    A fold's result is stored under a hash of everything it depends on: the trial's training
+    parameters, the fold's row ranges (and those of the earlier folds a warm-started booster
+    was continued through) and a fingerprint of the rows the fold reads. Re-proposed parameter
+    sets, re-runs on unchanged data and resumed studies therefore reuse every fold that was
+    completed before, while any change to the parameters or the rows misses.
+    """
+
+    def __init__(self, folds, path=None):
+        """
+        Args:
+            folds: The study's folds (TimeSeriesFolds of a FeatureMatrix or DataFrame)
+            path: SQLite file. Defaults to global_config.fold_results_path
+        """
+        self.folds = folds
+        self.path = path or fold_results_path
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # study worker processes write to the same file: wait for their locks instead of failing
+        self.connection = sqlite3.connect(self.path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fold_results (key TEXT PRIMARY KEY, metric REAL, created REAL NOT NULL)"
+        )
+        self.connection.commit()
+        self._fingerprints = None
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, fold_idx):
+        """Fingerprint of the rows fold fold_idx reads (computed for all folds on first use)."""
+        if self._fingerprints is None:
+            self._fingerprints = _prefix_digests(self.folds.data, [fold.test[1] for fold in self.folds.ranges])
+        return self._fingerprints[self.folds.ranges[fold_idx].test[1]]
+
+    def key(self, fold_idx, train_params, num_boost_round, warm_start_rounds=None, early_stopping_rounds=None,
+            train_fraction=1.0):
+        """
+        Args:
+            fold_idx: Index of the fold
+            train_params, num_boost_round: xgb.train arguments of the trial
+            warm_start_rounds: Trees added per later fold when boosting is continued across folds (None: refit)
+            early_stopping_rounds: Early stopping on the fold's validation part
+            train_fraction: Most recent fraction of the fold's training rows trained on
+
+        Returns:
+            str: Hash identifying the fold's result
+        """
+        # a continued booster depends on every earlier fold as well
+        ranges = self.folds.ranges[:fold_idx + 1] if warm_start_rounds is not None else [self.folds.ranges[fold_idx]]
+        description = {
+            "version": FOLD_RESULT_VERSION,
+            "xgboost": xgb.__version__,
+            "params": {k: v for k, v in train_params.items() if k not in _UNKEYED_PARAMS},
+            "num_boost_round": num_boost_round,
+            "warm_start_rounds": warm_start_rounds,
+            "early_stopping_rounds": early_stopping_rounds,
+            "train_fraction": train_fraction,
+            "folds": [list(fold) for fold in ranges],
+            "data": self.fingerprint(fold_idx),
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key):
+        """Stored metric of key, or None."""
+        row = self.connection.execute("SELECT metric FROM fold_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # SQLite stores NaN as NULL
+        return float("nan") if row[0] is None else row[0]
+
+    def put(self, key, metric):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO fold_results (key, metric, created) VALUES (?, ?, ?)",
+            (key, float(metric), time.time()),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
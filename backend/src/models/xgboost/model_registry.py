@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import xgboost as xgb
+
+from backend.src.shared.config import model_config
+from backend.src.shared.config.global_config import models_folder
+
+
+def timeframe_label(timeframe) -> str:
+    """Registry name of a timeframe: 60 and "60m" are both "60m"."""
+    label = str(timeframe)
+    return label if label.endswith("m") else f"{label}m"
+
+
+def _json_value(value):
+    """numpy scalars and arrays as plain JSON values."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+@dataclass
+class ModelRecord:
+    """One registered model: where its booster is and what it was trained with."""
+    coin: str
+    pair: str
+    timeframe: str
+    model_file: str
+    size_bytes: int
+    trained_at: float
+    feature_columns: List[str]
+    params: Dict[str, Any]
+    backtest_summary: Dict[str, Any]
+    backtest_metric: Optional[float]
+    data_fingerprint: Optional[str]
+
+    @property
+    def key(self):
+        return self.coin, self.pair, self.timeframe
+
+    @property
+    def name(self):
+        return f"xgboost_{self.coin}_{self.pair}_{self.timeframe}".lower()
+
+
+class ModelRegistry:
+    """
+    Trained boosters on local disk, one current model per (coin, pair, timeframe).
+
+    Boosters are saved in XGBoost's binary UBJSON format under folder; an SQLite index holds each
+    model's record (feature columns, best params, backtest summary, data fingerprint). A new model
+    is written to its own file before the index points at it, so readers never see a partial
+    booster, and training processes can register models concurrently.
+    """
+
+    def __init__(self, folder=None):
+        """
+        Args:
+            folder: Registry folder. Defaults to global_config.models_folder
+        """
+        self.folder = folder or models_folder
+        os.makedirs(self.folder, exist_ok=True)
+        self.index_path = os.path.join(self.folder, "index.sqlite")
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS models ("
+                "coin TEXT NOT NULL, pair TEXT NOT NULL, timeframe TEXT NOT NULL, record TEXT NOT NULL, "
+                "PRIMARY KEY (coin, pair, timeframe))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # a connection per call: the API and training workers may use the registry from any thread or process
+        connection = sqlite3.connect(self.index_path, timeout=60)
+        try:
+            with connection:  # commits, or rolls back on an exception
+                yield connection
+        finally:
+            connection.close()
+
+    def save(self, coin, pair, timeframe, booster:xgb.Booster, feature_columns, params, backtest_summary,
+             backtest_metric=None, data_fingerprint=None) -> ModelRecord:
+        """
+        Registers booster as the current model of (coin, pair, timeframe), replacing the previous one.
+
+        Returns:
+            ModelRecord: The saved model's record.
+        """
+        timeframe = timeframe_label(timeframe)
+        trained_at = time.time()
+        model_file = f"{coin}_{pair}_{timeframe}_{time.time_ns()}.ubj"
+        path = os.path.join(self.folder, model_file)
+        booster.save_model(path)
+
+        record = ModelRecord(
+            coin=coin,
+            pair=pair,
+            timeframe=timeframe,
+            model_file=model_file,
+            size_bytes=os.path.getsize(path),
+            trained_at=trained_at,
+            feature_columns=list(feature_columns),
+            params=dict(params),
+            backtest_summary=dict(backtest_summary or {}),
+            backtest_metric=None if backtest_metric is None else float(backtest_metric),
+            data_fingerprint=data_fingerprint,
+        )
+        with self._connect() as connection:
+            # read the model being replaced under the write lock, so a concurrent save cannot slip in between
+            connection.execute("BEGIN IMMEDIATE")
+            previous = connection.execute(
+                "SELECT record FROM models WHERE coin = ? AND pair = ? AND timeframe = ?",
+                (coin, pair, timeframe),
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO models (coin, pair, timeframe, record) VALUES (?, ?, ?, ?)",
+                (coin, pair, timeframe, json.dumps(asdict(record), default=_json_value)),
+            )
+        previous_file = json.loads(previous[0])["model_file"] if previous else None
+        if previous_file is not None and previous_file != model_file:
+            try:
+                os.remove(os.path.join(self.folder, previous_file))
+            except OSError:
+                pass  # already removed, or held open by another process on Windows: it is only left behind
+        return record
+
+    def record(self, coin, pair, timeframe) -> Optional[ModelRecord]:
+        """The current record of (coin, pair, timeframe), or None."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT record FROM models WHERE coin = ? AND pair = ? AND timeframe = ?",
+                (coin, pair, timeframe_label(timeframe)),
+            ).fetchone()
+        return ModelRecord(**json.loads(row[0])) if row else None
+
+    def records(self) -> List[ModelRecord]:
+        """Every registered model, by coin, pair and timeframe."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT record FROM models ORDER BY coin, pair, timeframe").fetchall()
+        return [ModelRecord(**json.loads(row[0])) for row in rows]
+
+    def load_booster(self, record:ModelRecord) -> xgb.Booster:
+        """The booster of record, set up to predict on the CPU with one thread per call."""
+        booster = xgb.Booster(model_file=os.path.join(self.folder, record.model_file))
+        booster.set_param({"device": "cpu", "nthread": 1})
+        return booster
+
+
+class ModelCache:
+    """
+    Boosters of a ModelRegistry loaded on first use and kept in memory for serving.
+
+    At most max_models boosters, or max_bytes of them (by their UBJSON size, which tracks the
+    trees' size in memory), are kept; the least recently used are evicted first. A loaded model
+    is served without touching the registry index for revalidate_seconds; after that its record
+    is read again, so a model registered again is reloaded on its first request after the interval.
+    Concurrent requests for a model that is not loaded share a single load of it.
+    """
+
+    def __init__(self, registry:ModelRegistry=None, max_models=None, max_bytes=None, revalidate_seconds=None):
+        self.registry = registry or ModelRegistry()
+        self.max_models = max_models or model_config.serving_cache_models
+        self.max_bytes = max_bytes or model_config.serving_cache_bytes
+        self.revalidate_seconds = model_config.serving_cache_revalidate_seconds if revalidate_seconds is None else revalidate_seconds
+        self.entries = OrderedDict()  # key -> (record, booster, monotonic time its record was last read)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._lookups = {}  # key -> Future of the registry lookup in progress for it
+
+    def get(self, coin, pair, timeframe):
+        """
+        Returns:
+            Tuple[ModelRecord, xgb.Booster]: The current model of (coin, pair, timeframe), or None if none is registered.
+        """
+        key = (coin, pair, timeframe_label(timeframe))
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] < self.revalidate_seconds:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry[0], entry[1]
+            lookup = self._lookups.get(key)
+            owner = lookup is None
+            if owner:
+                lookup = self._lookups[key] = Future()
+            else:
+                # another request is already reading this model: wait for its result
+                self.hits += 1
+        if not owner:
+            return lookup.result()
+
+        try:
+            result = self._lookup(key)
+        except BaseException as e:
+            lookup.set_exception(e)
+            raise
+        else:
+            lookup.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._lookups[key]
+
+    def _lookup(self, key):
+        """Reads the record of key from the registry and loads its booster unless the loaded one is still current."""
+        record = self.registry.record(*key)
+        read_at = time.monotonic()
+        with self._lock:
+            if record is None:
+                self._evict(key)
+                return None
+            entry = self.entries.get(key)
+            if entry is not None and entry[0].model_file == record.model_file:
+                # unchanged in the registry: serve the loaded booster for another interval
+                self.hits += 1
+                self.entries[key] = (record, entry[1], read_at)
+                self.entries.move_to_end(key)
+                return record, entry[1]
+            self.misses += 1
+
+        booster = self.registry.load_booster(record)
+        with self._lock:
+            self._evict(key)
+            self.entries[key] = (record, booster, read_at)
+            self.nbytes += record.size_bytes
+            while len(self.entries) > 1 and (len(self.entries) > self.max_models or self.nbytes > self.max_bytes):
+                self._evict(next(iter(self.entries)))
+        return record, booster
+
+    def _evict(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[0].size_bytes
+
+    def loaded(self, key) -> bool:
+        return key in self.entries
+
+    def stats(self):
+        return {
+            "loaded_models": len(self.entries),
+            "loaded_bytes": self.nbytes,
+            "max_models": self.max_models,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
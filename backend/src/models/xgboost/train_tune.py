@@ -1,12 +1,113 @@
+import os
+import tempfile
+import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import xgboost as xgb
 import matplotlib.pyplot as plt
 import optuna
+from backend.src.shared.config import model_config, pipeline_config
+from backend.src.shared.config.global_config import optuna_folder
 from backend.src.shared.utils.data_processing.train_val_test_split import time_series_folds
+from backend.src.shared.utils.data_processing.feature_matrix import (
+    FeatureMatrix, build_feature_matrix, model_inputs, save_feature_matrix, load_feature_matrix,
+)
 import numpy as np  # Added for use in calculating the mean metric
-from backend.src.trading.backtesting.backtest import backtest_model
+from backend.src.trading.backtesting.backtest import backtest_model, backtest_predictions
+from backend.src.models.xgboost.dmatrix_cache import FoldMatrixCache
+from backend.src.models.xgboost.fold_result_cache import FoldResultCache
 from matplotlib.backends.backend_pdf import PdfPages
 
-def objective_time_series(trial, data, n_folds=5):
+def _fit(model, train_data):
+    """Fits model on a split part; FeatureMatrix columns become the booster's feature names, as a DataFrame's would."""
+    features, targets = model_inputs(train_data)
+    model.fit(features, targets, verbose=False)
+    if isinstance(train_data, FeatureMatrix):
+        model.get_booster().feature_names = list(train_data.columns)
+    return model
+
+# XGBoost threads per concurrent trial when model_config.trial_threads is None: hist tree building
+# stops scaling well beyond a few threads on these matrix sizes, so cores go to more trials instead
+DEFAULT_THREADS_PER_TRIAL = 4
+
+def xgboost_resources(device=None, n_trials=None, workers=None, studies=None):
+    """
+    Device, concurrent trials and XGBoost threads per trial for tuning.
+
+    On "cuda" trials run one at a time in-process (they share the GPU). On "cpu" the study's share
+    of the cores (all of them divided by the studies running at once) is split into workers x
+    threads: model_config.trial_workers / trial_threads when set, otherwise about
+    DEFAULT_THREADS_PER_TRIAL threads each (the whole share in one worker on small machines).
+
+    Args:
+        device (str): "cuda" or "cpu". Defaults to model_config.training_device.
+        n_trials (int): Trials of the study, so no more workers are started than there are trials (optional).
+        workers (int): Concurrent trials on the CPU. Defaults to model_config.trial_workers.
+        studies (int): Studies tuned at the same time. Defaults to pipeline_config.training_workers,
+            the coin pairs the pipeline trains concurrently.
+
+    Returns:
+        Tuple[str, int, int]: (device, workers, threads per trial).
+    """
+    device = device or model_config.training_device
+    if device != "cpu":
+        return device, 1, 1
+    studies = studies or pipeline_config.training_workers
+    cores = max(1, (os.cpu_count() or 1) // studies)
+    threads = model_config.trial_threads
+    workers = workers or model_config.trial_workers
+    if workers is None:
+        workers = max(1, cores // (threads or DEFAULT_THREADS_PER_TRIAL))
+    if n_trials is not None:
+        workers = max(1, min(workers, n_trials))
+    if model_config.trial_threads is None:
+        # cores left idle by fewer workers (small machines, short studies) go to each trial's threads
+        threads = max(1, cores // workers)
+    return device, workers, threads
+
+def _train_params(params):
+    """
+    XGBRegressor parameters as xgb.train arguments: (params, num_boost_round). Boosters trained
+    this way on the same matrix are identical to XGBRegressor(**params).fit(...).
+    """
+    train_params = dict(params)
+    num_boost_round = train_params.pop("n_estimators")
+    train_params["seed"] = train_params.pop("random_state")
+    train_params["nthread"] = train_params.pop("n_jobs")
+    return train_params, num_boost_round
+
+def _study_folds(data, n_folds, warm_start=False, early_stopping_rounds=None, fidelity_schedule=None):
+    """
+    Folds of a study and the matrix cache its trials share. Early stopping needs each fold's
+    held-out tail (val_set=True); boosters continued across folds need raw matrices, and
+    multi-fidelity trials cache a (smaller) matrix per rung.
+    """
+    folds = time_series_folds(data, n_folds=n_folds, val_set=early_stopping_rounds is not None)
+    max_entries = model_config.dmatrix_cache_entries * len(fidelity_schedule or [None])
+    return folds, FoldMatrixCache(folds, max_entries=max_entries, quantized=not warm_start)
+
+def _fidelity_pruner():
+    """
+    Pruner of multi-fidelity studies (model_config.fidelity_pruner). Rung r reports step
+    fidelity_reduction_factor ** r, so every rung is one of the pruners' resource levels.
+
+    "hyperband" hedges over brackets that start pruning at later rungs (one of them runs its
+    trials at full fidelity); "successive_halving" is Hyperband's most aggressive bracket alone,
+    pruning from the first rung, which evaluates the most configurations per hour.
+    """
+    reduction_factor = model_config.fidelity_reduction_factor
+    if model_config.fidelity_pruner == "successive_halving":
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=1, reduction_factor=reduction_factor)
+    if model_config.fidelity_pruner == "hyperband":
+        return optuna.pruners.HyperbandPruner(
+            min_resource=1,
+            max_resource=reduction_factor ** (len(model_config.fidelity_schedule) - 1),
+            reduction_factor=reduction_factor,
+        )
+    raise ValueError(f"Unknown fidelity_pruner: {model_config.fidelity_pruner}")
+
+def objective_time_series(trial, data, n_folds=5, folds=None, matrix_cache=None, device="cuda", n_jobs=1,
+                          warm_start=False, early_stopping_rounds=None, fidelity_schedule=None, result_cache=None):
     """
     Objective function using time series folds.
     
@@ -19,19 +120,34 @@ def objective_time_series(trial, data, n_folds=5):
     
     Args:
         trial (optuna.trial.Trial): Optuna trial for suggesting hyperparameters.
-        data (dict): Data containing keys "features" and "targets" or structured appropriately.
+        data (FeatureMatrix | pd.DataFrame): Merged data of the coin pair; the folds of a FeatureMatrix are views.
         n_folds (int): Number of cross validation folds.
+        folds (TimeSeriesFolds): Folds of data computed once for the whole study (optional).
+        matrix_cache (FoldMatrixCache): Quantized matrices of those folds shared by the study's
+            trials (optional; without it every fold is quantized for this trial only).
+        device (str): XGBoost device, "cuda" or "cpu".
+        n_jobs (int): XGBoost threads of this trial.
+        warm_start (bool): Continue boosting from the previous fold's booster on the enlarged
+            window, adding model_config.warm_start_round_fraction of n_estimators trees per
+            fold, instead of refitting every fold from scratch.
+        early_stopping_rounds (int): Stop adding trees once the fold's validation tail has not
+            improved for this many rounds (needs folds with val_set=True; None trains every tree).
+        fidelity_schedule (list): (data_fraction, rounds_fraction) rungs of a multi-fidelity study
+            (see _multi_fidelity_metric). None evaluates every trial at full fidelity, fold by fold.
+        result_cache (FoldResultCache): Fold results stored by earlier trials and studies; stored
+            folds are not trained again (optional).
         
     Returns:
         float: The average performance metric across the time series folds.
     """
     print("Starting a new trial evaluation.")  # New print statement for trial start
 
-    folds = time_series_folds(data, n_folds=n_folds, val_set=False)
+    if folds is None:
+        folds, matrix_cache = _study_folds(data, n_folds, warm_start, early_stopping_rounds)
+    if matrix_cache is None:
+        matrix_cache = FoldMatrixCache(folds, max_entries=len(folds), quantized=not warm_start)
     fold_metrics = []  # collect metric for each fold
     
-    # Suggest early stopping rounds for the XGBoost fit, to be passed to model.fit()
-    
     # Expanded and optimized hyperparameter search based on XGBoost docs
     grow_policy = trial.suggest_categorical("grow_policy", ["depthwise", "lossguide"])
     params = {
@@ -39,9 +155,9 @@ def objective_time_series(trial, data, n_folds=5):
         "objective": "reg:squarederror",
         "tree_method": "hist",
         "random_state": 42,
-        "device": "cuda",  # GPU usage
+        "device": device,
         "eval_metric": "rmse",
-        "n_jobs": 1,   # Added: Ensures sequential execution using CPU resources to avoid contention with GPU
+        "n_jobs": n_jobs,   # 1 on the GPU to avoid contention; on the CPU the threads this trial was given
         "subsample": trial.suggest_float("subsample", 0.5, 1.0, step=0.1),
         "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0, step=0.1),
         "colsample_bylevel": trial.suggest_float("colsample_bylevel", 0.5, 1.0, step=0.1),
@@ -60,21 +176,20 @@ def objective_time_series(trial, data, n_folds=5):
     if grow_policy == "lossguide":
         params["max_leaves"] = trial.suggest_int("max_leaves", 16, 256)
     
+    train_params, num_boost_round = _train_params(params)
+    if fidelity_schedule:
+        return _multi_fidelity_metric(trial, train_params, num_boost_round, params["max_bin"], folds, matrix_cache,
+                                      fidelity_schedule, warm_start, early_stopping_rounds, result_cache)
+
     # Delay pruning until at least a minimum number of folds have been processed (to reduce noise)
     min_folds_before_prune = 2
-    for fold_idx, (train_data, test_data) in enumerate(folds):
-        model = xgb.XGBRegressor(**params)
-
-        model.fit(
-            train_data["features"],
-            train_data["targets"],
-            verbose=False
-        )
-
-        # Call the optimized backtest function which returns a summary and a performance metric
-        backtest_summary, backtest_metric = backtest_model(model, test_data)
-        print(f"\nfold {fold_idx} backtest metric: {backtest_metric}")
+    trees_built = 0
+    for fold_idx, backtest_metric, fold_trees in _fold_metrics(train_params, num_boost_round, params["max_bin"], folds,
+                                                               matrix_cache, warm_start, early_stopping_rounds,
+                                                               result_cache=result_cache):
         fold_metrics.append(backtest_metric)
+        trees_built += fold_trees
+        trial.set_user_attr("trees_built", trees_built)
 
         # Report intermediate results after each fold for early pruning
         intermediate_value = np.mean(fold_metrics)
@@ -82,26 +197,204 @@ def objective_time_series(trial, data, n_folds=5):
         if fold_idx >= min_folds_before_prune and trial.should_prune():
             raise optuna.exceptions.TrialPruned()
     
-    # Compute a weighted average where the weight for fold i is (i+1),
-    # thereby giving more recent (higher-index) folds more influence.
+    # Return the average performance metric across all folds.
+    return _weighted_fold_average(fold_metrics)
+
+def _weighted_fold_average(fold_metrics):
+    """
+    Compute a weighted average where the weight for fold i is (i+1),
+    thereby giving more recent (higher-index) folds more influence.
+    """
     weights = np.arange(1, len(fold_metrics) + 1)
-    weighted_avg_metric = np.sum(weights * np.array(fold_metrics)) / np.sum(weights)
-    
-    avg_metric = weighted_avg_metric
+    return np.sum(weights * np.array(fold_metrics)) / np.sum(weights)
 
-    # Return the average performance metric across all folds.
-    return avg_metric
+def _fold_metrics(train_params, num_boost_round, max_bin, folds, matrix_cache, warm_start, early_stopping_rounds,
+                  train_fraction=1.0, result_cache=None):
+    """
+    Trains on every fold in turn and yields (fold index, backtest metric, trees built) per fold.
 
-def run_optuna_study_timeseries(data, n_trials=2, n_folds=5, use_pruner=False):
+    Args:
+        train_params, num_boost_round: xgb.train arguments of the trial (see _train_params).
+        max_bin (int): Histogram bins of the trial (the matrix cache key).
+        folds, matrix_cache: The study's folds and their cached matrices.
+        warm_start, early_stopping_rounds: See objective_time_series.
+        train_fraction (float): Most recent fraction of each fold's training rows to train on.
+        result_cache (FoldResultCache): Stored fold results; folds found there are not trained
+            again (optional). Results of the folds that are trained are stored in it.
+    """
+    warm_start_rounds = max(1, int(num_boost_round * model_config.warm_start_round_fraction))
+    cached_metrics, keys = [None] * len(folds), [None] * len(folds)
+    if result_cache is not None:
+        keys = [result_cache.key(fold_idx, train_params, num_boost_round, warm_start_rounds if warm_start else None,
+                                 early_stopping_rounds, train_fraction) for fold_idx in range(len(folds))]
+        cached_metrics = [result_cache.get(key) for key in keys]
+    # a continued booster needs the earlier folds' trees: train every fold before the last one missing
+    missing = [fold_idx for fold_idx, metric in enumerate(cached_metrics) if metric is None]
+    train_until = missing[-1] if warm_start and missing else -1
+
+    booster = None
+    for fold_idx in range(len(folds)):
+        if cached_metrics[fold_idx] is not None and fold_idx >= train_until:
+            print(f"\nfold {fold_idx} backtest metric: {cached_metrics[fold_idx]} (stored result)")
+            yield fold_idx, cached_metrics[fold_idx], 0
+            continue
+
+        # Only the trees are built per trial; the fold's matrices come from the study cache
+        matrices = matrix_cache.get(fold_idx, max_bin, train_fraction)
+        dtrain, dtest = matrices[0], matrices[-1]
+        continued = booster if warm_start else None
+        evals = [(matrices[1], "validate")] if early_stopping_rounds is not None and len(matrices) == 3 else []
+        booster = xgb.train(
+            train_params, dtrain,
+            num_boost_round=warm_start_rounds if continued is not None else num_boost_round,
+            evals=evals,
+            early_stopping_rounds=early_stopping_rounds if evals else None,
+            xgb_model=continued,
+            verbose_eval=False,
+        )
+        fold_trees = booster.num_boosted_rounds() - (continued.num_boosted_rounds() if continued is not None else 0)
+        if evals:
+            # drop the trees after the best validation round (also the ones the next fold continues from)
+            booster = booster[:booster.best_iteration + 1]
+
+        if cached_metrics[fold_idx] is not None:
+            # trained only to continue from; its backtest is stored
+            backtest_metric = cached_metrics[fold_idx]
+        else:
+            # Call the optimized backtest function which returns a summary and a performance metric
+            backtest_summary, backtest_metric = backtest_predictions(booster.predict(dtest), model_inputs(folds[fold_idx][-1])[1])
+            if result_cache is not None:
+                result_cache.put(keys[fold_idx], backtest_metric)
+        print(f"\nfold {fold_idx} backtest metric: {backtest_metric} ({booster.num_boosted_rounds()} trees)")
+        yield fold_idx, backtest_metric, fold_trees
+
+def _multi_fidelity_metric(trial, train_params, num_boost_round, max_bin, folds, matrix_cache, fidelity_schedule,
+                           warm_start, early_stopping_rounds, result_cache=None):
+    """
+    Evaluates a trial rung by rung of fidelity_schedule. Rung r trains every fold on its most recent
+    data_fraction of rows with rounds_fraction of n_estimators and reports the weighted fold
+    average as step fidelity_reduction_factor ** r (the pruners' resource levels), so the study's
+    pruner only promotes the best configurations to the next (costlier) rung. The last rung's
+    value is the trial's value.
+    """
+    trees_built = 0
+    for rung, (data_fraction, rounds_fraction) in enumerate(fidelity_schedule):
+        print(f"\nrung {rung}: {data_fraction:.0%} of the training rows, {rounds_fraction:.0%} of the boosting rounds")
+        rung_metrics = []
+        rung_rounds = max(1, int(num_boost_round * rounds_fraction))
+        for fold_idx, backtest_metric, fold_trees in _fold_metrics(train_params, rung_rounds, max_bin, folds, matrix_cache,
+                                                                   warm_start, early_stopping_rounds, data_fraction,
+                                                                   result_cache):
+            rung_metrics.append(backtest_metric)
+            trees_built += fold_trees
+        trial.set_user_attr("trees_built", trees_built)
+        trial.set_user_attr("rungs_completed", rung + 1)
+
+        rung_value = _weighted_fold_average(rung_metrics)
+        trial.report(rung_value, model_config.fidelity_reduction_factor ** rung)
+        if rung < len(fidelity_schedule) - 1 and trial.should_prune():
+            raise optuna.exceptions.TrialPruned()
+    return rung_value
+
+def _journal_storage(path):
+    """Optuna journal file storage at path (JournalFileBackend, JournalFileStorage before Optuna 4)."""
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    return optuna.storages.JournalStorage(JournalFileBackend(path))
+
+def _study_worker(study_name, storage_path, matrix_folder, n_trials, timeout, n_folds, sampler, pruner, device, n_jobs,
+                  objective_options, cache_results):
+    """
+    Runs n_trials of a shared study in a worker process. The feature matrix is memory-mapped from
+    matrix_folder, so workers share it; folds and quantized matrices are built per worker.
+    """
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    data = load_feature_matrix(matrix_folder)
+    folds, matrix_cache = _study_folds(data, n_folds, **objective_options)
+    result_cache = FoldResultCache(folds) if cache_results else None
+    if sampler is not None:
+        # every worker unpickles the same sampler: a seeded one would propose the same parameters in each
+        sampler.reseed_rng()
+    study = optuna.load_study(study_name=study_name, storage=_journal_storage(storage_path), sampler=sampler, pruner=pruner)
+    try:
+        study.optimize(
+            lambda trial: objective_time_series(trial, data, n_folds=n_folds, folds=folds, matrix_cache=matrix_cache,
+                                                device=device, n_jobs=n_jobs, result_cache=result_cache, **objective_options),
+            n_trials=n_trials,
+            timeout=timeout
+        )
+    finally:
+        if result_cache is not None:
+            result_cache.close()
+
+def _run_parallel_study(data, n_trials, timeout, n_folds, sampler, pruner, device, workers, n_jobs, objective_options,
+                        cache_results):
+    """
+    Runs the study's trials in worker processes against a journal file under optuna_folder.
+    Trials report their fold metrics to the shared storage, so the pruner compares each trial
+    with those of every worker.
+    """
+    os.makedirs(optuna_folder, exist_ok=True)
+    study_name = f"xgboost-{uuid.uuid4().hex}"
+    storage_path = os.path.join(optuna_folder, f"{study_name}.log")
+    optuna.create_study(study_name=study_name, storage=_journal_storage(storage_path), direction="maximize")
+    if n_trials is None:
+        shares = [None] * workers  # every worker runs trials until the timeout
+    else:
+        shares = [n_trials // workers + (1 if i < n_trials % workers else 0) for i in range(workers)]
+    print(f"Running {n_trials} trials in {workers} worker processes with {n_jobs} threads each (storage: {storage_path}).")
+
+    with tempfile.TemporaryDirectory(dir=optuna_folder) as matrix_folder:
+        save_feature_matrix(data, matrix_folder)
+        # spawn: forked children would inherit XGBoost's OpenMP state from this process
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            jobs = [
+                pool.submit(_study_worker, study_name, storage_path, matrix_folder, share, timeout, n_folds, sampler,
+                            pruner, device, n_jobs, objective_options, cache_results)
+                for share in shares if share != 0
+            ]
+            for job in jobs:
+                job.result()
+
+    # the finished study is copied into memory so its journal does not pile up in optuna_folder
+    storage = optuna.storages.InMemoryStorage()
+    optuna.copy_study(from_study_name=study_name, from_storage=_journal_storage(storage_path), to_storage=storage)
+    for path in (storage_path, f"{storage_path}.lock"):
+        if os.path.exists(path):
+            os.remove(path)
+    return optuna.load_study(study_name=study_name, storage=storage)
+
+def run_optuna_study_timeseries(data, n_trials=2, n_folds=5, use_pruner=False, device=None, workers=None,
+                                warm_start=None, early_stopping_rounds=None, multi_fidelity=None, timeout=None,
+                                sampler=None, cache_results=None):
     """
     Runs an Optuna study that performs hyperparameter tuning with time series cross validation.
     
 
     Args:
-        data (dict): Data containing time series details (features/targets).
+        data (FeatureMatrix | pd.DataFrame): Merged data of the coin pair. A DataFrame is converted
+            to a FeatureMatrix once, so no trial copies the features again.
         n_trials (int): Number of hyperparameter trials.
         n_folds (int): Number of folds for TimeSeriesSplit.
         use_pruner (bool): Whether to use a bandit-based pruner (e.g., Successive Halving).
+        device (str): "cuda" or "cpu". Defaults to model_config.training_device.
+        workers (int): Trials run concurrently on the CPU. Defaults to xgboost_resources' choice;
+            with more than one, trials run in worker processes sharing a journal file storage.
+        warm_start (bool): Continue boosting across folds (see objective_time_series).
+            Defaults to model_config.warm_start_folds.
+        early_stopping_rounds (int): Per-fold early stopping on a held-out tail.
+            Defaults to model_config.fold_early_stopping_rounds.
+        multi_fidelity (bool): Evaluate trials rung by rung of model_config.fidelity_schedule
+            (recent-data subsamples and fewer boosting rounds first) under a HyperbandPruner,
+            instead of at full fidelity. Defaults to model_config.multi_fidelity.
+        timeout (float): Stop starting trials after this many seconds (optional). With a
+            timeout, n_trials may be None to run as many trials as fit.
+        sampler (optuna.samplers.BaseSampler): Sampler of the study (optional; Optuna's default TPE).
+        cache_results (bool): Reuse and store fold results in global_config.fold_results_path
+            (see FoldResultCache), so repeated evaluations and resumed studies skip finished folds.
+            Defaults to model_config.fold_result_cache.
     
     Returns:
         Tuple[optuna.study.Study, list]: The completed study including the best hyperparameter set
@@ -110,19 +403,45 @@ def run_optuna_study_timeseries(data, n_trials=2, n_folds=5, use_pruner=False):
     print()
     print(f"Starting Optuna study with {n_trials} trials and {n_folds} folds.")
     print()
-    if use_pruner:
+    if not isinstance(data, FeatureMatrix):
+        data = build_feature_matrix(data)
+    device, workers, n_jobs = xgboost_resources(device, n_trials, workers)
+    if warm_start is None:
+        warm_start = model_config.warm_start_folds
+    if early_stopping_rounds is None:
+        early_stopping_rounds = model_config.fold_early_stopping_rounds
+    if multi_fidelity is None:
+        multi_fidelity = model_config.multi_fidelity
+    if cache_results is None:
+        cache_results = model_config.fold_result_cache
+    objective_options = {"warm_start": warm_start, "early_stopping_rounds": early_stopping_rounds}
+    if multi_fidelity:
+        objective_options["fidelity_schedule"] = model_config.fidelity_schedule
+        pruner = _fidelity_pruner()
+    elif use_pruner:
+        pruner = optuna.pruners.SuccessiveHalvingPruner(min_resource=2, reduction_factor=2)
+    else:
+        pruner = None
 
-        study = optuna.create_study(
-            direction="maximize",
-            pruner=optuna.pruners.SuccessiveHalvingPruner(min_resource=2, reduction_factor=2)
-        )
+    if workers > 1:
+        study = _run_parallel_study(data, n_trials, timeout, n_folds, sampler, pruner, device, workers, n_jobs,
+                                    objective_options, cache_results)
     else:
-        study = optuna.create_study(direction="maximize")
-    
-    study.optimize(
-        lambda trial: objective_time_series(trial, data, n_folds=n_folds),   
-        n_trials=n_trials
-    )
+        # Fold row ranges are fixed for the study; each trial cuts views of them as it goes
+        folds, matrix_cache = _study_folds(data, n_folds, **objective_options)
+        result_cache = FoldResultCache(folds) if cache_results else None
+        study = optuna.create_study(direction="maximize", sampler=sampler, pruner=pruner)
+        try:
+            study.optimize(
+                lambda trial: objective_time_series(trial, data, n_folds=n_folds, folds=folds, matrix_cache=matrix_cache,
+                                                    device=device, n_jobs=n_jobs, result_cache=result_cache,
+                                                    **objective_options),
+                n_trials=n_trials,
+                timeout=timeout
+            )
+        finally:
+            if result_cache is not None:
+                result_cache.close()
     print()
     print(f"Optuna study completed. Best trial: {study.best_trial.number} with value: {study.best_trial.value:.4f}")
     print()
@@ -196,20 +515,29 @@ def save_hyperparameter_diagnostics_pdf(study, pdf_filename="hyperparameter_diag
             plt.close(fig)
     print(f"Diagnostic plots saved to {pdf_filename}")
 
-def train_and_test_XGBoost(train_data, test_data, extra_params=None):
+def train_and_test_XGBoost(train_data, test_data, extra_params=None, return_model=False):
     """
     Trains an XGBoost model on the full training data without a validation set.
     Uses the provided extra_params (e.g., best hyperparameters from Optuna)
     and overrides n_estimators with final_n_estimators if provided.
-    """
 
-    train_features = train_data.drop(columns=['timestamp', 'target'])
-    train_targets = train_data['target']
+    Args:
+        train_data (FeatureMatrix | pd.DataFrame): Training rows.
+        test_data (FeatureMatrix | pd.DataFrame): Out-of-sample rows.
+        return_model (bool): Also return the fitted XGBRegressor (e.g. to register it).
 
-    test_data_dict = {
-        'features': test_data.drop(columns=['timestamp', 'target']),
-        'targets': test_data['target']
-    }
+    Returns:
+        Tuple[dict, float]: The backtest summary and backtest metric on test_data
+                            (and the model as a third element with return_model).
+    """
+
+    if not isinstance(train_data, FeatureMatrix):
+        train_data = build_feature_matrix(train_data)
+    if not isinstance(test_data, FeatureMatrix):
+        test_data = build_feature_matrix(test_data)
+    # a single fit: on the CPU it gets every core
+    device = model_config.training_device
+    n_jobs = (os.cpu_count() or 1) if device == "cpu" else 1
 
     base_params = {
         "booster": "gbtree",
@@ -217,9 +545,9 @@ def train_and_test_XGBoost(train_data, test_data, extra_params=None):
         "tree_method": "hist",
         "random_state": 42,
 
-        "device": "cuda",
+        "device": device,
         "eval_metric": "rmse",
-        "n_jobs": 1,
+        "n_jobs": n_jobs,
         "subsample": None,
         "colsample_bytree": None,
         "colsample_bylevel": None,
@@ -243,15 +571,13 @@ def train_and_test_XGBoost(train_data, test_data, extra_params=None):
     # Remove keys with None values so that only defined parameters are passed to XGBRegressor.
     final_params = {k: v for k, v in base_params.items() if v is not None}
     print(f"\n\nFinal parameters:\n {final_params}")
-    model = xgb.XGBRegressor(**final_params)
+    model = _fit(xgb.XGBRegressor(**final_params), train_data)
 
-    model.fit(
-        train_features,
-        train_targets,
-        verbose=False
-    )
-
-    backtest_summary, backtest_metric = backtest_model(model, test_data_dict)
+    backtest_summary, backtest_metric = backtest_model(model, test_data)
 
     print(f"\n\nBacktest summary: {backtest_summary}")
     print(f"\n\nBacktest metric: {backtest_metric}")
+
+    if return_model:
+        return backtest_summary, backtest_metric, model
+    return backtest_summary, backtest_metric
@@ -1,21 +1,18 @@
-from backend.src.data.processing.process_coinpair import process_coinpair
 from backend.src.shared.config.data_processing_config import coin_pairs
-from backend.src.models.xgboost.train_tune import run_optuna_study_timeseries
-import pandas as pd
-if __name__ == "__main__":
-    all_results = []  # List to accumulate all folds' backtest summaries
-
-    for coin, pair in coin_pairs.items():
-        print(f"Processing coin: {coin}")
-        data = process_coinpair(coin, pair)
-        # remove the last 10% of data from pandas df to save for out of sample testing
-        test_data = data[-int(len(data) * 0.1):]
-        train_data = data[:-int(len(data) * 0.1)]
-        # XGBoost Model
-        study = run_optuna_study_timeseries(train_data)
+from backend.src.shared.config.pipeline_config import data_prep_workers, training_workers
+from backend.src.pipeline.workflows.coinpair_scheduler import run_coinpairs
 
-        from backend.src.models.xgboost.train_tune import train_and_test_XGBoost
-        
-        print(f"Finished tuning and now testing the model on out of sample data.")
-        train_and_test_XGBoost(train_data, test_data, extra_params=study.best_params)
+if __name__ == "__main__":
+    # One result per coin pair: best params + out-of-sample backtest, or the error that stopped it
+    all_results = run_coinpairs(
+        coin_pairs,
+        data_prep_workers=data_prep_workers,
+        training_workers=training_workers,
+    )
 
+    print()
+    for result in all_results:
+        if result["status"] == "ok":
+            print(f"{result['coin']}/{result['pair']}: backtest metric {result['backtest_metric']} ({result['elapsed_seconds']:.0f}s)")
+        else:
+            print(f"{result['coin']}/{result['pair']}: FAILED during {result['stage']}: {result['error']}")
@@ -0,0 +1,212 @@
+import os
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from backend.src.shared.config import pipeline_config
+
+
+def refresh_data_catalog(coin_pairs):
+    """
+    Brings the data catalog up to date for every coin pair of the run, once, so the file lookups
+    of process_coinpair are plain catalog queries (see get_csv_paths).
+    """
+    from backend.src.data.staging.catalog import DataCatalog
+    from backend.src.shared.config.data_processing_config import use_catalog
+    from backend.src.shared.config.global_config import data_folder
+
+    if not use_catalog:
+        return
+    with DataCatalog(data_folder) as catalog:
+        for coin, pair in coin_pairs.items():
+            try:
+                changed = catalog.refresh(coin, pair)
+            except Exception as e:
+                # the pair's data prep looks its files up again and records the failure in its result
+                print(f"Could not catalogue {coin}/{pair}: {e}")
+                continue
+            if changed:
+                print(f"Catalogued {len(changed)} new or changed files of {coin}/{pair}")
+
+
+def prepare_coinpair(coin, pair, test_fraction, timeframe_workers=None):
+    """
+    Builds the feature matrix of a coin pair and splits off the out-of-sample test tail.
+    timeframe_workers is passed to process_coinpair as its cpu_workers (the pair's share of the cores).
+
+    Returns:
+        Tuple[FeatureMatrix, FeatureMatrix]: (train_data, test_data)
+    """
+    from backend.src.data.processing.process_coinpair import process_coinpair
+    from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+
+    print(f"Processing coin: {coin}")
+    data = build_feature_matrix(process_coinpair(coin, pair, cpu_workers=timeframe_workers))
+    # remove the last test_fraction of data to save for out of sample testing
+    n_test = int(len(data) * test_fraction)
+    test_data = data.rows(len(data) - n_test)
+    train_data = data.rows(0, len(data) - n_test)
+    return train_data, test_data
+
+
+def train_coinpair(coin, pair, train_data, test_data, n_trials=None):
+    """
+    Tunes XGBoost on train_data with an Optuna study and backtests the best parameters on test_data.
+    With model_config.feature_pruning, redundant features are dropped before the study and the
+    kept columns are recorded for inference. The final model is saved in the model registry.
+
+    Returns:
+        dict: Best parameters, best study value, the feature columns, the out-of-sample backtest
+              results and the registered model's file.
+    """
+    from backend.src.models.xgboost.feature_pruning import prune_coinpair_features
+    from backend.src.models.xgboost.model_registry import ModelRegistry
+    from backend.src.models.xgboost.train_tune import run_optuna_study_timeseries, train_and_test_XGBoost
+    from backend.src.shared.config import model_config
+    from backend.src.shared.config.data_processing_config import target_timeframe
+    from backend.src.shared.utils.data_processing.feature_matrix import feature_matrix_fingerprint
+
+    if model_config.feature_pruning:
+        train_data, test_data, _ = prune_coinpair_features(coin, pair, train_data, test_data)
+
+    study_kwargs = {"n_trials": n_trials} if n_trials is not None else {}
+    study = run_optuna_study_timeseries(train_data, **study_kwargs)
+
+    print(f"Finished tuning {coin}/{pair} and now testing the model on out of sample data.")
+    backtest_summary, backtest_metric, model = train_and_test_XGBoost(
+        train_data, test_data, extra_params=study.best_params, return_model=True
+    )
+    record = ModelRegistry().save(
+        coin, pair, target_timeframe,
+        booster=model.get_booster(),
+        feature_columns=train_data.columns,
+        params={name: value for name, value in model.get_params().items() if value is not None},
+        backtest_summary=backtest_summary,
+        backtest_metric=backtest_metric,
+        data_fingerprint=feature_matrix_fingerprint(train_data),
+    )
+
+    return {
+        "best_params": study.best_params,
+        "best_value": study.best_value,
+        "feature_columns": list(train_data.columns),
+        "backtest_summary": backtest_summary,
+        "backtest_metric": backtest_metric,
+        "model_file": record.model_file,
+    }
+
+
+class _Stage:
+    """
+    Runs the jobs of one pipeline stage, at most max_workers at a time.
+
+    Every job gets its own worker process, so a worker that dies (e.g. killed for running out
+    of memory) only fails its own coin pair instead of breaking a shared pool.
+    """
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self.queue = deque()
+        self.running = {}
+
+    def submit(self, key, func, *args):
+        self.queue.append((key, func, args))
+        self._fill()
+
+    def _fill(self):
+        while self.queue and len(self.running) < self.max_workers:
+            key, func, args = self.queue.popleft()
+            pool = ProcessPoolExecutor(max_workers=1)
+            self.running[pool.submit(func, *args)] = (key, pool)
+
+    def pop(self, future):
+        key, pool = self.running.pop(future)
+        pool.shutdown(wait=False)
+        self._fill()
+        return key
+
+    def shutdown(self):
+        self.queue.clear()
+        for _, pool in self.running.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        self.running.clear()
+
+
+def _failure(coin, pair, stage, error):
+    print(f"{coin}/{pair} failed during {stage}: {error!r}")
+    return {
+        "coin": coin,
+        "pair": pair,
+        "status": "failed",
+        "stage": stage,
+        "error": repr(error),
+        "traceback": "".join(traceback.format_exception(error)),
+    }
+
+
+def run_coinpairs(coin_pairs, data_prep_workers=None, training_workers=None, n_trials=None, test_fraction=None):
+    """
+    Runs data prep, tuning and out-of-sample testing for many coin pairs across process pools.
+
+    Data prep and training use separate pools so a pair starts training as soon as its data is
+    ready while other pairs are still being prepared. An exception in one pair, or its worker
+    process dying outright, is recorded in that pair's result and the rest of the batch carries on.
+
+    Args:
+        coin_pairs (dict): Mapping of coin -> pair, as in data_processing_config.coin_pairs.
+        data_prep_workers (int): Processes for process_coinpair. Defaults to pipeline_config.
+        training_workers (int): Processes for tuning/training. Defaults to pipeline_config.
+        n_trials (int): Optuna trials per pair. Defaults to run_optuna_study_timeseries' default.
+        test_fraction (float): Out-of-sample tail per pair. Defaults to pipeline_config.
+
+    Returns:
+        list: One result dict per coin pair, in coin_pairs order, with a "status" of "ok" or "failed".
+    """
+    data_prep_workers = data_prep_workers or pipeline_config.data_prep_workers
+    training_workers = training_workers or pipeline_config.training_workers
+    test_fraction = test_fraction if test_fraction is not None else pipeline_config.test_fraction
+
+    refresh_data_catalog(coin_pairs)
+
+    results = {}
+    started = {}
+    prep_stage = _Stage("data_prep", data_prep_workers)
+    # each prep worker computes its pair's timeframes in its own process pool: split the cores between them
+    timeframe_workers = max(1, (os.cpu_count() or 1) // min(data_prep_workers, len(coin_pairs) or 1))
+    train_stage = _Stage("training", training_workers)
+
+    try:
+        for coin, pair in coin_pairs.items():
+            started[(coin, pair)] = time.perf_counter()
+            prep_stage.submit((coin, pair), prepare_coinpair, coin, pair, test_fraction, timeframe_workers)
+
+        while prep_stage.running or train_stage.running:
+            done, _ = wait([*prep_stage.running, *train_stage.running], return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = prep_stage if future in prep_stage.running else train_stage
+                coin, pair = stage.pop(future)
+                try:
+                    output = future.result()
+                except Exception as e:
+                    results[(coin, pair)] = _failure(coin, pair, stage.name, e)
+                    continue
+
+                if stage is prep_stage:
+                    train_data, test_data = output
+                    train_stage.submit((coin, pair), train_coinpair, coin, pair, train_data, test_data, n_trials)
+                else:
+                    results[(coin, pair)] = {
+                        "coin": coin,
+                        "pair": pair,
+                        "status": "ok",
+                        "elapsed_seconds": time.perf_counter() - started[(coin, pair)],
+                        **output,
+                    }
+                    print(f"{coin}/{pair} finished with backtest metric {output['backtest_metric']}")
+    finally:
+        prep_stage.shutdown()
+        train_stage.shutdown()
+
+    return [results[(coin, pair)] for coin, pair in coin_pairs.items()]
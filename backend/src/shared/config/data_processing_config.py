@@ -1,3 +1,5 @@
+import os
+
 coin_pairs = {
     # "X": "XRPUSD",
     "ETH": "ETHUSD",
@@ -7,6 +9,35 @@ coin_pairs = {
 timeframes = [5, 15, 30, 60, 240]
 target_timeframe = 60
 
+# Streaming ingestion (ingest_csv_chunks): rows per chunk and a ceiling on the raw column bytes held per chunk
+stream_chunk_rows = 500_000
+stream_max_memory_bytes = 256 * 1024 ** 2
+
+# process_coinpair: look files up in the persistent data catalog (data/staging/catalog.py) instead of crawling
+use_catalog = True
+
+# process_coinpair: run the per-timeframe stages concurrently (store refresh on threads, indicators in processes)
+# timeframe_cpu_workers is per coin pair; the pipeline scheduler passes each prep worker its share of the cores instead
+parallel_timeframes = True
+timeframe_io_workers = 8
+timeframe_cpu_workers = min(len(timeframes), os.cpu_count() or 1)
+
+# process_coinpair: build every timeframe from the base_timeframe CSV (data/processing/resample.py)
+# instead of reading one pre-exported CSV per timeframe
+resample_timeframes = False
+base_timeframe = 1
+
+# process_timeframe: store feature columns as float32 after computing them in float64 (timestamp and target keep their dtypes)
+compact_features = False
+
+# process_universe: the panel kernels advance the indicators of up to panel_batch_assets coin pairs together
+# (see IndicatorPlan.run_segments), with at most panel_max_memory_bytes of stacked scratch arrays per batch
+panel_batch_assets = 16
+panel_max_memory_bytes = 256 * 1024 ** 2
+
+# IndicatorPipeline: "numba" (in-house kernels) or "ta" (ta library wrappers), see indicator_registry.py
+indicator_backend = "numba"
+
 indicator_configs = {
     1:  [
             {"name": "ema", "override_params": {"window": 14}},
@@ -7,4 +7,19 @@ base_folder = os.path.join(base_drive, "TRADER_1_DATA")
 
 source_of_truth_data_folder = os.path.join(base_folder, "source_of_truth_data")
 
-data_folder = os.path.join(base_folder, "data")
\ No newline at end of file
+data_folder = os.path.join(base_folder, "data")
+
+# Binary OHLCV store built from the CSVs in data_folder (see data/ingestion/ohlcv_store.py)
+store_folder = os.path.join(base_folder, "store")
+
+# SQLite catalog of the CSVs in data_folder (see data/staging/catalog.py)
+catalog_path = os.path.join(store_folder, "catalog.sqlite")
+
+# Optuna journal storage of the studies run by parallel CPU tuning (see models/xgboost/train_tune.py)
+optuna_folder = os.path.join(base_folder, "optuna")
+# Fold-level results of Optuna trials, reused across studies (see models/xgboost/fold_result_cache.py)
+fold_results_path = os.path.join(optuna_folder, "fold_results.sqlite")
+# Feature columns chosen per coin pair by feature pruning (see models/xgboost/feature_pruning.py)
+feature_sets_folder = os.path.join(base_folder, "feature_sets")
+# Trained models per (coin, pair, timeframe) and their SQLite index (see models/xgboost/model_registry.py)
+models_folder = os.path.join(base_folder, "models")
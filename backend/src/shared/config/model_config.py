@@ -1,3 +1,53 @@
+# Optuna studies (models/xgboost/train_tune.py): quantized fold matrices kept per study, keyed by
+# (fold, max_bin). Each entry holds one fold's training and test matrices (~1-2 bytes per value).
+dmatrix_cache_entries = 20
+
+# XGBoost device for tuning and training: "cuda" or "cpu"
+training_device = "cuda"
+# "cpu" only: Optuna trials running concurrently in worker processes and XGBoost threads per trial.
+# None picks them from the core count shared with the other studies of pipeline_config.training_workers
+# (see train_tune.xgboost_resources).
+trial_workers = None
+trial_threads = None
+
+# Optuna trials: continue boosting each expanding fold from the previous fold's booster instead of
+# refitting, adding warm_start_round_fraction * n_estimators trees per later fold
+warm_start_folds = False
+warm_start_round_fraction = 0.25
+# Optuna trials: stop adding trees once the fold's held-out tail (time_series_folds(val_set=True))
+# has not improved for this many rounds. None trains every tree.
+fold_early_stopping_rounds = None
+
+# Multi-fidelity Optuna studies: rungs of (fraction of the most recent training rows of each fold,
+# fraction of n_estimators), cheapest first and ending at full fidelity. The pruner ("hyperband" or
+# "successive_halving") promotes roughly the best 1 / fidelity_reduction_factor of the trials from
+# one rung to the next.
+multi_fidelity = False
+fidelity_schedule = [(0.125, 0.125), (0.25, 0.25), (0.5, 0.5), (1.0, 1.0)]
+fidelity_reduction_factor = 3
+fidelity_pruner = "hyperband"
+
+# Optuna studies: store each fold's backtest metric on disk (global_config.fold_results_path), keyed by
+# the trial's parameters, the fold's rows and their contents, and reuse it when a trial repeats a fold.
+# Off by default; run_optuna_study_timeseries(cache_results=True) turns it on for one study
+fold_result_cache = False
+
+# Feature pruning before the Optuna study: rank features by the gain of a quick XGBoost fit
+# (feature_ranking_rounds trees), skip any feature correlated above feature_correlation_threshold
+# with a higher-ranked one and keep at most feature_budget (None: no cap). Off by default: models
+# train on every merged column
+feature_pruning = False
+feature_budget = 64
+feature_correlation_threshold = 0.95
+feature_ranking_rounds = 50
+
+# API: boosters kept loaded from the model registry, least recently used evicted first once either
+# bound is exceeded (sizes are the boosters' UBJSON sizes)
+serving_cache_models = 32
+serving_cache_bytes = 512 * 1024 ** 2
+# API: seconds a loaded booster is served before its registry record is read again (to pick up a retrained model)
+serving_cache_revalidate_seconds = 30
+
 
 # param_grid = {
 #     'n_estimators': 1500,
@@ -0,0 +1,9 @@
+import os
+
+# Worker processes used by pipeline/main.py to run coin pairs in parallel.
+# Data prep (ingest + indicators + merge) is light and mostly I/O; training runs a full Optuna study.
+data_prep_workers = min(4, os.cpu_count() or 1)
+training_workers = max(1, (os.cpu_count() or 1) // 8)
+
+# Fraction of each pair's history held out for the final out-of-sample test
+test_fraction = 0.1
@@ -0,0 +1,33 @@
+import pandas as pd
+
+
+def map_chunks_with_warmup(chunks, warmup_rows, func, timestamp_col="timestamp"):
+    """
+    Applies a whole-frame transformation to a stream of chunks as if it ran on the concatenated data.
+
+    The last warmup_rows raw rows of each chunk are prepended to the next one before func is
+    applied, and only output rows newer than anything already emitted are yielded. As long as
+    warmup_rows covers the look-back of func, the concatenated output equals func(full data)
+    (up to the rounding drift rolling sums and variances accumulate over a long series).
+
+    :param chunks: Iterable of DataFrames in chronological order.
+    :param warmup_rows: Number of trailing raw rows to carry into the next chunk.
+    :param func: Callable taking a DataFrame and returning a DataFrame with a timestamp column.
+                 It may mutate its input.
+    :param timestamp_col: Column used to tell carried rows from new ones.
+    :return: Generator of transformed chunks.
+    """
+    carry = None
+    last_timestamp = None
+
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        carry = chunk.iloc[-warmup_rows:].copy() if warmup_rows > 0 else None
+
+        result = func(chunk)
+        if last_timestamp is not None:
+            result = result[result[timestamp_col] > last_timestamp]
+        if len(result) > 0:
+            last_timestamp = result[timestamp_col].iloc[-1]
+            yield result
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+# Columns never downcast: timestamps stay int64 and the target keeps full price precision for the backtest
+COMPACT_EXCLUDED_COLUMNS = ("timestamp", "target")
+
+
+def compact_features(data:pd.DataFrame, dtype=np.float32, exclude=COMPACT_EXCLUDED_COLUMNS):
+    """
+    Downcasts the float64 feature columns of a processed frame to float32 (in place).
+
+    Indicators are computed in float64 beforehand, so only the stored result is rounded; XGBoost
+    converts its inputs to float32 anyway. Integer columns and the excluded columns are left alone.
+
+    :param data: Processed DataFrame.
+    :param dtype: Storage dtype of the feature columns.
+    :param exclude: Columns kept as they are.
+    :return: The same DataFrame with its float64 feature columns downcast.
+    """
+    columns = [col for col in data.columns if col not in exclude and data[col].dtype == np.float64]
+    if columns:
+        data[columns] = data[columns].astype(dtype)
+    return data
+
+
+def frame_memory_bytes(data:pd.DataFrame):
+    """Total memory held by a DataFrame's columns and index, in bytes."""
+    return int(data.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Columns of a merged frame that are not model features
+NON_FEATURE_COLUMNS = ("timestamp", "target")
+
+
+@dataclass
+class FeatureMatrix:
+    """
+    Model inputs of one coin pair, converted from the merged DataFrame once.
+
+    features is a C-contiguous (rows x features) block, so row ranges (rows(), the folds of
+    time_series_folds) are views that XGBoost can read without another conversion. targets and
+    timestamps are the matching 1-D vectors and columns names the feature columns in order.
+    """
+    features: np.ndarray    # (N, F) float32, C-contiguous
+    targets: np.ndarray     # (N,) float64
+    timestamps: np.ndarray  # (N,) int64
+    columns: List[str]
+
+    def __len__(self):
+        return self.features.shape[0]
+
+    @property
+    def column_index(self) -> Dict[str, int]:
+        """Position of every feature column in features."""
+        return {name: i for i, name in enumerate(self.columns)}
+
+    def column(self, name) -> np.ndarray:
+        """One feature column (a strided view)."""
+        return self.features[:, self.column_index[name]]
+
+    def rows(self, start=None, stop=None) -> "FeatureMatrix":
+        """Rows [start, stop) as a FeatureMatrix of views into this one."""
+        window = slice(start, stop)
+        return FeatureMatrix(self.features[window], self.targets[window], self.timestamps[window], self.columns)
+
+    def select(self, columns) -> "FeatureMatrix":
+        """A FeatureMatrix of only the given feature columns, in that order (a C-contiguous copy)."""
+        index = self.column_index
+        features = np.ascontiguousarray(self.features[:, [index[name] for name in columns]])
+        return FeatureMatrix(features, self.targets, self.timestamps, list(columns))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The rows as a merged-style DataFrame (timestamp, features, target)."""
+        frame = pd.DataFrame(self.features, columns=self.columns)
+        frame.insert(0, "timestamp", self.timestamps)
+        frame["target"] = self.targets
+        return frame
+
+
+def build_feature_matrix(data:pd.DataFrame, dtype=np.float32) -> FeatureMatrix:
+    """
+    Converts a merged frame (process_coinpair's output) into a FeatureMatrix.
+
+    Every column except timestamp and target becomes a feature, in frame order, so models see
+    the same columns as when they are fit on data.drop(columns=['timestamp', 'target']). The
+    features are copied once into the dtype block; XGBoost works in float32 internally, so the
+    default loses nothing the model would use.
+
+    :param data: Merged DataFrame with timestamp and target columns.
+    :param dtype: dtype of the feature block.
+    :return: FeatureMatrix over all rows of data.
+    """
+    columns = [col for col in data.columns if col not in NON_FEATURE_COLUMNS]
+    # a single-dtype frame hands out its block as a (column-major) view, so this is the only copy
+    features = np.asarray(data[columns].to_numpy(), dtype=dtype, order="C")
+    return FeatureMatrix(
+        features=features,
+        targets=data["target"].to_numpy(dtype=np.float64),
+        timestamps=data["timestamp"].to_numpy(dtype=np.int64),
+        columns=columns,
+    )
+
+
+def model_inputs(part):
+    """
+    (features, targets) of a split part: a FeatureMatrix, or a {'features': ..., 'targets': ...}
+    dict as returned by the split functions for DataFrames.
+    """
+    if isinstance(part, FeatureMatrix):
+        return part.features, part.targets
+    return part["features"], part["targets"]
+
+
+def feature_matrix_fingerprint(matrix:FeatureMatrix) -> str:
+    """Hash of a FeatureMatrix's columns and values, to tell which data a model was trained on."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(list(matrix.columns)).encode())
+    for array in (matrix.features, matrix.targets, matrix.timestamps):
+        digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+def save_feature_matrix(matrix:FeatureMatrix, folder:str):
+    """Writes a FeatureMatrix as .npy arrays (plus its column names) into folder."""
+    os.makedirs(folder, exist_ok=True)
+    for name in ("features", "targets", "timestamps"):
+        np.save(os.path.join(folder, f"{name}.npy"), getattr(matrix, name))
+    with open(os.path.join(folder, "columns.json"), "w") as f:
+        json.dump(list(matrix.columns), f)
+
+
+def load_feature_matrix(folder:str, mmap_mode:str="r") -> FeatureMatrix:
+    """
+    Opens a FeatureMatrix written by save_feature_matrix.
+
+    :param mmap_mode: np.load mmap_mode. Memory-mapped (the default), processes that open the same
+                      folder share one copy of the arrays through the page cache.
+    """
+    arrays = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode=mmap_mode) for name in ("features", "targets", "timestamps")}
+    with open(os.path.join(folder, "columns.json")) as f:
+        columns = json.load(f)
+    return FeatureMatrix(columns=columns, **arrays)
@@ -0,0 +1,394 @@
+import numpy as np
+from numba import njit
+
+################################################################################
+# Numba kernels behind the "numba" indicator backend. Each kernel reads
+# contiguous float64 arrays and writes into caller-provided output arrays of
+# the same length (which may be views, e.g. out[1:] to produce the shifted
+# historical column without a separate .shift(1) copy). The recurrences follow
+# the pandas/ta implementations they replace so the results agree with the
+# "ta" backend to rounding.
+################################################################################
+
+@njit(cache=True)
+def ewm_kernel(values, alpha, min_periods, out):
+    """pandas ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean() for finite input."""
+    n = values.shape[0]
+    if n == 0:
+        return
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    for i in range(n):
+        cur = values[i]
+        if i > 0 and weighted != cur:
+            # Same normalisation as pandas (old_wt + new_wt is not exactly 1.0 in floating point)
+            weighted = (old_wt_factor * weighted + alpha * cur) / (old_wt_factor + alpha)
+        out[i] = weighted if i + 1 >= min_periods else np.nan
+
+
+@njit(cache=True)
+def ema_kernel(values, window, out):
+    """EMA with span=window, as ta.trend.EMAIndicator."""
+    ewm_kernel(values, 2.0 / (window + 1.0), window, out)
+
+
+@njit(cache=True)
+def sma_kernel(values, window, out):
+    """
+    Rolling mean over window rows, as ta.trend.SMAIndicator.
+
+    A running window sum (the difference of two cumulative sums) with Kahan compensation, so
+    the result does not drift over long series.
+    """
+    n = values.shape[0]
+    total = 0.0
+    comp = 0.0
+    for i in range(n):
+        y = values[i] - comp
+        t = total + y
+        comp = (t - total) - y
+        total = t
+        if i >= window:
+            y = -values[i - window] - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+        out[i] = total / window if i + 1 >= window else np.nan
+
+
+@njit(cache=True)
+def rolling_std_kernel(values, window, out):
+    """Rolling population (ddof=0) standard deviation, maintained with Welford's add/remove updates."""
+    n = values.shape[0]
+    mean = 0.0
+    ssqdm = 0.0
+    for i in range(n):
+        nobs = min(i, window)
+        if i >= window:
+            # remove the value leaving the window
+            x = values[i - window]
+            new_mean = mean - (x - mean) / (nobs - 1) if nobs > 1 else 0.0
+            ssqdm -= (x - mean) * (x - new_mean)
+            mean = new_mean
+            nobs -= 1
+        x = values[i]
+        new_mean = mean + (x - mean) / (nobs + 1)
+        ssqdm += (x - mean) * (x - new_mean)
+        mean = new_mean
+        out[i] = np.sqrt(max(ssqdm, 0.0) / window) if i + 1 >= window else np.nan
+
+
+@njit(cache=True)
+def rsi_from_averages(avg_gain, avg_loss, out):
+    """RSI from smoothed gains and losses (100 where the average loss is 0)."""
+    for i in range(out.shape[0]):
+        if avg_loss[i] == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain[i] / avg_loss[i])
+
+
+@njit(cache=True)
+def true_range_kernel(high, low, close, out):
+    """True range; the first row (without a previous close) is high - low."""
+    for i in range(close.shape[0]):
+        tr = high[i] - low[i]
+        if i > 0:
+            tr = max(tr, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        out[i] = tr
+
+
+@njit(cache=True)
+def wilder_mean_kernel(values, window, out):
+    """
+    Wilder smoothing seeded by the mean of the first window values, with leading zeros
+    (the ATR recursion of ta.volatility.AverageTrueRange).
+    """
+    n = values.shape[0]
+    out[:] = 0.0
+    if n < window:
+        return
+    out[window - 1] = values[:window].mean()
+    for i in range(window, n):
+        out[i] = (out[i - 1] * (window - 1) + values[i]) / window
+
+
+################################################################################
+# Sweep kernels for indicator_sweep.py: one indicator kind for many windows in
+# a single pass over the series. out is (rows x windows); column j holds the
+# indicator with window windows[j]. The per-row work is O(len(windows)) and the
+# input is read once, however many windows are swept.
+################################################################################
+
+@njit(cache=True)
+def _compensated_prefix_sums(values, ref, hi, lo):
+    """
+    Prefix sums of values - ref in double-double arithmetic: the prefix sum of the first i
+    values is hi[i] + lo[i] (hi[0] = lo[0] = 0) to about twice float64 precision. Differences
+    of these two arrays give window sums without the cancellation error of a plain cumulative
+    sum, however long the series.
+    """
+    total = 0.0
+    err = 0.0
+    hi[0] = 0.0
+    lo[0] = 0.0
+    for i in range(values.shape[0]):
+        x = values[i] - ref
+        # two-sum of total and x, then renormalise (total, err)
+        t = total + x
+        z = t - total
+        err += (total - (t - z)) + (x - z)
+        total = t + err
+        err = err - (total - t)
+        hi[i + 1] = total
+        lo[i + 1] = err
+
+
+# Rows per block of sweep_sma_kernel
+SWEEP_BLOCK_ROWS = 4096
+
+
+@njit(cache=True)
+def sweep_sma_kernel(values, windows, out):
+    """
+    Rolling means (as sma_kernel) for every window, from window differences of prefix sums.
+
+    The series is swept in blocks of SWEEP_BLOCK_ROWS output rows. Each block recomputes its
+    prefix sums from max(windows) rows earlier, centred on the block's first value, so the sums
+    stay of the order of the local price moves.
+    """
+    n = values.shape[0]
+    max_window = windows.max()
+    size = SWEEP_BLOCK_ROWS + max_window + 1
+    hi = np.empty(size)
+    lo = np.empty(size)
+    for block_start in range(0, n, SWEEP_BLOCK_ROWS):
+        block_end = min(block_start + SWEEP_BLOCK_ROWS, n)
+        first = max(block_start - max_window + 1, 0)
+        ref = values[block_start]
+        _compensated_prefix_sums(values[first:block_end], ref, hi, lo)
+        for i in range(block_start, block_end):
+            end = i + 1 - first
+            for j in range(windows.shape[0]):
+                w = windows[j]
+                if i + 1 < w:
+                    out[i, j] = np.nan
+                else:
+                    out[i, j] = ((hi[end] - hi[end - w]) + (lo[end] - lo[end - w])) / w + ref
+
+
+@njit(cache=True)
+def sweep_rolling_std_kernel(values, windows, out):
+    """
+    Rolling population standard deviations (as rolling_std_kernel) for every window: the Welford
+    add/remove updates of all windows advanced row by row. E[x^2] - E[x]^2 over prefix sums
+    would lose most digits of the small stds of short windows to cancellation.
+    """
+    n = values.shape[0]
+    means = np.zeros(windows.shape[0])
+    ssqdms = np.zeros(windows.shape[0])
+    for i in range(n):
+        x = values[i]
+        for j in range(windows.shape[0]):
+            window = windows[j]
+            mean = means[j]
+            ssqdm = ssqdms[j]
+            nobs = min(i, window)
+            if i >= window:
+                # remove the value leaving the window
+                old = values[i - window]
+                new_mean = mean - (old - mean) / (nobs - 1) if nobs > 1 else 0.0
+                ssqdm -= (old - mean) * (old - new_mean)
+                mean = new_mean
+                nobs -= 1
+            new_mean = mean + (x - mean) / (nobs + 1)
+            ssqdm += (x - mean) * (x - new_mean)
+            means[j] = new_mean
+            ssqdms[j] = ssqdm
+            out[i, j] = np.sqrt(max(ssqdm, 0.0) / window) if i + 1 >= window else np.nan
+
+
+@njit(cache=True)
+def sweep_ema_kernel(values, windows, out):
+    """EMAs with span=window (as ema_kernel) for every window, all recurrences advanced row by row."""
+    n = values.shape[0]
+    if n == 0:
+        return
+    alphas = 2.0 / (windows + 1.0)
+    old_wt_factors = 1.0 - alphas
+    norms = old_wt_factors + alphas
+    weighted = np.full(windows.shape[0], values[0])
+    for i in range(n):
+        cur = values[i]
+        for j in range(windows.shape[0]):
+            w = weighted[j]
+            if w != cur:
+                w = (old_wt_factors[j] * w + alphas[j] * cur) / norms[j]
+                weighted[j] = w
+            out[i, j] = w if i + 1 >= windows[j] else np.nan
+
+
+@njit(cache=True)
+def sweep_rsi_kernel(values, windows, out):
+    """RSIs with Wilder smoothing (as the plan's wilder_ewm and rsi nodes) for every window; the close diff is computed once per row."""
+    n = values.shape[0]
+    if n == 0:
+        return
+    alphas = 1.0 / windows
+    old_wt_factors = 1.0 - alphas
+    norms = old_wt_factors + alphas
+    avg_gain = np.zeros(windows.shape[0])
+    avg_loss = np.zeros(windows.shape[0])
+    for i in range(n):
+        diff = values[i] - values[i - 1] if i > 0 else 0.0
+        gain = max(diff, 0.0)
+        loss = max(-diff, 0.0)
+        for j in range(windows.shape[0]):
+            g = avg_gain[j]
+            if g != gain:
+                g = (old_wt_factors[j] * g + alphas[j] * gain) / norms[j]
+                avg_gain[j] = g
+            l = avg_loss[j]
+            if l != loss:
+                l = (old_wt_factors[j] * l + alphas[j] * loss) / norms[j]
+                avg_loss[j] = l
+            if i + 1 < windows[j]:
+                out[i, j] = np.nan
+            elif l == 0:
+                out[i, j] = 100.0
+            else:
+                out[i, j] = 100.0 - 100.0 / (1.0 + g / l)
+
+
+
+################################################################################
+# Panel kernels for the panel engine. The series of many assets are stacked
+# time-major into a (rows x assets) array, row i holding the i-th candle of
+# every asset, and each kernel advances the recurrence of its 1-D counterpart
+# above for all assets at every row. The updates of different assets are
+# independent, so they overlap (and vectorize) instead of waiting on each
+# other like the one-series-at-a-time loop; each column gets exactly the values
+# of the 1-D kernel. Columns of shorter series are NaN-padded at the end.
+################################################################################
+
+PANEL_BLOCK_ROWS = 64
+
+
+@njit(cache=True)
+def stack_segments(values, begins, lengths, out):
+    """Stacks the segments values[begins[a]:begins[a]+lengths[a]] as the columns of the (rows x assets) array out, NaN-padded."""
+    n_rows, n_assets = out.shape
+    # a block of rows of every asset at a time, so the strided writes stay in cache
+    for block in range(0, n_rows, PANEL_BLOCK_ROWS):
+        end = min(block + PANEL_BLOCK_ROWS, n_rows)
+        for a in range(n_assets):
+            for i in range(block, end):
+                out[i, a] = values[begins[a] + i] if i < lengths[a] else np.nan
+
+
+@njit(cache=True)
+def unstack_segments(stacked, begins, lengths, out):
+    """Inverse of stack_segments: out[begins[a] + i] = stacked[i, a] for the first lengths[a] rows of every column."""
+    n_rows, n_assets = stacked.shape
+    for block in range(0, n_rows, PANEL_BLOCK_ROWS):
+        for a in range(n_assets):
+            for i in range(block, min(block + PANEL_BLOCK_ROWS, lengths[a])):
+                out[begins[a] + i] = stacked[i, a]
+
+
+@njit(cache=True)
+def panel_ewm_kernel(values, alpha, min_periods, out):
+    """ewm_kernel for every column."""
+    n, n_assets = values.shape
+    if n == 0:
+        return
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0].copy()
+    for i in range(n):
+        for a in range(n_assets):
+            cur = values[i, a]
+            if i > 0 and weighted[a] != cur:
+                weighted[a] = (old_wt_factor * weighted[a] + alpha * cur) / (old_wt_factor + alpha)
+            out[i, a] = weighted[a] if i + 1 >= min_periods else np.nan
+
+
+@njit(cache=True)
+def panel_ema_kernel(values, window, out):
+    """ema_kernel for every column."""
+    panel_ewm_kernel(values, 2.0 / (window + 1.0), window, out)
+
+
+@njit(cache=True)
+def panel_sma_kernel(values, window, out):
+    """sma_kernel for every column."""
+    n, n_assets = values.shape
+    total = np.zeros(n_assets)
+    comp = np.zeros(n_assets)
+    for i in range(n):
+        for a in range(n_assets):
+            y = values[i, a] - comp[a]
+            t = total[a] + y
+            comp[a] = (t - total[a]) - y
+            total[a] = t
+            if i >= window:
+                y = -values[i - window, a] - comp[a]
+                t = total[a] + y
+                comp[a] = (t - total[a]) - y
+                total[a] = t
+            out[i, a] = total[a] / window if i + 1 >= window else np.nan
+
+
+@njit(cache=True)
+def panel_rolling_std_kernel(values, window, out):
+    """rolling_std_kernel for every column."""
+    n, n_assets = values.shape
+    mean = np.zeros(n_assets)
+    ssqdm = np.zeros(n_assets)
+    for i in range(n):
+        for a in range(n_assets):
+            nobs = min(i, window)
+            if i >= window:
+                x = values[i - window, a]
+                new_mean = mean[a] - (x - mean[a]) / (nobs - 1) if nobs > 1 else 0.0
+                ssqdm[a] -= (x - mean[a]) * (x - new_mean)
+                mean[a] = new_mean
+                nobs -= 1
+            x = values[i, a]
+            new_mean = mean[a] + (x - mean[a]) / (nobs + 1)
+            ssqdm[a] += (x - mean[a]) * (x - new_mean)
+            mean[a] = new_mean
+            out[i, a] = np.sqrt(max(ssqdm[a], 0.0) / window) if i + 1 >= window else np.nan
+
+
+@njit(cache=True)
+def panel_true_range_kernel(high, low, close, out):
+    """true_range_kernel for every column."""
+    n, n_assets = close.shape
+    for i in range(n):
+        for a in range(n_assets):
+            tr = high[i, a] - low[i, a]
+            if i > 0:
+                tr = max(tr, abs(high[i, a] - close[i - 1, a]), abs(low[i, a] - close[i - 1, a]))
+            out[i, a] = tr
+
+
+@njit(cache=True)
+def panel_wilder_mean_kernel(values, window, lengths, out):
+    """wilder_mean_kernel for every column; columns with fewer than window values (lengths[a]) are all zeros."""
+    n, n_assets = values.shape
+    out[:] = 0.0
+    if n < window:
+        return
+    # the seed adds the first window values in order, as the 1-D kernel's mean() does
+    total = np.zeros(n_assets)
+    for i in range(window):
+        for a in range(n_assets):
+            total[a] += values[i, a]
+    for a in range(n_assets):
+        out[window - 1, a] = total[a] / window
+    for i in range(window, n):
+        for a in range(n_assets):
+            out[i, a] = (out[i - 1, a] * (window - 1) + values[i, a]) / window
+    for a in range(n_assets):
+        if lengths[a] < window:
+            out[:, a] = 0.0
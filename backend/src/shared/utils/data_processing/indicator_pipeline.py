@@ -1,4 +1,4 @@
-from backend.src.shared.utils.data_processing.indicator_registry import INDICATOR_FUNCTIONS
+from backend.src.shared.utils.data_processing.indicator_plan import compile_indicator_plan
 
 class IndicatorPipeline:
     """
@@ -18,26 +18,10 @@ class IndicatorPipeline:
         """
         self.indicators_config = indicators_config
         self.historical_data = historical_data
+        self.plan = compile_indicator_plan(indicators_config, historical_data)
     def run(self, df):
         """
-        Apply each indicator in sequence, mutating the DataFrame.
-        Returns the same DataFrame with new columns for each indicator.
+        Compute every configured indicator through the compiled IndicatorPlan.
+        Returns a new DataFrame with df's columns followed by the indicator columns.
         """
-        for config in self.indicators_config:
-            ind_name = config['name']
-            # get the function + default params from the registry
-            if ind_name not in INDICATOR_FUNCTIONS:
-                raise ValueError(f"Indicator '{ind_name}' not found in registry.")
-            
-            func = INDICATOR_FUNCTIONS[ind_name]['func']
-            params = INDICATOR_FUNCTIONS[ind_name]['params'].copy()
-            params['historical_data'] = self.historical_data
-            # override defaults if provided
-            if 'override_params' in config:
-                for k, v in config['override_params'].items():
-                    params[k] = v
-
-            # apply the function
-            df = func(df, **params)
-
-        return df
\ No newline at end of file
+        return self.plan.run(df)
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+
+from backend.src.shared.config import data_processing_config
+from backend.src.shared.utils.data_processing.indicator_registry import INDICATOR_BACKENDS, resolve_indicator
+from backend.src.shared.utils.data_processing.indicator_kernels import (
+    ema_kernel, sma_kernel, rolling_std_kernel, ewm_kernel, rsi_from_averages, true_range_kernel, wilder_mean_kernel,
+    panel_ema_kernel, panel_sma_kernel, panel_rolling_std_kernel, panel_ewm_kernel, panel_true_range_kernel,
+    panel_wilder_mean_kernel, stack_segments, unstack_segments,
+)
+
+
+def _diff(out, values):
+    # the first row has no previous value; ta treats it as no change
+    out[0:1] = 0.0
+    np.subtract(values[1:], values[:-1], out=out[1:])
+
+def _loss(out, diff):
+    np.negative(diff, out=out)
+    np.maximum(out, 0.0, out=out)
+
+def _band(out, mid, dev, width):
+    np.multiply(dev, width, out=out)
+    np.add(mid, out, out=out)
+
+# How each node kind is computed: kernel(out, *args) with node args resolved to their arrays
+NODE_KERNELS = {
+    "ema": lambda out, values, window: ema_kernel(values, window, out),
+    "sma": lambda out, values, window: sma_kernel(values, window, out),
+    "rolling_std": lambda out, values, window: rolling_std_kernel(values, window, out),
+    "diff": _diff,
+    "gain": lambda out, diff: np.maximum(diff, 0.0, out=out),
+    "loss": _loss,
+    "wilder_ewm": lambda out, values, window: ewm_kernel(values, 1.0 / window, window, out),
+    "rsi": lambda out, avg_gain, avg_loss: rsi_from_averages(avg_gain, avg_loss, out),
+    "band": _band,
+    "true_range": lambda out, high, low, close: true_range_kernel(high, low, close, out),
+    "wilder_mean": lambda out, values, window: wilder_mean_kernel(values, window, out),
+}
+
+# The same for (rows x assets) stacks of many series (see indicator_kernels' panel kernels):
+# kernel(out, lengths, *args), lengths holding the number of rows of each series. diff, gain,
+# loss and band work along the first axis or element-wise and take the stacks as they are.
+NODE_PANEL_KERNELS = {
+    "ema": lambda out, lengths, values, window: panel_ema_kernel(values, window, out),
+    "sma": lambda out, lengths, values, window: panel_sma_kernel(values, window, out),
+    "rolling_std": lambda out, lengths, values, window: panel_rolling_std_kernel(values, window, out),
+    "wilder_ewm": lambda out, lengths, values, window: panel_ewm_kernel(values, 1.0 / window, window, out),
+    "rsi": lambda out, lengths, avg_gain, avg_loss: rsi_from_averages(avg_gain.ravel(), avg_loss.ravel(), out.ravel()),
+    "true_range": lambda out, lengths, high, low, close: panel_true_range_kernel(high, low, close, out),
+    "wilder_mean": lambda out, lengths, values, window: panel_wilder_mean_kernel(values, window, lengths, out),
+}
+
+def _along_rows(kernel):
+    return lambda out, lengths, *args: kernel(out, *args)
+
+NODE_PANEL_KERNELS.update({kind: _along_rows(NODE_KERNELS[kind]) for kind in ("diff", "gain", "loss", "band")})
+
+
+class IndicatorPlan:
+    """
+    Execution plan compiled once from a list of indicator configs.
+
+    The "outputs" of every registry entry describe its columns as nodes of a small dependency
+    graph; equal nodes are merged, so intermediates shared between indicators (e.g. sma_20 and
+    the Bollinger middle band, the close diff of several RSIs, the true range of several ATRs)
+    are computed once. Every output column is written straight into one preallocated
+    (columns x rows) float64 block, which is attached to the input with a single concat instead
+    of one df[col] = ... insertion per column.
+    """
+
+    def __init__(self, indicator_configs, historical_data: bool = True, backend: str = None):
+        """
+        Args:
+            indicator_configs: List of indicator configs ({'name': ..., 'override_params': {...}})
+            historical_data: Shift every indicator by one row so row T only sees data up to T-1
+            backend: "numba" runs the plan's nodes with the kernels in indicator_kernels.py, "ta"
+                     calls the ta wrappers of each config (no shared intermediates) and only
+                     batches the column insertion. Defaults to data_processing_config.indicator_backend
+        """
+        self.historical_data = historical_data
+        self.backend = backend or data_processing_config.indicator_backend
+        if self.backend not in INDICATOR_BACKENDS:
+            raise ValueError(f"Unknown indicator backend '{self.backend}'. Choose one of {INDICATOR_BACKENDS}.")
+
+        self.steps = []
+        outputs = {}
+        for config in indicator_configs:
+            entry, params = resolve_indicator(config, historical_data)
+            self.steps.append((entry, params))
+            # a column produced twice keeps its first position and its last definition, like repeated df[col] = ...
+            for column, node in entry['outputs'](params):
+                outputs[column] = node
+        self.columns = list(outputs)
+        self.output_nodes = list(outputs.values())
+
+        # computed nodes in dependency order, and the raw columns they read
+        self.nodes = []
+        self.input_columns = []
+        for node in self.output_nodes:
+            self._visit(node)
+
+    def _visit(self, node):
+        if node[0] == "column":
+            if node[1] not in self.input_columns:
+                self.input_columns.append(node[1])
+            return
+        if node in self.nodes:
+            return
+        for arg in node[1:]:
+            if isinstance(arg, tuple):
+                self._visit(arg)
+        self.nodes.append(node)
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes every planned column for df.
+
+        Returns:
+            pd.DataFrame: A new DataFrame with df's columns followed by the indicator columns
+        """
+        block = np.empty((len(self.columns), len(df)), dtype=np.float64)
+        if self.backend == "ta":
+            self._run_ta(df, block)
+        else:
+            self._run_kernels(df, block)
+
+        # block.T is column-major, so the frame wraps the buffer as a single block without copying
+        features = pd.DataFrame(block.T, index=df.index, columns=self.columns, copy=False)
+        base = df.drop(columns=[col for col in self.columns if col in df.columns])
+        return pd.concat([base, features], axis=1)
+
+    def _run_kernels(self, df, block):
+        n = len(df)
+        # For historical data every node runs on rows [0, n-1) and lands one row later in the block
+        offset = 1 if self.historical_data and n > 0 else 0
+        rows = n - offset
+        block[:, :offset] = np.nan
+
+        values = {
+            ("column", col): np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))[:rows]
+            for col in self.input_columns
+        }
+        first_row = {}
+        for i, node in enumerate(self.output_nodes):
+            first_row.setdefault(node, i)
+
+        for node in self.nodes:
+            out = block[first_row[node], offset:] if node in first_row else np.empty(rows, dtype=np.float64)
+            args = [values[arg] if isinstance(arg, tuple) else arg for arg in node[1:]]
+            NODE_KERNELS[node[0]](out, *args)
+            values[node] = out
+
+        for i, node in enumerate(self.output_nodes):
+            if first_row[node] != i:
+                block[i] = block[first_row[node]]
+
+    def run_segments(self, inputs, starts):
+        """
+        Computes the planned columns for many series at once with the "numba" kernels.
+
+        The series are concatenated: segment k spans rows starts[k]:starts[k+1] of every input
+        array. Batches of segments of similar length are stacked time-major into (rows x segments)
+        arrays and each node runs once per batch with the panel kernels, so every segment gets
+        exactly the values run() would give it on its own. The batches hold at most
+        data_processing_config.panel_batch_assets segments and their scratch arrays at most
+        data_processing_config.panel_max_memory_bytes (down to one segment per batch).
+
+        Args:
+            inputs: {column: concatenated float64 array} for every column in self.input_columns
+            starts: int64 array of segment boundaries (len = number of segments + 1)
+
+        Returns:
+            np.ndarray: (columns x rows) float64 block in the order of self.columns
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        begins, lengths = starts[:-1], np.diff(starts)
+        block = np.empty((len(self.columns), int(starts[-1])), dtype=np.float64)
+        if not lengths.any():
+            return block
+        inputs = {col: np.ascontiguousarray(inputs[col], dtype=np.float64) for col in self.input_columns}
+
+        # one scratch buffer for the stacked inputs and nodes, reused by every batch
+        n_slots = len(self.input_columns) + len(self.nodes)
+        max_rows = int(lengths.max())
+        batch_size = min(data_processing_config.panel_batch_assets,
+                         max(1, data_processing_config.panel_max_memory_bytes // (8 * n_slots * max_rows)))
+        scratch = np.empty(n_slots * max_rows * batch_size, dtype=np.float64)
+        # As in _run_kernels, historical nodes run on rows [0, n-1) of every series and land one row later
+        offset = 1 if self.historical_data else 0
+
+        order = np.argsort(lengths, kind="stable")
+        for first in range(0, len(order), batch_size):
+            batch = order[first:first + batch_size]
+            batch_begins, batch_lengths = begins[batch], lengths[batch]
+            n_rows = int(batch_lengths.max())
+            if n_rows == 0:
+                continue
+            size = n_rows * len(batch)
+            slots = (scratch[i * size:(i + 1) * size].reshape(n_rows, len(batch)) for i in range(n_slots))
+            node_lengths = np.maximum(batch_lengths - offset, 0)
+
+            values = {}
+            for col in self.input_columns:
+                stacked = next(slots)
+                stack_segments(inputs[col], batch_begins, batch_lengths, stacked)
+                values[("column", col)] = stacked[:n_rows - offset]
+
+            stacked_nodes = {}
+            for node in self.nodes:
+                stacked = next(slots)
+                stacked[:offset] = np.nan
+                args = [values[arg] if isinstance(arg, tuple) else arg for arg in node[1:]]
+                NODE_PANEL_KERNELS[node[0]](stacked[offset:], node_lengths, *args)
+                values[node] = stacked[offset:]
+                stacked_nodes[node] = stacked
+
+            for i, node in enumerate(self.output_nodes):
+                unstack_segments(stacked_nodes[node], batch_begins, batch_lengths, block[i])
+        return block
+
+    def _run_ta(self, df, block):
+        scratch = df[self.input_columns].copy()
+        for entry, params in self.steps:
+            scratch = entry['func'](scratch, **params)
+        for i, column in enumerate(self.columns):
+            block[i] = scratch[column].to_numpy(dtype=np.float64)
+
+
+_PLAN_CACHE = {}
+
+def compile_indicator_plan(indicator_configs, historical_data: bool = True, backend: str = None) -> IndicatorPlan:
+    """Returns the IndicatorPlan of a config list, compiling it only the first time it is seen."""
+    backend = backend or data_processing_config.indicator_backend
+    key = (repr(indicator_configs), historical_data, backend)
+    if key not in _PLAN_CACHE:
+        _PLAN_CACHE[key] = IndicatorPlan(indicator_configs, historical_data, backend)
+    return _PLAN_CACHE[key]
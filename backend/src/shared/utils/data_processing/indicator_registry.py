@@ -1,25 +1,115 @@
-from backend.src.shared.utils.data_processing.technical_indicators import compute_ema, compute_sma, compute_rsi, compute_bollinger, compute_atr
+import math
+
+import numpy as np
+
+from backend.src.shared.utils.data_processing.technical_indicators import (
+    compute_ema, compute_sma, compute_rsi, compute_bollinger, compute_atr,
+)
+
+
+def _recursive_warmup(alpha):
+    """Rows after which the seed of a recursive (EMA / Wilder) smoother no longer changes a float64 result."""
+    return math.ceil(math.log(np.finfo(np.float64).eps) / math.log(1 - alpha))
+
+def _window_warmup(params):
+    return params["window"]
+
+def _ema_warmup(params):
+    return params["window"] + _recursive_warmup(2 / (params["window"] + 1))
+
+def _wilder_warmup(params):
+    # +1 for the close diff / previous close the smoothed series is built from
+    return params["window"] + 1 + _recursive_warmup(1 / params["window"])
+
+# Output columns of each indicator as (column name, node) pairs for IndicatorPlan. A node is a
+# tuple (kind, *args) whose tuple args are the nodes it is computed from, so equal nodes (e.g.
+# sma_20 and the Bollinger middle band, or the close diff of several RSIs) are computed once.
+def _column(name):
+    return ("column", name)
+
+def _ema_outputs(params):
+    return [(f"{params['col_name_prefix']}_{params['window']}", ("ema", _column(params["close_col"]), params["window"]))]
+
+def _sma_outputs(params):
+    return [(f"{params['col_name_prefix']}_{params['window']}", ("sma", _column(params["close_col"]), params["window"]))]
+
+def _rsi_outputs(params):
+    diff = ("diff", _column(params["close_col"]))
+    avg_gain = ("wilder_ewm", ("gain", diff), params["window"])
+    avg_loss = ("wilder_ewm", ("loss", diff), params["window"])
+    return [(f"{params['col_name_prefix']}_{params['window']}", ("rsi", avg_gain, avg_loss))]
+
+def _bollinger_outputs(params):
+    prefix, window, std_dev = params["col_name_prefix"], params["window"], float(params["std_dev"])
+    mavg = ("sma", _column(params["close_col"]), window)
+    std = ("rolling_std", _column(params["close_col"]), window)
+    return [
+        (f"{prefix}_mavg_{window}", mavg),
+        (f"{prefix}_high_{window}", ("band", mavg, std, std_dev)),
+        (f"{prefix}_low_{window}", ("band", mavg, std, -std_dev)),
+    ]
+
+def _atr_outputs(params):
+    true_range = ("true_range", _column(params["high_col"]), _column(params["low_col"]), _column(params["close_col"]))
+    return [(f"{params['col_name_prefix']}_{params['window']}", ("wilder_mean", true_range, params["window"]))]
+
+# We can store references to these functions in a registry, with default parameter sets.
+# "warmup" returns how many leading rows an indicator needs before its output no longer
+# depends on where the input starts (used to carry context across streamed chunks).
+# "func" wraps the ta library and is what the "ta" backend runs; the "numba" backend computes
+# the columns described by "outputs" with IndicatorPlan's kernels (see above).
+INDICATOR_BACKENDS = ("ta", "numba")
 
-# We can store references to these functions in a registry, with default parameter sets:
 INDICATOR_FUNCTIONS = {
     "ema": {
         "func": compute_ema,
-        "params": {"window": 20, "close_col": "close", "col_name_prefix": "ema"}
+        "outputs": _ema_outputs,
+        "params": {"window": 20, "close_col": "close", "col_name_prefix": "ema"},
+        "warmup": _ema_warmup
     },
     "sma": {
         "func": compute_sma,
-        "params": {"window": 20, "close_col": "close", "col_name_prefix": "sma"}
+        "outputs": _sma_outputs,
+        "params": {"window": 20, "close_col": "close", "col_name_prefix": "sma"},
+        "warmup": _window_warmup
     },
     "rsi": {
         "func": compute_rsi,
-        "params": {"window": 14, "close_col": "close", "col_name_prefix": "rsi"}
+        "outputs": _rsi_outputs,
+        "params": {"window": 14, "close_col": "close", "col_name_prefix": "rsi"},
+        "warmup": _wilder_warmup
     },
     "bollinger": {
         "func": compute_bollinger,
-        "params": {"window": 20, "std_dev": 2, "close_col": "close", "col_name_prefix": "bb"}
+        "outputs": _bollinger_outputs,
+        "params": {"window": 20, "std_dev": 2, "close_col": "close", "col_name_prefix": "bb"},
+        "warmup": _window_warmup
     },
     "atr": {
         "func": compute_atr,
-        "params": {"window": 14, "high_col": "high", "low_col": "low", "close_col": "close", "col_name_prefix": "atr"}
+        "outputs": _atr_outputs,
+        "params": {"window": 14, "high_col": "high", "low_col": "low", "close_col": "close", "col_name_prefix": "atr"},
+        "warmup": _wilder_warmup
     }
 }
+
+def resolve_indicator(config, historical_data=True):
+    """
+    Looks up an indicator config ({'name': ..., 'override_params': {...}}) in the registry.
+
+    Returns:
+        Tuple[dict, dict]: The registry entry and its default params merged with the overrides.
+    """
+    ind_name = config['name']
+    # get the function + default params from the registry
+    if ind_name not in INDICATOR_FUNCTIONS:
+        raise ValueError(f"Indicator '{ind_name}' not found in registry.")
+
+    entry = INDICATOR_FUNCTIONS[ind_name]
+    params = entry['params'].copy()
+    params['historical_data'] = historical_data
+    # override defaults if provided
+    if 'override_params' in config:
+        for k, v in config['override_params'].items():
+            params[k] = v
+    return entry, params
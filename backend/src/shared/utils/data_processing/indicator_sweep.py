@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from backend.src.shared.utils.data_processing.indicator_kernels import (
+    sweep_sma_kernel, sweep_ema_kernel, sweep_rsi_kernel, sweep_rolling_std_kernel,
+)
+
+# Indicator kinds a sweep can compute: kernel(values, windows, out) filling (rows x windows)
+SWEEP_KERNELS = {
+    "sma": sweep_sma_kernel,
+    "ema": sweep_ema_kernel,
+    "rsi": sweep_rsi_kernel,
+    "std": sweep_rolling_std_kernel,  # rolling population std, the Bollinger band width / std_dev
+}
+
+DEFAULT_SWEEP_KINDS = ("sma", "ema", "rsi")
+DEFAULT_SWEEP_WINDOWS = range(5, 201)
+
+
+@dataclass
+class IndicatorSweep:
+    """
+    A family of indicators over many windows for one series.
+
+    values is a (rows x kinds x windows) tensor: values[:, k, j] is indicator kinds[k] with
+    window windows[j], named like the registry columns (e.g. sma_14, rsi_50).
+    """
+    values: np.ndarray     # (T, K, W)
+    kinds: List[str]
+    windows: np.ndarray    # (W,) int64
+    index: pd.Index        # row labels of the source DataFrame
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names of matrix, kind-major."""
+        return [f"{kind}_{window}" for kind in self.kinds for window in self.windows]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(rows x kinds*windows) view of values, ordered like columns (e.g. as a model feature matrix)."""
+        return self.values.reshape(self.values.shape[0], -1)
+
+    def feature(self, kind, window) -> np.ndarray:
+        """The column of one indicator (a strided view into values)."""
+        return self.values[:, self.kinds.index(kind), int(np.flatnonzero(self.windows == window)[0])]
+
+    def to_frame(self, kinds=None, windows=None) -> pd.DataFrame:
+        """Selected indicators (all by default) as a DataFrame aligned with the source rows."""
+        kinds = list(kinds or self.kinds)
+        windows = self.windows if windows is None else np.asarray(windows)
+        return pd.DataFrame(
+            {f"{kind}_{window}": self.feature(kind, window) for kind in kinds for window in windows},
+            index=self.index,
+        )
+
+
+def sweep_indicators(data:pd.DataFrame, windows=None, kinds=DEFAULT_SWEEP_KINDS, close_col:str="close",
+                     historical_data:bool=True, dtype=np.float32) -> IndicatorSweep:
+    """
+    Computes several indicator kinds for a whole range of windows, each kind in one pass.
+
+    SMAs are window differences of compensated prefix sums; EMAs, RSIs and rolling stds advance
+    the recurrences (Welford updates for the stds) of all windows together row by row, so sweeping hundreds of windows reads the series once per kind instead of running the
+    IndicatorPipeline once per window. Values follow the "numba" backend columns of the same
+    name to float64 rounding before being stored as dtype.
+
+    :param data: DataFrame with the close column (one timeframe of one coin pair).
+    :param windows: Windows to sweep. Defaults to DEFAULT_SWEEP_WINDOWS (5..200).
+    :param kinds: Indicator kinds, keys of SWEEP_KERNELS.
+    :param close_col: Column the indicators are computed from.
+    :param historical_data: Shift every indicator by one row, as in create_indicators.
+    :param dtype: Storage dtype of the tensor (float32 keeps 300 windows x 3 kinds of 1M rows
+                  at ~3.6 GB; the kernels compute in float64 either way).
+    :return: IndicatorSweep holding the (rows x kinds x windows) tensor.
+    """
+    windows = np.asarray(DEFAULT_SWEEP_WINDOWS if windows is None else windows, dtype=np.int64)
+    kinds = list(kinds)
+    unknown = [kind for kind in kinds if kind not in SWEEP_KERNELS]
+    if unknown:
+        raise ValueError(f"Unknown sweep kinds {unknown}. Choose from {list(SWEEP_KERNELS)}.")
+    if len(windows) == 0 or windows.min() < 1:
+        raise ValueError("Sweep windows must be a non-empty list of positive integers.")
+
+    close = np.ascontiguousarray(data[close_col].to_numpy(dtype=np.float64))
+    n = len(close)
+    values = np.empty((n, len(kinds), len(windows)), dtype=dtype)
+
+    # For historical data every kernel runs on rows [0, n-1) and lands one row later
+    offset = 1 if historical_data and n > 0 else 0
+    values[:offset] = np.nan
+    for k, kind in enumerate(kinds):
+        SWEEP_KERNELS[kind](close[:n - offset], windows, values[offset:, k, :])
+
+    return IndicatorSweep(values=values, kinds=kinds, windows=windows, index=data.index)
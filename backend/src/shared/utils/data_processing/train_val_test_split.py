@@ -1,6 +1,22 @@
 import pandas as pd
 from sklearn.model_selection import TimeSeriesSplit
 import numpy as np
+from collections.abc import Sequence
+from typing import NamedTuple, Optional, Tuple
+from backend.src.shared.utils.data_processing.feature_matrix import FeatureMatrix
+
+def _split_part(data, start, stop):
+    """
+    Rows [start, stop) of the data as a model input: a FeatureMatrix of views when data is one,
+    otherwise a dict of 'features' (all columns except 'timestamp' and 'target') and 'targets'.
+    """
+    if isinstance(data, FeatureMatrix):
+        return data.rows(start, stop)
+    part = data.iloc[start:stop]
+    return {
+        'features': part.drop(columns=['timestamp','target']),
+        'targets': part['target']
+    }
 
 def train_validate_test_split(data, train_size=0.7, validate_size=0.15, test_size=0.15):
     # Indices (assuming sums to 1.0):
@@ -8,43 +24,28 @@ def train_validate_test_split(data, train_size=0.7, validate_size=0.15, test_siz
     validate_end = train_end + int(len(data) * validate_size)
     # test starts at validate_end automatically
 
-    train_data = data.iloc[:train_end]
-    validate_data = data.iloc[train_end:validate_end]
-    test_data = data.iloc[validate_end:]
-
-    train_data = {
-        'features': train_data.drop(columns=['timestamp','target']),
-        'targets': train_data['target']
-    }
-    validate_data = {
-        'features': validate_data.drop(columns=['timestamp','target']),
-        'targets': validate_data['target']
-    }
-    test_data = {
-        'features': test_data.drop(columns=['timestamp','target']),
-        'targets': test_data['target']
-    }
+    train_data = _split_part(data, 0, train_end)
+    validate_data = _split_part(data, train_end, validate_end)
+    test_data = _split_part(data, validate_end, len(data))
 
     return train_data, validate_data, test_data
 
 
-# Updated function: Create expanding-window time series folds with validation splits.
-def time_series_folds(data, n_folds=5, initial_train_frac=0.3, val_frac=0.2, val_set=False):
+class FoldRanges(NamedTuple):
+    """Row ranges [start, stop) of one expanding-window fold (validate is None without a validation set)."""
+    train: Tuple[int, int]
+    validate: Optional[Tuple[int, int]]
+    test: Tuple[int, int]
+
+
+def time_series_fold_ranges(n_rows, n_folds=5, initial_train_frac=0.3, val_frac=0.2, val_set=False):
     """
-    Splits the data into expanding-window time series folds.
+    Row ranges of the expanding-window folds of time_series_folds for n_rows rows of data.
 
-    Parameters:
-      - data: pandas DataFrame sorted chronologically by 'timestamp'.
-      - n_folds: Number of folds to create.
-      - initial_train_frac: Fraction of the data to use for the initial training set.
-      - val_frac: Fraction of each training fold to set aside for validation.
-      
     Returns:
-      - List of tuples [(train_fold, val_fold, test_fold), ...] where each fold is a dict with:
-          • 'features': DataFrame of features (all columns except 'timestamp' and 'target')
-          • 'targets': Series for the target ('target' column)
+      - List of FoldRanges, one per non-empty fold.
     """
-    N = len(data)
+    N = n_rows
     initial_train_end = int(N * initial_train_frac)
     if initial_train_end >= N:
         raise ValueError("initial_train_frac is too high; no data left for testing.")
@@ -53,19 +54,16 @@ def time_series_folds(data, n_folds=5, initial_train_frac=0.3, val_frac=0.2, val
     if test_window == 0:
         test_window = 1  # Ensure at least one row per test fold
 
-    folds = []
+    ranges = []
     for i in range(n_folds):
-        train_end = initial_train_end + i * test_window
+        train_end = min(initial_train_end + i * test_window, N)
         test_start = train_end
-        test_end = test_start + test_window if i < n_folds - 1 else N
-
-        train_fold = data.iloc[:train_end]
-        test_fold = data.iloc[test_start:test_end]
+        test_end = min(test_start + test_window, N) if i < n_folds - 1 else N
 
         # Only include the fold if training, validation, and testing parts are non-empty.
-        if len(train_fold) > 1 and len(test_fold) > 0:
+        if train_end > 1 and test_end - test_start > 0:
             # Split train_fold into training and validation parts.
-            n_train = len(train_fold)
+            n_train = train_end
             
             if val_set:
                 split_index = int(n_train * (1 - val_frac))
@@ -75,28 +73,60 @@ def time_series_folds(data, n_folds=5, initial_train_frac=0.3, val_frac=0.2, val
             else:
                 split_index = n_train - 1
 
+            validate = (split_index, train_end) if val_set else None
+            ranges.append(FoldRanges((0, split_index), validate, (test_start, test_end)))
+    return ranges
 
-            train_train = train_fold.iloc[:split_index]
-            if val_set:
-                val_fold = train_fold.iloc[split_index:]
 
+class TimeSeriesFolds(Sequence):
+    """
+    Lazy sequence of folds: only the row ranges are stored, and each fold's parts are cut from
+    the data when the fold is accessed. For a FeatureMatrix the parts are views, so iterating the
+    folds (once per Optuna trial) never holds more than the one copy of the data.
+    """
+
+    def __init__(self, data, ranges):
+        self.data = data
+        self.ranges = ranges
 
-            train_dict = {
-                'features': train_train.drop(columns=['timestamp', 'target']),
-                'targets': train_train['target']
-            }
-            if val_set:
-                val_dict = {
-                    'features': val_fold.drop(columns=['timestamp', 'target']),
-                    'targets': val_fold['target']
-                }
-
-            test_dict = {
-                'features': test_fold.drop(columns=['timestamp', 'target']),
-                'targets': test_fold['target']
-            }
-            if val_set:
-                folds.append((train_dict, val_dict, test_dict))
-            else:
-                folds.append((train_dict, test_dict))
-    return folds
\ No newline at end of file
+    def __len__(self):
+        return len(self.ranges)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TimeSeriesFolds(self.data, self.ranges[index])
+        return self.fold(index)
+
+    def fold(self, index, train_fraction=1.0):
+        """
+        Parts of fold index, with the training part cut down to its most recent train_fraction
+        of rows (at least one). Validation and test parts are unchanged.
+        """
+        fold = self.ranges[index]
+        train_start, train_stop = fold.train
+        if train_fraction < 1.0:
+            train_start = train_stop - max(1, int((train_stop - train_start) * train_fraction))
+        parts = [(train_start, train_stop)] + ([fold.validate] if fold.validate is not None else []) + [fold.test]
+        return tuple(_split_part(self.data, start, stop) for start, stop in parts)
+
+
+# Updated function: Create expanding-window time series folds with validation splits.
+def time_series_folds(data, n_folds=5, initial_train_frac=0.3, val_frac=0.2, val_set=False):
+    """
+    Splits the data into expanding-window time series folds.
+
+    Parameters:
+      - data: pandas DataFrame sorted chronologically by 'timestamp', or a FeatureMatrix built from one.
+      - n_folds: Number of folds to create.
+      - initial_train_frac: Fraction of the data to use for the initial training set.
+      - val_frac: Fraction of each training fold to set aside for validation.
+      
+    Returns:
+      - TimeSeriesFolds, a lazy sequence of tuples [(train_fold, val_fold, test_fold), ...]
+        (without val_fold unless val_set) where each fold is a dict with:
+          • 'features': DataFrame of features (all columns except 'timestamp' and 'target')
+          • 'targets': Series for the target ('target' column)
+        For a FeatureMatrix each fold part is a FeatureMatrix of row views instead (no copies).
+        A fold's parts are only cut from data when the fold is accessed.
+    """
+    return TimeSeriesFolds(data, time_series_fold_ranges(len(data), n_folds, initial_train_frac, val_frac, val_set))
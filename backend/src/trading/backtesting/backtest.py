@@ -3,6 +3,7 @@ import numpy as np
 import xgboost as xgb  # Added for GPU based predictions using DMatrix
 import numba
 from numba import njit
+from backend.src.shared.utils.data_processing.feature_matrix import FeatureMatrix
 
 @njit
 def simulate_trades(predicted_prices, targets, percent_to_buy, fee_percentage, slippage_percentage, initial_balance):
@@ -70,28 +71,44 @@ def backtest_model(model, data):
       - data: A dictionary with keys:
             • 'features': pandas DataFrame containing the features (chronologically ordered)
             • 'targets': pandas Series containing the target (close) prices (chronologically ordered)
+        or a FeatureMatrix (e.g. a fold of time_series_folds), whose arrays are used as they are.
 
     Returns:
       - summary: Dictionary of aggregate metrics.
     """
-    # --- Set Testing Variables ---
-    INITIAL_BALANCE = 10000         # Starting balance
-    PERCENT_TO_BUY = 0.10           # Invest 10% of current balance on each trade
-    FEE_PERCENTAGE = 0       
-    SLIPPAGE_PERCENTAGE = 0     
-
     # Unpack the data dictionary
-    features = data["features"].reset_index(drop=True)
-    targets = data["targets"].reset_index(drop=True)
+    if isinstance(data, FeatureMatrix):
+        features = data.features
+        targets = data.targets
+    else:
+        features = data["features"].reset_index(drop=True)
+        targets = data["targets"].reset_index(drop=True)
     
     # --- Batch Prediction Setup ---
     # Create a DMatrix with all features (this will leverage the GPU if model is configured for GPU)
     # Compute predictions for all rows at once
     predicted_prices = model.predict(features)
-    
+
+    return backtest_predictions(predicted_prices, targets)
+
+def backtest_predictions(predicted_prices, targets):
+    """
+    The backtest of backtest_model for predictions that were already computed (e.g. by a booster
+    on a cached quantized test matrix), one per target row.
+
+    Returns:
+      - summary: Dictionary of aggregate metrics.
+      - sortino_ratio: The backtest metric.
+    """
+    # --- Set Testing Variables ---
+    INITIAL_BALANCE = 10000         # Starting balance
+    PERCENT_TO_BUY = 0.10           # Invest 10% of current balance on each trade
+    FEE_PERCENTAGE = 0       
+    SLIPPAGE_PERCENTAGE = 0     
+
     # Convert both the predicted prices and targets to numpy arrays for faster access
     predicted_prices = np.asarray(predicted_prices)
-    targets_arr = targets.to_numpy()
+    targets_arr = np.asarray(targets)
 
     # Call the optimized simulation function (uses Numba for speed)
     final_balance, num_trades, wins, losses, total_profit_win, total_profit_loss, balance_history, trade_returns_array, initial_balance = simulate_trades(
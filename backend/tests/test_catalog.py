@@ -0,0 +1,83 @@
+"""
+DataCatalog: lookups against the directory crawl, file stats against the CSVs, incremental refreshes
+and the chunked store builds of a refresh.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import write_synthetic_coinpair
+from backend.src.data.ingestion.ohlcv_store import OHLCV_COLUMNS
+from backend.src.data.staging import catalog as catalog_module
+from backend.src.data.staging.catalog import DataCatalog
+from backend.src.data.staging.get_csv_paths import get_csv_paths
+from backend.src.shared.config import global_config
+
+TIMEFRAMES = [1, 5, 60]
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    data_folder = str(tmp_path / "data")
+    for seed, (coin, pair) in enumerate([("AAA", "AAAUSD"), ("BBB", "BBBUSD")]):
+        write_synthetic_coinpair(data_folder, coin, pair, 3 * 1440, timeframes=TIMEFRAMES, seed=seed)
+    monkeypatch.setattr(global_config, "data_folder", data_folder)
+    monkeypatch.setattr(global_config, "store_folder", str(tmp_path / "store"))
+    monkeypatch.setattr(global_config, "catalog_path", str(tmp_path / "store" / "catalog.sqlite"))
+    return data_folder
+
+
+def test_lookups_match_the_crawl(data_folder):
+    with DataCatalog(data_folder) as catalog:
+        assert len(catalog.refresh()) == 2 * len(TIMEFRAMES)
+        assert catalog.csv_paths() == get_csv_paths(data_folder)
+        assert catalog.csv_paths("AAA", "AAAUSD", [5, 60]) == get_csv_paths(data_folder, "AAA", "AAAUSD", [5, 60])
+    assert get_csv_paths(data_folder, "BBB", "BBBUSD", TIMEFRAMES, use_catalog=True) == get_csv_paths(data_folder, "BBB", "BBBUSD", TIMEFRAMES)
+
+
+def test_entries_hold_rows_timestamps_and_gaps(data_folder):
+    with DataCatalog(data_folder) as catalog:
+        catalog.refresh()
+        for timeframe in TIMEFRAMES:
+            entry = catalog.get_entry("AAA", "AAAUSD", timeframe)
+            timestamps = pd.read_csv(entry["path"], names=OHLCV_COLUMNS)["timestamp"].to_numpy()
+            gap_idx = np.flatnonzero(np.diff(timestamps) > timeframe * 60)
+
+            assert (entry["rows"], entry["first_timestamp"], entry["last_timestamp"]) == (len(timestamps), timestamps[0], timestamps[-1])
+            assert entry["gap_count"] == len(gap_idx)
+            assert catalog.get_gaps(entry["path"]) == list(zip(timestamps[gap_idx].tolist(), timestamps[gap_idx + 1].tolist()))
+
+
+def test_refresh_rereads_only_changed_files(data_folder):
+    with DataCatalog(data_folder) as catalog:
+        catalog.refresh()
+        assert catalog.refresh() == []
+
+        appended = catalog.get_path("AAA", "AAAUSD", 60)
+        last = catalog.get_entry("AAA", "AAAUSD", 60)
+        with open(appended, "a") as f:
+            f.write(f"{last['last_timestamp'] + 3600},1.0,1.0,1.0,1.0,1.0,1\n")
+        removed = catalog.get_path("BBB", "BBBUSD", 5)
+        os.remove(removed)
+
+        assert catalog.refresh() == [appended]
+        assert catalog.get_entry("AAA", "AAAUSD", 60)["rows"] == last["rows"] + 1
+        assert catalog.get_path("BBB", "BBBUSD", 5) is None
+
+
+def test_refresh_builds_stores_in_chunks(data_folder, monkeypatch):
+    chunk_sizes = []
+
+    def recording_ensure_store(file_path, chunk_rows=None, **kwargs):
+        chunk_sizes.append(chunk_rows)
+        return ensure_store(file_path, chunk_rows=chunk_rows, **kwargs)
+
+    ensure_store = catalog_module.ensure_store
+    monkeypatch.setattr(catalog_module, "ensure_store", recording_ensure_store)
+    with DataCatalog(data_folder) as catalog:
+        catalog.refresh()
+
+    assert len(chunk_sizes) == 2 * len(TIMEFRAMES)
+    assert all(chunk_rows for chunk_rows in chunk_sizes)
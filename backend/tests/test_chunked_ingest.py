@@ -0,0 +1,60 @@
+"""
+Chunked streaming: ingest_csv_chunks and process_timeframe_chunks against loading and processing
+the whole file at once.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import write_synthetic_coinpair
+from backend.src.data.ingestion.ingest_csv import ingest_csv, ingest_csv_chunks, stream_chunk_size
+from backend.src.data.ingestion.ohlcv_store import OHLCV_ROW_BYTES
+from backend.src.data.processing.process_timeframes import process_timeframe, process_timeframe_chunks
+from backend.src.shared.config import global_config
+
+CHUNK_ROWS = 700
+
+
+@pytest.fixture
+def csv_paths(tmp_path, monkeypatch):
+    data_folder = str(tmp_path / "data")
+    monkeypatch.setattr(global_config, "data_folder", data_folder)
+    monkeypatch.setattr(global_config, "store_folder", str(tmp_path / "store"))
+    return write_synthetic_coinpair(data_folder, "AAA", "AAAUSD", 20 * 1440, timeframes=[5, 15, 60], seed=0)
+
+
+@pytest.mark.parametrize("use_store", [True, False])
+def test_chunks_concatenate_to_the_full_frame(csv_paths, use_store):
+    chunks = list(ingest_csv_chunks(csv_paths[5], chunk_rows=CHUNK_ROWS, use_store=use_store))
+
+    assert all(len(chunk) == CHUNK_ROWS for chunk in chunks[:-1]) and 0 < len(chunks[-1]) <= CHUNK_ROWS
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), ingest_csv(csv_paths[5]), check_exact=True)
+
+
+@pytest.mark.parametrize("use_store", [True, False])
+def test_numpy_chunks_concatenate_to_the_records(csv_paths, use_store):
+    chunks = list(ingest_csv_chunks(csv_paths[5], chunk_rows=CHUNK_ROWS, format="numpy", use_store=use_store))
+
+    np.testing.assert_array_equal(np.concatenate(chunks), ingest_csv(csv_paths[5], format="numpy"))
+
+
+def test_memory_ceiling_caps_the_chunk_rows(csv_paths):
+    assert stream_chunk_size(10_000, 100 * OHLCV_ROW_BYTES) == 100
+    assert stream_chunk_size(50, 100 * OHLCV_ROW_BYTES) == 50
+    with pytest.raises(ValueError):
+        stream_chunk_size(10_000, OHLCV_ROW_BYTES - 1)
+
+    chunks = list(ingest_csv_chunks(csv_paths[60], chunk_rows=10_000, max_memory_bytes=100 * OHLCV_ROW_BYTES))
+    assert max(len(chunk) for chunk in chunks) == 100
+
+
+@pytest.mark.parametrize("timeframe", [5, 15])
+def test_processed_chunks_match_process_timeframe(csv_paths, timeframe):
+    expected = process_timeframe(ingest_csv(csv_paths[timeframe]), timeframe, 60)
+    assert len(expected) > 2 * CHUNK_ROWS
+
+    chunks = process_timeframe_chunks(ingest_csv_chunks(csv_paths[timeframe], chunk_rows=CHUNK_ROWS), timeframe, 60)
+    streamed = pd.concat(list(chunks), ignore_index=True)
+
+    # rolling sums restart at every chunk, so the values agree up to their rounding drift
+    pd.testing.assert_frame_equal(streamed, expected.reset_index(drop=True), rtol=1e-9)
@@ -0,0 +1,99 @@
+"""
+FoldMatrixCache: hits and misses per (fold, max_bin), eviction, and boosters trained on the cached
+matrices against XGBRegressor fits on the DataFrame folds.
+"""
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from backend.src.models.xgboost.dmatrix_cache import FoldMatrixCache
+from backend.src.models.xgboost.train_tune import _train_params, objective_time_series
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+from backend.src.shared.utils.data_processing.train_val_test_split import time_series_folds
+
+N_FOLDS = 3
+PARAMS = {
+    "grow_policy": "depthwise", "subsample": 1.0, "colsample_bytree": 1.0, "colsample_bylevel": 1.0,
+    "colsample_bynode": 1.0, "learning_rate": 0.1, "max_depth": 3, "gamma": 0.0, "min_child_weight": 1,
+    "reg_alpha": 1e-8, "reg_lambda": 1.0, "n_estimators": 100, "max_bin": 256,
+}
+
+
+@pytest.fixture(scope="module")
+def merged():
+    rng = np.random.default_rng(7)
+    n = 600
+    frame = pd.DataFrame({"timestamp": np.arange(n, dtype=np.int64) * 3600})
+    for i in range(5):
+        frame[f"feature_{i}"] = rng.normal(size=n)
+    frame["target"] = 3000 + np.cumsum(frame["feature_0"] + rng.normal(scale=0.5, size=n))
+    return frame
+
+
+@pytest.fixture
+def folds(merged):
+    return time_series_folds(build_feature_matrix(merged), n_folds=N_FOLDS)
+
+
+def test_matrices_are_built_once_per_fold_and_max_bin(folds):
+    cache = FoldMatrixCache(folds, max_entries=10)
+
+    first = cache.get(0, 256)
+    assert cache.get(0, 256) is first
+    cache.get(0, 512)
+    cache.get(1, 256)
+    cache.get(0, 256, train_fraction=0.5)
+
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert [isinstance(matrix, xgb.QuantileDMatrix) for matrix in first] == [True, True]
+    assert first[0].num_row() == len(folds[0][0]) and first[0].feature_names == folds.data.columns
+
+
+def test_raw_matrices_do_not_depend_on_max_bin(folds):
+    cache = FoldMatrixCache(folds, quantized=False)
+
+    first = cache.get(1, 256)
+
+    assert cache.get(1, 1024) is first and (cache.hits, cache.misses) == (1, 1)
+    assert not isinstance(first[0], xgb.QuantileDMatrix)
+
+
+def test_least_recently_used_entry_is_evicted(folds):
+    cache = FoldMatrixCache(folds, max_entries=2)
+
+    cache.get(0, 256)
+    cache.get(1, 256)
+    cache.get(0, 256)
+    cache.get(2, 256)
+
+    assert list(cache.entries) == [(0, 256, 1.0), (2, 256, 1.0)]
+
+
+def test_cached_matrices_train_the_booster_of_a_dataframe_fit(merged, folds):
+    params = {**PARAMS, "booster": "gbtree", "objective": "reg:squarederror", "tree_method": "hist",
+              "random_state": 42, "device": "cpu", "n_jobs": 1}
+    train_params, num_boost_round = _train_params(params)
+    cache = FoldMatrixCache(folds)
+
+    for fold_idx, (frame_train, frame_test) in enumerate(time_series_folds(merged, n_folds=N_FOLDS)):
+        dtrain, dtest = cache.get(fold_idx, params["max_bin"])
+        booster = xgb.train(train_params, dtrain, num_boost_round=num_boost_round)
+        model = xgb.XGBRegressor(**params).fit(frame_train["features"], frame_train["targets"])
+
+        np.testing.assert_array_equal(booster.predict(dtest), model.predict(frame_test["features"]))
+
+
+def test_trials_share_the_study_matrices(merged, folds):
+    cache = FoldMatrixCache(folds)
+
+    values = [
+        objective_time_series(optuna.trial.FixedTrial({**PARAMS, "n_estimators": n_estimators}), merged,
+                              folds=folds, matrix_cache=cache, device="cpu")
+        for n_estimators in (100, 200, 100)
+    ]
+
+    assert (cache.hits, cache.misses) == (2 * N_FOLDS, N_FOLDS)
+    assert values[2] == values[0]
+    assert values[0] == objective_time_series(optuna.trial.FixedTrial(PARAMS), merged, n_folds=N_FOLDS, device="cpu")
@@ -0,0 +1,86 @@
+"""
+FeatureMatrix: the feature block, row views, column selection, saved copies and backtests against
+the merged DataFrame it is built from.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from backend.src.shared.utils.data_processing.feature_matrix import (
+    build_feature_matrix, feature_matrix_fingerprint, load_feature_matrix, model_inputs, save_feature_matrix,
+)
+from backend.src.shared.utils.data_processing.train_val_test_split import train_validate_test_split
+from backend.src.trading.backtesting.backtest import backtest_model
+
+
+@pytest.fixture
+def merged():
+    rng = np.random.default_rng(6)
+    n = 500
+    frame = pd.DataFrame({"timestamp": 1_600_000_000 + np.arange(n, dtype=np.int64) * 3600})
+    for name in ("ema_14", "rsi_14", "5_sma_50", "60_atr_14"):
+        frame[name] = rng.normal(size=n)
+    frame["volume"] = rng.random(n).astype(np.float32)
+    frame["target"] = 3000 + np.cumsum(rng.normal(size=n))
+    return frame
+
+
+def test_matrix_holds_the_frame_columns(merged):
+    matrix = build_feature_matrix(merged)
+    expected = merged.drop(columns=["timestamp", "target"])
+
+    assert matrix.columns == list(expected.columns)
+    assert matrix.features.dtype == np.float32 and matrix.features.flags.c_contiguous
+    np.testing.assert_array_equal(matrix.features, expected.to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(matrix.targets, merged["target"])
+    np.testing.assert_array_equal(matrix.timestamps, merged["timestamp"])
+    np.testing.assert_array_equal(matrix.column("rsi_14"), merged["rsi_14"].to_numpy(dtype=np.float32))
+    pd.testing.assert_frame_equal(build_feature_matrix(merged, dtype=np.float64).to_frame(), merged.astype({"volume": np.float64}))
+
+
+def test_rows_are_views(merged):
+    matrix = build_feature_matrix(merged)
+
+    part = matrix.rows(100, 250)
+    features, targets = model_inputs(part)
+
+    assert len(part) == 150 and part.columns == matrix.columns
+    assert np.shares_memory(features, matrix.features) and np.shares_memory(targets, matrix.targets)
+    assert features.flags.c_contiguous
+    np.testing.assert_array_equal(part.timestamps, merged["timestamp"].iloc[100:250])
+
+
+def test_select_reorders_the_columns(merged):
+    matrix = build_feature_matrix(merged)
+
+    selected = matrix.select(["60_atr_14", "ema_14"])
+
+    assert selected.columns == ["60_atr_14", "ema_14"] and selected.features.flags.c_contiguous
+    np.testing.assert_array_equal(selected.features, merged[["60_atr_14", "ema_14"]].to_numpy(dtype=np.float32))
+
+
+def test_saved_matrix_is_memory_mapped(merged, tmp_path):
+    matrix = build_feature_matrix(merged)
+    save_feature_matrix(matrix, str(tmp_path / "matrix"))
+
+    loaded = load_feature_matrix(str(tmp_path / "matrix"))
+
+    assert isinstance(loaded.features, np.memmap) and loaded.columns == matrix.columns
+    assert feature_matrix_fingerprint(loaded) == feature_matrix_fingerprint(matrix)
+    assert feature_matrix_fingerprint(matrix.rows(0, 499)) != feature_matrix_fingerprint(matrix)
+    np.testing.assert_array_equal(loaded.features, matrix.features)
+
+
+def test_backtest_matches_the_dataframe_split(merged):
+    frame_train, _, frame_test = train_validate_test_split(merged)
+    matrix_train, _, matrix_test = train_validate_test_split(build_feature_matrix(merged))
+    model = xgb.XGBRegressor(n_estimators=10, max_depth=3, device="cpu", n_jobs=1)
+    model.fit(frame_train["features"], frame_train["targets"])
+
+    from_frame = backtest_model(model, frame_test)
+    from_matrix = backtest_model(model, matrix_test)
+
+    assert len(matrix_train) == len(frame_train["targets"])
+    assert from_frame[0]["num_trades"] > 0
+    pd.testing.assert_series_equal(pd.Series(from_matrix[0]), pd.Series(from_frame[0]))
@@ -0,0 +1,77 @@
+"""
+Feature pruning: correlated and over-budget columns against the gain ranking, the ranking rows,
+and the recorded selection of a coin pair.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.models.xgboost import feature_pruning
+from backend.src.models.xgboost.feature_pruning import (
+    feature_gains, load_feature_selection, prune_coinpair_features, prune_features, ranking_rows,
+)
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+from backend.src.shared.utils.data_processing.train_val_test_split import time_series_folds
+
+
+@pytest.fixture(scope="module")
+def merged():
+    rng = np.random.default_rng(9)
+    n = 2000
+    signal, other = rng.normal(size=n), rng.normal(size=n)
+    frame = pd.DataFrame({"timestamp": np.arange(n, dtype=np.int64) * 3600})
+    frame["noise"] = rng.normal(size=n)
+    frame["signal"] = signal
+    frame["signal_copy"] = signal * 2 + rng.normal(scale=1e-3, size=n)
+    frame["other"] = other
+    frame["constant"] = 1.0
+    frame["sparse"] = np.where(rng.random(n) < 0.5, np.nan, other * 0.1 + rng.normal(size=n))
+    frame["target"] = 3000 + 5 * signal + other
+    return frame
+
+
+def test_near_duplicates_keep_the_higher_ranked_member(merged):
+    matrix = build_feature_matrix(merged)
+    gains = {"noise": 1.0, "signal": 5.0, "signal_copy": 10.0, "other": 3.0, "constant": 0.0, "sparse": 2.0}
+
+    selection = prune_features(matrix, budget=None, correlation_threshold=0.95, gains=gains)
+
+    assert selection.columns == ["noise", "signal_copy", "other", "constant", "sparse"]
+    assert selection.dropped == {"signal": "correlated with signal_copy (1.000)"}
+    assert selection.n_input_columns == len(matrix.columns)
+
+
+def test_budget_keeps_the_highest_gains(merged):
+    matrix = build_feature_matrix(merged)
+
+    gains = feature_gains(matrix, n_rounds=20, n_jobs=1)
+    selection = prune_features(matrix, budget=2, correlation_threshold=0.95, gains=gains)
+
+    assert set(gains) == set(matrix.columns) and gains["constant"] == 0.0
+    assert gains["signal"] + gains["signal_copy"] > max(gains["noise"], gains["sparse"])
+    assert len(selection.columns) == 2 and "other" in selection.columns
+    assert {"noise", "constant"} <= {name for name, reason in selection.dropped.items() if reason == "over budget"}
+
+
+def test_features_are_ranked_before_the_first_test_fold(merged):
+    matrix = build_feature_matrix(merged)
+
+    rows = ranking_rows(matrix, n_folds=4)
+
+    first_test = time_series_folds(matrix, n_folds=4)[0][-1]
+    assert rows.timestamps[-1] < first_test.timestamps[0] and len(rows) == first_test.timestamps[0] // 3600
+    assert np.shares_memory(rows.features, matrix.features)
+
+
+def test_coinpair_selection_is_recorded_and_applied(merged, tmp_path, monkeypatch):
+    monkeypatch.setattr(feature_pruning, "feature_sets_folder", str(tmp_path))
+    monkeypatch.setattr(feature_pruning.model_config, "feature_ranking_rounds", 20)
+    train, test = merged.iloc[:1500], merged.iloc[1500:].reset_index(drop=True)
+
+    pruned_train, pruned_test, selection = prune_coinpair_features("AAA", "AAAUSD", train, test, n_folds=4)
+
+    assert load_feature_selection("AAA", "AAAUSD") == selection
+    assert load_feature_selection("BBB", "BBBUSD") is None
+    assert pruned_train.columns == pruned_test.columns == selection.columns
+    assert "signal" not in selection.columns or "signal_copy" not in selection.columns
+    np.testing.assert_array_equal(pruned_test.features, test[selection.columns].to_numpy(dtype=np.float32))
@@ -0,0 +1,106 @@
+"""
+FoldResultCache: result keys against the parameters and rows a fold depends on, and trials served
+from stored fold results against trials that train every fold.
+"""
+import math
+
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+
+from backend.src.models.xgboost.fold_result_cache import FoldResultCache
+from backend.src.models.xgboost.train_tune import objective_time_series
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+from backend.src.shared.utils.data_processing.train_val_test_split import TimeSeriesFolds, time_series_folds
+
+N_FOLDS = 3
+PARAMS = {
+    "grow_policy": "depthwise", "subsample": 1.0, "colsample_bytree": 1.0, "colsample_bylevel": 1.0,
+    "colsample_bynode": 1.0, "learning_rate": 0.1, "max_depth": 3, "gamma": 0.0, "min_child_weight": 1,
+    "reg_alpha": 1e-8, "reg_lambda": 1.0, "n_estimators": 100, "max_bin": 256,
+}
+TRAIN_PARAMS = {"max_depth": 3, "eta": 0.1, "nthread": 1}
+
+
+def _merged(seed=8, n=600):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({"timestamp": np.arange(n, dtype=np.int64) * 3600})
+    for i in range(5):
+        frame[f"feature_{i}"] = rng.normal(size=n)
+    frame["target"] = 3000 + np.cumsum(frame["feature_0"] + rng.normal(scale=0.5, size=n))
+    return frame
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "fold_results.sqlite")
+
+
+def _cache(data, path):
+    return FoldResultCache(time_series_folds(build_feature_matrix(data), n_folds=N_FOLDS), path)
+
+
+def test_keys_follow_parameters_and_rows(path):
+    data = _merged()
+    cache = _cache(data, path)
+    key = cache.key(1, TRAIN_PARAMS, 100)
+
+    # thread counts do not change the booster; any other parameter does
+    assert cache.key(1, {**TRAIN_PARAMS, "nthread": 8}, 100) == key
+    assert cache.key(1, {**TRAIN_PARAMS, "max_depth": 4}, 100) != key
+    assert cache.key(1, TRAIN_PARAMS, 200) != key
+    assert cache.key(1, TRAIN_PARAMS, 100, early_stopping_rounds=10) != key
+    assert cache.key(1, TRAIN_PARAMS, 100, train_fraction=0.5) != key
+    assert cache.key(0, TRAIN_PARAMS, 100) != key
+
+    # a change in the last fold's rows only misses the last fold
+    changed = data.copy()
+    changed.loc[len(changed) - 1, "feature_3"] += 1.0
+    changed_cache = _cache(changed, path)
+    assert changed_cache.key(1, TRAIN_PARAMS, 100) == key
+    assert changed_cache.key(2, TRAIN_PARAMS, 100) != cache.key(2, TRAIN_PARAMS, 100)
+
+
+def test_warm_started_keys_cover_the_earlier_folds(path):
+    folds = time_series_folds(build_feature_matrix(_merged()), n_folds=N_FOLDS)
+    # the same last fold, continued from a different first fold
+    other_ranges = [folds.ranges[0]._replace(test=(folds.ranges[0].test[0], folds.ranges[0].test[1] - 1))] + folds.ranges[1:]
+    cache = FoldResultCache(folds, path)
+    other = FoldResultCache(TimeSeriesFolds(folds.data, other_ranges), path)
+
+    assert other.key(2, TRAIN_PARAMS, 100) == cache.key(2, TRAIN_PARAMS, 100)
+    assert other.key(2, TRAIN_PARAMS, 100, warm_start_rounds=25) != cache.key(2, TRAIN_PARAMS, 100, warm_start_rounds=25)
+
+
+def test_results_persist_across_instances(path):
+    cache = _cache(_merged(), path)
+    cache.put(cache.key(0, TRAIN_PARAMS, 100), 1.5)
+    cache.put(cache.key(1, TRAIN_PARAMS, 100), float("nan"))
+    cache.close()
+
+    reopened = _cache(_merged(), path)
+
+    assert reopened.get(reopened.key(0, TRAIN_PARAMS, 100)) == 1.5
+    assert math.isnan(reopened.get(reopened.key(1, TRAIN_PARAMS, 100)))
+    assert reopened.get(reopened.key(2, TRAIN_PARAMS, 100)) is None
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_repeated_trials_are_served_from_stored_results(path, warm_start):
+    data = build_feature_matrix(_merged())
+    folds = time_series_folds(data, n_folds=N_FOLDS)
+    expected = objective_time_series(optuna.trial.FixedTrial(PARAMS), data, folds=folds, device="cpu", warm_start=warm_start)
+
+    values, trees = [], []
+    for _ in range(2):
+        cache = FoldResultCache(folds, path)
+        trial = optuna.trial.FixedTrial(PARAMS)
+        values.append(objective_time_series(trial, data, folds=folds, device="cpu", warm_start=warm_start, result_cache=cache))
+        trees.append(trial.user_attrs["trees_built"])
+        cache.close()
+
+    assert values == [expected, expected]
+    assert trees[0] > 0 and trees[1] == 0
+    assert (cache.hits, cache.misses) == (N_FOLDS, 0)
@@ -0,0 +1,79 @@
+"""
+IndicatorPlan: shared intermediates are computed once, and the compiled plan gives the columns of
+running every indicator config on its own.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import synthetic_candles
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.shared.utils.data_processing.indicator_plan import IndicatorPlan, compile_indicator_plan
+
+CONFIGS = [
+    {"name": "sma", "override_params": {"window": 20}},
+    {"name": "bollinger", "override_params": {"window": 20, "std_dev": 2}},
+    {"name": "rsi", "override_params": {"window": 14}},
+    {"name": "rsi", "override_params": {"window": 28}},
+    {"name": "atr", "override_params": {"window": 14}},
+    {"name": "atr", "override_params": {"window": 28}},
+]
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return synthetic_candles(2000, seed=4)
+
+
+def test_shared_nodes_are_computed_once():
+    plan = IndicatorPlan(CONFIGS, backend="numba")
+    kinds = [node[0] for node in plan.nodes]
+
+    # sma_20 is the Bollinger middle band; both RSIs share the close diff, both ATRs the true range
+    assert plan.columns == ["sma_20", "bb_mavg_20", "bb_high_20", "bb_low_20", "rsi_14", "rsi_28", "atr_14", "atr_28"]
+    assert kinds.count("sma") == 1 and kinds.count("rolling_std") == 1
+    assert kinds.count("diff") == 1 and kinds.count("true_range") == 1
+    assert kinds.count("wilder_ewm") == 4 and kinds.count("wilder_mean") == 2
+    assert plan.input_columns == ["close", "high", "low"]
+
+
+@pytest.mark.parametrize("backend", ["numba", "ta"])
+@pytest.mark.parametrize("historical_data", [True, False])
+def test_plan_matches_one_plan_per_config(candles, backend, historical_data):
+    combined = IndicatorPlan(CONFIGS, historical_data, backend).run(candles)
+
+    expected = candles
+    for config in CONFIGS:
+        expected = IndicatorPlan([config], historical_data, backend).run(expected)
+
+    pd.testing.assert_frame_equal(combined, expected, check_exact=True)
+    assert list(combined.columns[:len(candles.columns)]) == list(candles.columns)
+
+
+def test_repeated_column_keeps_its_first_position_and_last_definition(candles):
+    configs = [
+        {"name": "ema", "override_params": {"window": 14}},
+        {"name": "sma", "override_params": {"window": 14}},
+        {"name": "ema", "override_params": {"window": 14, "close_col": "open"}},
+    ]
+    plan = IndicatorPlan(configs, historical_data=False, backend="numba")
+
+    result = plan.run(candles)
+
+    assert plan.columns == ["ema_14", "sma_14"]
+    np.testing.assert_array_equal(result["ema_14"], IndicatorPlan(configs[2:], False, "numba").run(candles)["ema_14"])
+
+
+def test_existing_columns_are_replaced(candles):
+    first = IndicatorPlan(CONFIGS, backend="numba").run(candles)
+
+    again = IndicatorPlan(CONFIGS, backend="numba").run(first)
+
+    pd.testing.assert_frame_equal(again, first, check_exact=True)
+
+
+def test_plans_are_compiled_once_per_config_list():
+    plan = compile_indicator_plan(indicator_configs[60], True, "numba")
+
+    assert compile_indicator_plan(list(indicator_configs[60]), True, "numba") is plan
+    assert compile_indicator_plan(indicator_configs[60], False, "numba") is not plan
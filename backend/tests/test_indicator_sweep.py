@@ -0,0 +1,65 @@
+"""
+indicator_sweep: every window of a sweep against the per-window kernels of the "numba" backend.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import synthetic_candles
+from backend.src.shared.utils.data_processing.indicator_kernels import (
+    ema_kernel, ewm_kernel, rolling_std_kernel, rsi_from_averages, sma_kernel,
+)
+from backend.src.shared.utils.data_processing.indicator_sweep import SWEEP_KERNELS, sweep_indicators
+
+WINDOWS = np.array([2, 5, 14, 50, 200])
+
+
+def _rsi(values, window, out):
+    diff = np.zeros_like(values)
+    diff[1:] = values[1:] - values[:-1]
+    avg_gain, avg_loss = np.empty_like(values), np.empty_like(values)
+    ewm_kernel(np.maximum(diff, 0.0), 1.0 / window, window, avg_gain)
+    ewm_kernel(np.maximum(-diff, 0.0), 1.0 / window, window, avg_loss)
+    rsi_from_averages(avg_gain, avg_loss, out)
+
+
+PER_WINDOW = {"sma": sma_kernel, "ema": ema_kernel, "rsi": _rsi, "std": rolling_std_kernel}
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return synthetic_candles(5000, missing_fraction=0.0)
+
+
+@pytest.mark.parametrize("kind", sorted(SWEEP_KERNELS))
+def test_sweep_matches_per_window_kernels(candles, kind):
+    sweep = sweep_indicators(candles, windows=WINDOWS, kinds=(kind,), historical_data=False, dtype=np.float64)
+    close = candles["close"].to_numpy(dtype=np.float64)
+
+    assert sweep.values.shape == (len(candles), 1, len(WINDOWS))
+    for window in WINDOWS:
+        expected = np.empty_like(close)
+        PER_WINDOW[kind](close, window, expected)
+        np.testing.assert_allclose(sweep.feature(kind, window), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_historical_sweep_is_shifted_by_one_row(candles):
+    current = sweep_indicators(candles, windows=WINDOWS, historical_data=False, dtype=np.float64)
+    historical = sweep_indicators(candles, windows=WINDOWS, historical_data=True, dtype=np.float64)
+
+    assert np.isnan(historical.values[0]).all()
+    np.testing.assert_array_equal(historical.values[1:], current.values[:-1])
+
+
+def test_frame_columns_follow_registry_names(candles):
+    sweep = sweep_indicators(candles.iloc[:300], windows=[5, 14], kinds=("sma", "rsi"))
+
+    frame = sweep.to_frame()
+    assert list(frame.columns) == sweep.columns == ["sma_5", "sma_14", "rsi_5", "rsi_14"]
+    assert frame.index.equals(candles.index[:300])
+    assert sweep.matrix.shape == (300, 4) and sweep.values.dtype == np.float32
+
+
+def test_unknown_kind_is_rejected(candles):
+    with pytest.raises(ValueError):
+        sweep_indicators(candles, windows=[5], kinds=("macd",))
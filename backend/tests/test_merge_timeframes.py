@@ -0,0 +1,167 @@
+"""
+merge_timeframes and IncrementalMerger: no look-ahead, the previous merge_asof output, and the
+incremental rows against the batch merge.
+
+    python -m pytest backend/tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.data.processing.merge_timeframes import IncrementalMerger, merge_timeframes
+
+TARGET_TIMEFRAME = 60
+
+
+def legacy_merge_timeframes(data_dict, target_timeframe):
+    """merge_timeframes before the searchsorted rewrite: one merge_asof and concat per timeframe."""
+    target_df = data_dict[target_timeframe].copy()
+    target_df.sort_values("timestamp", inplace=True)
+    target_df.reset_index(drop=True, inplace=True)
+    merged_df = target_df.copy()
+    for tf, tf_info in data_dict.items():
+        if tf == target_timeframe:
+            continue
+        tf_df = tf_info.copy()
+        tf_df.sort_values("timestamp", inplace=True)
+        tf_cols = [col for col in tf_df.columns if col != "timestamp"]
+        tf_df_renamed = tf_df.rename(columns={col: f"{tf}_{col}" for col in tf_cols})
+        shifted_target = target_df[['timestamp']].copy()
+        shifted_target['lookup_timestamp'] = shifted_target['timestamp'] - tf * 60
+        shifted_target['lookup_timestamp'] = shifted_target['lookup_timestamp'].apply(lambda x: x if x >= 0 else np.nan)
+        merged = pd.merge_asof(
+            shifted_target.sort_values('lookup_timestamp'),
+            tf_df_renamed.sort_values('timestamp'),
+            left_on='lookup_timestamp',
+            right_on='timestamp',
+            direction='backward'
+        )
+        merged.drop(['lookup_timestamp', 'timestamp_x', 'timestamp_y'], axis=1, inplace=True)
+        merged_df = pd.concat([merged_df, merged], axis=1)
+    return merged_df
+
+
+def _frame(tf, first_timestamp, n_bars, rng, drop_fraction=0.0):
+    """Bars of tf minutes from first_timestamp (some dropped, as gaps in the exchange data) with float and int columns."""
+    timestamps = first_timestamp + tf * 60 * np.arange(n_bars, dtype=np.int64)
+    if drop_fraction:
+        timestamps = timestamps[rng.random(n_bars) >= drop_fraction]
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "close": rng.random(len(timestamps)),
+        "trades": rng.integers(0, 1000, len(timestamps)),
+        # the bar's own timestamp as a value, to check which bar each target row received
+        "bar_timestamp": timestamps,
+    })
+
+
+@pytest.fixture
+def data_dict():
+    """
+    A 60m target from timestamp 0, so its first rows look up negative timestamps, and 5m/15m/240m
+    timeframes with gaps; the 240m bars only start after the first day, leaving rows unmatched.
+    """
+    rng = np.random.default_rng(0)
+    return {
+        TARGET_TIMEFRAME: _frame(TARGET_TIMEFRAME, 0, 300, rng),
+        5: _frame(5, 0, 3600, rng, drop_fraction=0.2),
+        15: _frame(15, 0, 1200, rng, drop_fraction=0.2),
+        240: _frame(240, 30 * 3600, 60, rng, drop_fraction=0.1),
+    }
+
+
+def _expected_bar(tf_timestamps, target_timestamp, tf):
+    """Timestamp of the latest bar with timestamp <= T - tf minutes, found by brute force (NaN if none)."""
+    cutoff = target_timestamp - tf * 60
+    if cutoff < 0:
+        return np.nan
+    eligible = tf_timestamps[tf_timestamps <= cutoff]
+    return eligible.max() if len(eligible) else np.nan
+
+
+def test_merged_bars_closed_before_target_row(data_dict):
+    merged = merge_timeframes(data_dict, TARGET_TIMEFRAME)
+
+    assert len(merged) == len(data_dict[TARGET_TIMEFRAME])
+    for tf, frame in data_dict.items():
+        if tf == TARGET_TIMEFRAME:
+            continue
+        tf_timestamps = frame["timestamp"].to_numpy()
+        expected = np.array([_expected_bar(tf_timestamps, t, tf) for t in merged["timestamp"]])
+        np.testing.assert_array_equal(merged[f"{tf}_bar_timestamp"].to_numpy(), expected)
+
+
+def test_negative_lookups_and_unmatched_rows_are_nan(data_dict):
+    merged = merge_timeframes(data_dict, TARGET_TIMEFRAME)
+    target_ts = merged["timestamp"].to_numpy()
+
+    # T - 240 minutes < 0 for the first four hours, and no 240m bar exists before 30h
+    unmatched = target_ts < 34 * 3600
+    assert merged.loc[unmatched, ["240_close", "240_trades", "240_bar_timestamp"]].isna().all().all()
+    assert merged.loc[~unmatched, "240_bar_timestamp"].notna().all()
+    assert merged.loc[target_ts < 5 * 60, "5_close"].isna().all()
+    # NaN-filled integer columns are upcast as merge_asof does
+    assert merged["240_trades"].dtype == np.float64
+
+
+def _without_negative_lookups(data_dict):
+    """
+    data_dict without the target rows that look up negative timestamps: the legacy merge marks
+    those lookups NaN, which merge_asof rejects in current pandas. Unmatched 240m rows remain.
+    """
+    data_dict = dict(data_dict)
+    target_df = data_dict[TARGET_TIMEFRAME]
+    max_tf = max(data_dict)
+    data_dict[TARGET_TIMEFRAME] = target_df[target_df["timestamp"] >= max_tf * 60].reset_index(drop=True)
+    return data_dict
+
+
+def test_matches_legacy_merge_asof(data_dict):
+    data_dict = _without_negative_lookups(data_dict)
+    merged = merge_timeframes(data_dict, TARGET_TIMEFRAME)
+    legacy = legacy_merge_timeframes(data_dict, TARGET_TIMEFRAME)
+
+    assert merged["240_close"].isna().any()
+    pd.testing.assert_frame_equal(merged, legacy, check_exact=True)
+
+
+def test_unsorted_input_matches_legacy_merge_asof(data_dict):
+    data_dict = _without_negative_lookups(data_dict)
+    shuffled = {tf: frame.sample(frac=1.0, random_state=1) for tf, frame in data_dict.items()}
+
+    pd.testing.assert_frame_equal(
+        merge_timeframes(shuffled, TARGET_TIMEFRAME),
+        legacy_merge_timeframes(data_dict, TARGET_TIMEFRAME),
+        check_exact=True,
+    )
+
+
+@pytest.mark.parametrize("step_hours", [1, 7, 48])
+def test_incremental_merger_matches_batch(data_dict, step_hours):
+    """Target bars arrive step_hours at a time, with every timeframe refreshed up to them."""
+    batch = merge_timeframes(data_dict, TARGET_TIMEFRAME)
+    merger = IncrementalMerger(TARGET_TIMEFRAME)
+
+    pieces = []
+    last_timestamp = data_dict[TARGET_TIMEFRAME]["timestamp"].iloc[-1]
+    for now in range(0, last_timestamp + step_hours * 3600, step_hours * 3600):
+        known = {tf: frame[frame["timestamp"] <= now].reset_index(drop=True) for tf, frame in data_dict.items()}
+        pieces.append(merger.update(known))
+    # a call without new target bars emits nothing
+    assert len(merger.update(data_dict)) == 0
+
+    incremental = pd.concat(pieces, ignore_index=True)
+    pd.testing.assert_frame_equal(incremental, batch, check_exact=True)
+
+
+def test_incremental_merger_continues_a_batch_merge(data_dict):
+    """IncrementalCoinpair merges the history in one batch and only the later target bars incrementally."""
+    split = 200 * 3600
+    history = {tf: frame[frame["timestamp"] <= split].reset_index(drop=True) for tf, frame in data_dict.items()}
+    head = merge_timeframes(history, TARGET_TIMEFRAME)
+
+    merger = IncrementalMerger(TARGET_TIMEFRAME, after_timestamp=head["timestamp"].iloc[-1])
+    tail = merger.update(data_dict)
+
+    pd.testing.assert_frame_equal(pd.concat([head, tail], ignore_index=True),
+                                  merge_timeframes(data_dict, TARGET_TIMEFRAME), check_exact=True)
@@ -0,0 +1,156 @@
+"""
+ModelRegistry and ModelCache: records, replacement, cache hits/misses, revalidation and shared loads,
+and the /models/predict route served from them.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+from backend.src.api.main import app
+from backend.src.api.routes import model_routes
+from backend.src.models.xgboost.model_registry import ModelCache, ModelRegistry
+from backend.src.shared.config.data_processing_config import target_timeframe
+
+FEATURES = ["close", "rsi_14", "60_atr_14"]
+
+
+def _booster(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.random((200, len(FEATURES)))
+    y = X @ np.array([1.0, 2.0, -1.0]) + seed
+    return xgb.train({"max_depth": 2, "device": "cpu", "nthread": 1}, xgb.DMatrix(X, label=y, feature_names=FEATURES), num_boost_round=5)
+
+
+def _save(registry, seed, timeframe=target_timeframe, win_rate=0.55):
+    return registry.save("ETH", "ETHUSD", timeframe, _booster(seed), FEATURES, {"max_depth": 2}, {"win_rate": win_rate, "sharpe": float("nan")})
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / "models"))
+
+
+def test_save_replaces_the_previous_model(registry):
+    first = _save(registry, 0)
+    second = _save(registry, 1, timeframe=f"{target_timeframe}m")
+
+    assert second.timeframe == first.timeframe == f"{target_timeframe}m"
+    assert registry.record("ETH", "ETHUSD", target_timeframe).model_file == second.model_file
+    assert [record.key for record in registry.records()] == [second.key]
+    assert not os.path.exists(os.path.join(registry.folder, first.model_file))
+    assert registry.record("ETH", "ETHUSD", 5) is None
+
+
+def test_cache_serves_loaded_models_without_reading_the_index(registry, monkeypatch):
+    _save(registry, 0)
+    cache = ModelCache(registry, revalidate_seconds=3600)
+    reads = []
+    record = registry.record
+    monkeypatch.setattr(registry, "record", lambda *key: reads.append(key) or record(*key))
+
+    first = cache.get("ETH", "ETHUSD", target_timeframe)
+    for _ in range(5):
+        assert cache.get("ETH", "ETHUSD", f"{target_timeframe}m")[1] is first[1]
+
+    assert len(reads) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (5, 1)
+    assert cache.get("ETH", "ETHUSD", 5) is None
+
+
+def test_cache_reloads_a_replaced_model_after_revalidation(registry):
+    _save(registry, 0)
+    cache = ModelCache(registry, revalidate_seconds=0)
+    first_record, first_booster = cache.get("ETH", "ETHUSD", target_timeframe)
+    # an unchanged record keeps the loaded booster
+    assert cache.get("ETH", "ETHUSD", target_timeframe)[1] is first_booster
+
+    replaced = _save(registry, 1)
+    record, booster = cache.get("ETH", "ETHUSD", target_timeframe)
+
+    assert record.model_file == replaced.model_file and booster is not first_booster
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+    assert cache.stats()["loaded_bytes"] == replaced.size_bytes
+
+
+def test_cache_evicts_least_recently_used(registry):
+    for timeframe in (5, 15, 60):
+        _save(registry, timeframe, timeframe=timeframe)
+    cache = ModelCache(registry, max_models=2, revalidate_seconds=3600)
+
+    cache.get("ETH", "ETHUSD", 5)
+    cache.get("ETH", "ETHUSD", 15)
+    cache.get("ETH", "ETHUSD", 5)
+    cache.get("ETH", "ETHUSD", 60)
+
+    assert list(cache.entries) == [("ETH", "ETHUSD", "5m"), ("ETH", "ETHUSD", "60m")]
+
+
+def test_concurrent_misses_share_one_load(registry, monkeypatch):
+    _save(registry, 0)
+    cache = ModelCache(registry, revalidate_seconds=3600)
+    loads = []
+    load_booster = registry.load_booster
+
+    def slow_load(record):
+        loads.append(record.model_file)
+        time.sleep(0.2)
+        return load_booster(record)
+
+    monkeypatch.setattr(registry, "load_booster", slow_load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("ETH", "ETHUSD", target_timeframe))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len({id(booster) for _, booster in results}) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (7, 1)
+
+
+@pytest.fixture
+def client(registry, monkeypatch):
+    monkeypatch.setattr(model_routes, "_model_cache", ModelCache(registry))
+    return TestClient(app)
+
+
+def test_predict_with_the_default_timeframe(client, registry):
+    record = _save(registry, 0, win_rate=0.6)
+    features = {"close": 0.5, "rsi_14": 0.25, "60_atr_14": None}
+
+    response = client.post("/models/predict", json={"coin": "ETH", "pair": "ETHUSD", "features": features})
+
+    assert response.status_code == 200
+    body = response.json()
+    booster = registry.load_booster(record)
+    expected = booster.inplace_predict(np.array([[0.5, 0.25, np.nan]], dtype=np.float32))[0]
+    assert body["prediction"] == pytest.approx(float(expected))
+    assert body["backtest_win_rate"] == 0.6
+    assert "confidence" not in body
+
+
+def test_predict_errors(client, registry):
+    _save(registry, 0)
+
+    unknown = client.post("/models/predict", json={"coin": "ETH", "pair": "ETHUSD", "timeframe": "5m", "features": {}})
+    missing = client.post("/models/predict", json={"coin": "ETH", "pair": "ETHUSD", "features": {"close": 1.0}})
+    invalid = client.post("/models/predict", json={"coin": "ETH", "pair": "ETHUSD", "features": dict.fromkeys(FEATURES, "x")})
+
+    assert (unknown.status_code, missing.status_code, invalid.status_code) == (404, 422, 422)
+
+
+def test_status_lists_registered_models(client, registry):
+    _save(registry, 0)
+    client.post("/models/predict", json={"coin": "ETH", "pair": "ETHUSD", "features": dict.fromkeys(FEATURES, 1.0)})
+
+    body = client.get("/models/status").json()
+
+    assert [model["name"] for model in body["models"]] == [f"xgboost_eth_ethusd_{target_timeframe}m"]
+    assert body["models"][0]["loaded"] and body["models"][0]["metrics"] == {"win_rate": 0.55}
+    assert body["cache"]["misses"] == 1
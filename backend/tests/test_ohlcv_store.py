@@ -0,0 +1,155 @@
+"""
+ohlcv_store: stores built from the CSVs against parsing them, rebuilds when a CSV changes, and
+incremental appends and tail loads (down to IncrementalCoinpair) against full rebuilds, and the
+memory-mapped records of ingest_csv(format="numpy").
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import write_synthetic_coinpair
+from backend.src.data.ingestion.ingest_csv import ingest_csv, ingest_csv_tail
+from backend.src.data.ingestion.ohlcv_store import (
+    OHLCV_RECORD_DTYPE, ensure_store, frame_to_records, get_store_path, load_ohlcv, read_manifest, read_ohlcv_csv,
+)
+from backend.src.data.processing import process_coinpair as process_coinpair_module
+from backend.src.shared.config import global_config
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    data_folder = str(tmp_path / "data")
+    monkeypatch.setattr(global_config, "data_folder", data_folder)
+    monkeypatch.setattr(global_config, "store_folder", str(tmp_path / "store"))
+    return write_synthetic_coinpair(data_folder, "AAA", "AAAUSD", 2 * 1440, timeframes=[1], seed=0)[1]
+
+
+def test_store_matches_the_csv(csv_path):
+    expected = read_ohlcv_csv(csv_path)
+
+    built = load_ohlcv(csv_path)
+    served = load_ohlcv(csv_path)
+
+    pd.testing.assert_frame_equal(built, expected, check_exact=True)
+    pd.testing.assert_frame_equal(served, expected, check_exact=True)
+    pd.testing.assert_frame_equal(ingest_csv(csv_path), ingest_csv(csv_path, use_store=False), check_exact=True)
+    assert read_manifest(get_store_path(csv_path))["rows"] == len(expected)
+
+
+def test_chunked_build_matches_the_full_build(csv_path, tmp_path):
+    _, full = ensure_store(csv_path)
+    _, chunked = ensure_store(csv_path, chunk_rows=1000, store_root=str(tmp_path / "chunked"))
+
+    assert chunked["rows"] == full["rows"]
+    pd.testing.assert_frame_equal(load_ohlcv(csv_path, store_root=str(tmp_path / "chunked")), read_ohlcv_csv(csv_path), check_exact=True)
+
+
+def test_rewritten_csv_rebuilds_the_store(csv_path):
+    load_ohlcv(csv_path)
+    # a rewrite that is not an append: the first rows only, with the last close changed
+    data = read_ohlcv_csv(csv_path).iloc[:100].copy()
+    data.loc[99, "close"] += 1.0
+    data.to_csv(csv_path, header=False, index=False)
+
+    pd.testing.assert_frame_equal(load_ohlcv(csv_path), read_ohlcv_csv(csv_path), check_exact=True)
+    assert len(load_ohlcv(csv_path)) == 100
+    assert read_manifest(get_store_path(csv_path))["appended_from"] == 0
+    # the store was swapped in whole, without temporary directories left behind
+    assert os.listdir(os.path.dirname(get_store_path(csv_path))) == ["AAAUSD_1"]
+
+
+def _split_lines(csv_path, keep):
+    """Truncates a CSV to its first keep lines and returns the lines that were cut off."""
+    with open(csv_path, "rb") as f:
+        lines = f.readlines()
+    with open(csv_path, "wb") as f:
+        f.writelines(lines[:keep])
+    return lines[keep:]
+
+
+def _append(csv_path, lines):
+    with open(csv_path, "ab") as f:
+        f.writelines(lines)
+
+
+def test_appended_rows_are_parsed_incrementally(csv_path):
+    rest = _split_lines(csv_path, 2000)
+    load_ohlcv(csv_path)
+
+    _append(csv_path, rest[:500])
+    data = load_ohlcv(csv_path)
+
+    assert read_manifest(get_store_path(csv_path))["appended_from"] == 2000
+    pd.testing.assert_frame_equal(data, read_ohlcv_csv(csv_path), check_exact=True)
+
+
+def test_half_written_row_waits_for_its_newline(csv_path):
+    rest = _split_lines(csv_path, 2000)
+    load_ohlcv(csv_path)
+
+    _append(csv_path, rest[:10] + [rest[10][:5]])
+    assert len(load_ohlcv(csv_path)) == 2010
+    _append(csv_path, [rest[10][5:]])
+
+    pd.testing.assert_frame_equal(load_ohlcv(csv_path), read_ohlcv_csv(csv_path), check_exact=True)
+    assert read_manifest(get_store_path(csv_path))["appended_from"] == 2010
+
+
+def test_tail_returns_new_rows_with_context(csv_path):
+    rest = _split_lines(csv_path, 2000)
+    first, _ = ingest_csv_tail(csv_path)
+    _append(csv_path, rest[:300])
+
+    data, new_start = ingest_csv_tail(csv_path, since_timestamp=first["timestamp"].iat[-1], context_rows=50)
+
+    assert new_start == 50
+    pd.testing.assert_frame_equal(data, read_ohlcv_csv(csv_path).iloc[2000 - 50:].reset_index(drop=True), check_exact=True)
+    assert len(ingest_csv_tail(csv_path, since_timestamp=data["timestamp"].iat[-1])[0]) == 0
+
+
+def test_incremental_coinpair_matches_process_coinpair(tmp_path, monkeypatch):
+    data_folder = str(tmp_path / "data")
+    paths = write_synthetic_coinpair(data_folder, "AAA", "AAAUSD", 20 * 1440, timeframes=[5, 15, 60], seed=1)
+    monkeypatch.setattr(global_config, "data_folder", data_folder)
+    monkeypatch.setattr(global_config, "store_folder", str(tmp_path / "store"))
+    monkeypatch.setattr(process_coinpair_module, "data_folder", data_folder)
+    monkeypatch.setattr(process_coinpair_module, "use_catalog", False)
+    monkeypatch.setattr(process_coinpair_module, "timeframes", [5, 15, 60])
+
+    # every file starts with the candles of the first 10 days and grows in three steps
+    cutoff = read_ohlcv_csv(paths[60])["timestamp"].iat[0] + 10 * 86400
+    rests = {tf: _split_lines(path, int((read_ohlcv_csv(path)["timestamp"] < cutoff).sum())) for tf, path in paths.items()}
+    incremental = process_coinpair_module.IncrementalCoinpair("AAA", "AAAUSD")
+    incremental.update()
+    for step in range(3):
+        for tf, path in paths.items():
+            lines = rests[tf]
+            _append(path, lines[step * len(lines) // 3:(step + 1) * len(lines) // 3])
+        incremental.update()
+
+    expected = process_coinpair_module.process_coinpair("AAA", "AAAUSD", parallel=False, resample=False)
+    pd.testing.assert_frame_equal(incremental.merged, expected, rtol=1e-9)
+
+
+def test_numpy_format_is_a_memmap_of_the_records(csv_path):
+    expected = frame_to_records(read_ohlcv_csv(csv_path))
+
+    records = ingest_csv(csv_path, format="numpy")
+
+    assert isinstance(records, np.memmap) and not records.flags.writeable
+    assert records.dtype == OHLCV_RECORD_DTYPE
+    np.testing.assert_array_equal(records, expected)
+    np.testing.assert_array_equal(ingest_csv(csv_path, format="numpy", use_store=False), expected)
+
+
+def test_records_follow_appends_and_rebuilds(csv_path):
+    rest = _split_lines(csv_path, 2000)
+    assert len(ingest_csv(csv_path, format="numpy")) == 2000
+
+    _append(csv_path, rest[:100])
+    np.testing.assert_array_equal(ingest_csv(csv_path, format="numpy"), frame_to_records(read_ohlcv_csv(csv_path)))
+
+    _split_lines(csv_path, 50)
+    np.testing.assert_array_equal(ingest_csv(csv_path, format="numpy"), frame_to_records(read_ohlcv_csv(csv_path)))
@@ -0,0 +1,81 @@
+"""
+panel engine: the batched panel pass against one IndicatorPipeline(backend="numba") run per asset,
+and process_universe against process_coinpair.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import synthetic_candles, write_synthetic_coinpair
+from backend.src.data.processing import process_coinpair as process_coinpair_module
+from backend.src.data.processing import process_universe as process_universe_module
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.data.processing.indicators.indicator_pipeline import IndicatorPipeline
+from backend.src.data.processing.panel import build_panel, compute_panel_indicators, panel_to_frames
+from backend.src.shared.config import data_processing_config, global_config
+
+# uneven histories, including series shorter than the indicator windows, one candle and none
+LENGTHS = [3000, 2500, 2999, 60, 10, 1, 0, 1200]
+
+
+@pytest.fixture
+def frames():
+    return {f"ASSET{i}": synthetic_candles(3000, seed=i).iloc[:n] for i, n in enumerate(LENGTHS)}
+
+
+@pytest.mark.parametrize("historical_data", [True, False])
+@pytest.mark.parametrize("batch_assets", [1, 3, 16])
+def test_panel_matches_per_asset_pipeline(frames, monkeypatch, historical_data, batch_assets):
+    monkeypatch.setattr(data_processing_config, "panel_batch_assets", batch_assets)
+    configs = indicator_configs[60]
+    panel = build_panel(frames)
+    batched = panel_to_frames(panel, compute_panel_indicators(panel, configs, historical_data))
+
+    pipeline = IndicatorPipeline(configs, historical_data, backend="numba")
+    assert list(batched) == list(frames)
+    for asset, frame in frames.items():
+        pd.testing.assert_frame_equal(batched[asset], pipeline.run(frame), check_exact=True)
+
+
+def test_scratch_budget_limits_the_batch(frames, monkeypatch):
+    # too small for even one series: every batch holds a single asset and the output is unchanged
+    monkeypatch.setattr(data_processing_config, "panel_max_memory_bytes", 1)
+    panel = build_panel(frames)
+    batched = panel_to_frames(panel, compute_panel_indicators(panel, indicator_configs[60]))
+
+    pipeline = IndicatorPipeline(indicator_configs[60], backend="numba")
+    for asset, frame in frames.items():
+        pd.testing.assert_frame_equal(batched[asset], pipeline.run(frame), check_exact=True)
+
+
+def test_aligned_view(frames):
+    panel = build_panel(frames)
+    timestamps, values, mask = panel.aligned()
+
+    assert values.shape == (len(timestamps), len(frames), len(panel.fields))
+    assert (np.diff(timestamps) > 0).all()
+    for a, frame in enumerate(frames.values()):
+        assert mask[a].sum() == len(frame)
+        np.testing.assert_array_equal(timestamps[mask[a]], frame["timestamp"].to_numpy())
+        np.testing.assert_array_equal(values[mask[a], a, :], frame[panel.fields].to_numpy(dtype=np.float64))
+        assert np.isnan(values[~mask[a], a, :]).all()
+
+
+def test_process_universe_matches_process_coinpair(tmp_path, monkeypatch):
+    coin_pairs = {"AAA": "AAAUSD", "BBB": "BBBUSD"}
+    for seed, (coin, pair) in enumerate(coin_pairs.items()):
+        write_synthetic_coinpair(tmp_path / "data", coin, pair, 30 * 1440, seed=seed)
+    monkeypatch.setattr(global_config, "data_folder", str(tmp_path / "data"))
+    monkeypatch.setattr(global_config, "store_folder", str(tmp_path / "store"))
+    for module in (process_coinpair_module, process_universe_module):
+        monkeypatch.setattr(module, "data_folder", str(tmp_path / "data"))
+        monkeypatch.setattr(module, "use_catalog", False)
+    monkeypatch.setattr(data_processing_config, "indicator_backend", "numba")
+
+    universe = process_universe_module.process_universe(coin_pairs, resample=False)
+
+    assert list(universe) == list(coin_pairs.items())
+    for coin, pair in coin_pairs.items():
+        expected = process_coinpair_module.process_coinpair(coin, pair, parallel=False, resample=False)
+        # process_coinpair merges the timeframes in crawl order, process_universe in sorted order
+        pd.testing.assert_frame_equal(universe[(coin, pair)], expected, check_exact=True, check_like=True)
@@ -0,0 +1,61 @@
+"""
+resample_ohlcv: the cascaded reduceat resampler against a pandas groupby over the 1 minute candles.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import BENCH_TIMEFRAMES, synthetic_candles
+from backend.src.data.processing.resample import resample_ohlcv
+
+
+def _groupby_bars(candles, timeframe):
+    bucket = candles["timestamp"] // (timeframe * 60) * (timeframe * 60)
+    return candles.groupby(bucket).agg(
+        open=("open", "first"), high=("high", "max"), low=("low", "min"),
+        close=("close", "last"), volume=("volume", "sum"), trades=("trades", "sum"),
+    ).reset_index()
+
+
+@pytest.fixture(scope="module")
+def candles():
+    # sparse enough that some hours and days have no candle at all
+    return synthetic_candles(20 * 1440, missing_fraction=0.3, seed=3)
+
+
+def test_every_timeframe_matches_groupby(candles):
+    resampled = resample_ohlcv(candles, BENCH_TIMEFRAMES)
+
+    assert list(resampled) == BENCH_TIMEFRAMES
+    for timeframe in BENCH_TIMEFRAMES:
+        expected = _groupby_bars(candles, timeframe)
+        # volume sums are taken over the finer bars, which only reorders the additions
+        pd.testing.assert_frame_equal(resampled[timeframe].drop(columns="volume"), expected.drop(columns="volume"), check_exact=True)
+        np.testing.assert_allclose(resampled[timeframe]["volume"], expected["volume"], rtol=1e-12)
+
+
+def test_buckets_without_candles_produce_no_bar():
+    candles = synthetic_candles(180, missing_fraction=0.0)
+    candles = candles[(candles["timestamp"] // 3600) != (candles["timestamp"].iat[0] // 3600 + 1)]
+
+    bars = resample_ohlcv(candles, [60])[60]
+
+    assert len(bars) == candles["timestamp"].floordiv(3600).nunique()
+    assert (np.diff(bars["timestamp"]) == 7200).any()
+
+
+def test_resampling_from_a_coarser_base(candles):
+    five_minute = _groupby_bars(candles, 5)
+
+    resampled = resample_ohlcv(five_minute, [15, 60], base_timeframe=5)
+
+    pd.testing.assert_frame_equal(resampled[60], resample_ohlcv(candles, [60])[60], rtol=1e-12)
+    with pytest.raises(ValueError):
+        resample_ohlcv(five_minute, [7], base_timeframe=5)
+
+
+def test_empty_input_keeps_the_columns():
+    resampled = resample_ohlcv(synthetic_candles(10).iloc[:0], [5, 60])
+
+    for bars in resampled.values():
+        assert len(bars) == 0 and list(bars.columns) == list(synthetic_candles(10).columns)
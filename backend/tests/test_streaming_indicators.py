@@ -0,0 +1,57 @@
+"""
+StreamingIndicatorSet: per-candle updates against the batch IndicatorPipeline(backend="numba") rows.
+"""
+import pandas as pd
+import pytest
+
+from backend.benchmarks.synthetic import synthetic_candles
+from backend.src.data.processing.configs.indicator_configs import indicator_configs
+from backend.src.data.processing.indicators.indicator_pipeline import IndicatorPipeline
+from backend.src.shared.utils.data_processing.streaming_indicators import StreamingIndicatorSet
+
+CONFIGS = indicator_configs[60]
+
+
+@pytest.fixture(scope="module")
+def candles():
+    candles = synthetic_candles(2500, seed=5)
+    # unchanged prices for a while: RSI with no losses, zero deviation and true range
+    candles.loc[600:700, ["open", "high", "low", "close"]] = 3000.0
+    return candles
+
+
+def _batch(candles, historical_data):
+    pipeline = IndicatorPipeline(CONFIGS, historical_data, backend="numba")
+    return pipeline.run(candles)[pipeline.plan.columns]
+
+
+def _stream(indicators, candles):
+    return pd.DataFrame([indicators.update(candle) for candle in candles.to_dict("records")], index=candles.index)
+
+
+@pytest.mark.parametrize("historical_data", [True, False])
+def test_replay_from_the_first_candle_matches_the_batch_rows(candles, historical_data):
+    streamed = _stream(StreamingIndicatorSet(CONFIGS, historical_data), candles)
+
+    pd.testing.assert_frame_equal(streamed, _batch(candles, historical_data), check_exact=True)
+
+
+@pytest.mark.parametrize("historical_data", [True, False])
+def test_seeding_from_the_history_tail_matches_the_batch_rows(candles, historical_data):
+    live = candles.iloc[2000:]
+    indicators = StreamingIndicatorSet(CONFIGS, historical_data).seed(candles.iloc[:2000])
+
+    streamed = _stream(indicators, live)
+
+    assert indicators.warmup < 2000 and indicators.last_timestamp == candles["timestamp"].iat[-1]
+    # only the rolling sums the batch run accumulated before the seeded tail differ
+    pd.testing.assert_frame_equal(streamed, _batch(candles, historical_data).iloc[2000:], rtol=1e-10)
+
+
+def test_values_before_any_candle_are_nan():
+    indicators = StreamingIndicatorSet(CONFIGS)
+
+    values = indicators.values()
+
+    assert list(values) == IndicatorPipeline(CONFIGS, backend="numba").plan.columns
+    assert all(pd.isna(value) for value in values.values())
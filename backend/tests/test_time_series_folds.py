@@ -0,0 +1,86 @@
+"""
+time_series_folds: the lazy folds against cutting every fold up front, and the FeatureMatrix folds
+against the DataFrame folds.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.shared.utils.data_processing.feature_matrix import build_feature_matrix
+from backend.src.shared.utils.data_processing.train_val_test_split import TimeSeriesFolds, time_series_folds
+
+
+def eager_time_series_folds(data, n_folds=5, initial_train_frac=0.3, val_frac=0.2, val_set=False):
+    """time_series_folds as it was before the folds became lazy: every part is cut up front."""
+    N = len(data)
+    initial_train_end = int(N * initial_train_frac)
+    test_window = max(1, int((N - initial_train_end) / n_folds))
+
+    folds = []
+    for i in range(n_folds):
+        train_end = initial_train_end + i * test_window
+        test_end = train_end + test_window if i < n_folds - 1 else N
+        train_fold = data.iloc[:train_end]
+        test_fold = data.iloc[train_end:test_end]
+        if len(train_fold) > 1 and len(test_fold) > 0:
+            n_train = len(train_fold)
+            split_index = n_train - 1
+            if val_set:
+                split_index = max(1, int(n_train * (1 - val_frac)))
+                if n_train - split_index < 1:
+                    split_index = n_train - 1
+            parts = [train_fold.iloc[:split_index]] + ([train_fold.iloc[split_index:]] if val_set else []) + [test_fold]
+            folds.append(tuple({"features": part.drop(columns=["timestamp", "target"]), "targets": part["target"]} for part in parts))
+    return folds
+
+
+def _merged(n):
+    rng = np.random.default_rng(n)
+    return pd.DataFrame({
+        "timestamp": np.arange(n, dtype=np.int64) * 3600,
+        "close": rng.normal(size=n),
+        "rsi_14": rng.normal(size=n),
+        "target": rng.normal(size=n),
+    })
+
+
+@pytest.mark.parametrize("n_rows", [3, 7, 100, 1001])
+@pytest.mark.parametrize("val_set", [False, True])
+def test_lazy_folds_match_the_eager_folds(n_rows, val_set):
+    data = _merged(n_rows)
+
+    lazy = time_series_folds(data, n_folds=5, val_set=val_set)
+    eager = eager_time_series_folds(data, n_folds=5, val_set=val_set)
+
+    assert len(lazy) == len(eager)
+    for lazy_fold, eager_fold in zip(lazy, eager):
+        assert len(lazy_fold) == (3 if val_set else 2)
+        for lazy_part, eager_part in zip(lazy_fold, eager_fold):
+            pd.testing.assert_frame_equal(lazy_part["features"], eager_part["features"])
+            pd.testing.assert_series_equal(lazy_part["targets"], eager_part["targets"])
+
+
+def test_matrix_folds_are_views_of_the_dataframe_folds():
+    data = _merged(1001)
+    matrix = build_feature_matrix(data)
+
+    for matrix_fold, frame_fold in zip(time_series_folds(matrix, val_set=True), time_series_folds(data, val_set=True)):
+        for matrix_part, frame_part in zip(matrix_fold, frame_fold):
+            assert np.shares_memory(matrix_part.features, matrix.features)
+            np.testing.assert_array_equal(matrix_part.features, frame_part["features"].to_numpy(dtype=np.float32))
+            np.testing.assert_array_equal(matrix_part.targets, frame_part["targets"])
+
+
+def test_slices_and_reduced_training_parts():
+    matrix = build_feature_matrix(_merged(1001))
+    folds = time_series_folds(matrix, val_set=True)
+
+    later = folds[2:]
+    train, validate, test = folds.fold(3, train_fraction=0.25)
+    full_train, full_validate, full_test = folds[3]
+
+    assert isinstance(later, TimeSeriesFolds) and later.ranges == folds.ranges[2:]
+    assert len(train) == int(len(full_train) * 0.25)
+    np.testing.assert_array_equal(train.timestamps, full_train.timestamps[-len(train):])
+    np.testing.assert_array_equal(validate.timestamps, full_validate.timestamps)
+    np.testing.assert_array_equal(test.timestamps, full_test.timestamps)